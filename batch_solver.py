@@ -0,0 +1,192 @@
+# Solve many independent problems on a pool of workers
+
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Iterable, Iterator, Union
+
+import numpy as np
+
+from solver_result import SolverResult
+
+
+@dataclass(frozen=True)
+class SharedMatrix:
+    """
+    Handle of a matrix that [BatchSolver] stored once in a memory-mapped file.
+    Pass it instead of the matrix in [Problem.arguments] so that workers map the file instead of unpickling the matrix
+    """
+
+    path: str
+    """Path of the .npy file (dense matrices) or the directory with data, indices and indptr .npy files (CSR matrices)"""
+
+    is_sparse: bool = False
+    """Whether the matrix is a scipy CSR matrix"""
+
+    shape: tuple[int, int] = (0, 0)
+    """Shape of the matrix"""
+
+
+@dataclass(frozen=True)
+class Problem:
+    """
+    One problem of a batch: the solver class and the keyword arguments of its constructor
+    """
+
+    solver: type
+    """Solver class: [SimplexSolver], [RevisedSimplexSolver], [InteriorPointSolver] or [PrimalDualSolver]"""
+
+    arguments: dict = field(default_factory=dict)
+    """Keyword arguments of the solver constructor. Any value may be a [SharedMatrix]"""
+
+
+_mapped_matrices: dict[SharedMatrix, object] = {}
+"""Matrices this worker has already mapped, so that every task after the first one reuses them"""
+
+
+def _load_shared(matrix: SharedMatrix):
+    """
+    Map a shared matrix read-only in this worker, once
+    :param matrix: handle of the matrix
+    :return: a read-only NumPy array or CSR matrix backed by the memory-mapped files
+    """
+    if matrix not in _mapped_matrices:
+        if matrix.is_sparse:
+            from scipy import sparse
+
+            arrays = [np.load(os.path.join(matrix.path, f"{name}.npy"), mmap_mode="r")
+                      for name in ("data", "indices", "indptr")]
+            _mapped_matrices[matrix] = sparse.csr_matrix(tuple(arrays), shape=matrix.shape, copy=False)
+        else:
+            _mapped_matrices[matrix] = np.load(matrix.path, mmap_mode="r")
+    return _mapped_matrices[matrix]
+
+
+def _arguments(problem: Problem) -> dict:
+    """
+    :param problem: a problem of a batch
+    :return: the keyword arguments of its solver constructor with every [SharedMatrix] mapped in this worker
+    """
+    return {key: _load_shared(value) if isinstance(value, SharedMatrix) else value
+            for key, value in problem.arguments.items()}
+
+
+def _run_problem(problem: Problem) -> SolverResult:
+    """
+    Solve one problem without printing anything
+    :param problem: the problem to solve
+    :return: the [SolverResult] of the solver
+    """
+    return problem.solver(**_arguments(problem)).run()
+
+
+def _warm_up() -> None:
+    """
+    Import the solvers once when a worker starts instead of on its first task
+    """
+    import interior_point_solver  # noqa: F401
+    import primal_dual_solver  # noqa: F401
+    import revised_simplex_solver  # noqa: F401
+    import simplex_solver  # noqa: F401
+
+
+class BatchSolver:
+    class Pool(str, Enum):
+        PROCESS = "process"
+        THREAD = "thread"
+
+    def __init__(self, pool: Pool = Pool.PROCESS, workers: Union[int, None] = None, max_pending: int = 0) -> None:
+        """
+        Construct a solver of batches of independent problems. Use it as a context manager
+        or call [close] to stop the workers and delete the shared matrices
+
+        :param pool: one of [Pool.PROCESS] or [Pool.THREAD]
+        :param workers: number of workers. The number of processors if [None]
+        :param max_pending: how many problems to submit ahead of the consumer of the results.
+            4 times the number of workers if 0
+        """
+
+        self.pool: BatchSolver.Pool = pool
+        """Kind of the workers"""
+
+        self.workers: int = workers or os.cpu_count() or 1
+        """Number of workers"""
+
+        self.max_pending: int = max_pending or 4 * self.workers
+        """How many problems to submit ahead of the consumer of the results"""
+
+        self._executor: Executor = (
+            ProcessPoolExecutor(self.workers, initializer=_warm_up)
+            if pool == BatchSolver.Pool.PROCESS
+            else ThreadPoolExecutor(self.workers, initializer=_warm_up)
+        )
+        """Workers. They stay alive, with the solvers imported and the shared matrices mapped, between batches"""
+
+        self._directory: Union[tempfile.TemporaryDirectory, None] = None
+        """Directory of the shared matrices files, created on the first [share]"""
+
+    def share(self, matrix) -> Union[SharedMatrix, object]:
+        """
+        Store a matrix once so that problems can refer to it without copying it for every task
+        :param matrix: nested lists, a NumPy array or a scipy sparse matrix
+        :return: a [SharedMatrix] handle for process workers, the matrix itself for thread workers
+        """
+        if self.pool == BatchSolver.Pool.THREAD:
+            return matrix
+
+        if self._directory is None:
+            self._directory = tempfile.TemporaryDirectory(prefix="batch-solver-")
+        path = tempfile.mkdtemp(dir=self._directory.name)
+
+        if hasattr(matrix, "tocsr"):  # A scipy sparse matrix
+            matrix = matrix.tocsr()
+            for name in ("data", "indices", "indptr"):
+                np.save(os.path.join(path, f"{name}.npy"), getattr(matrix, name))
+            return SharedMatrix(path, is_sparse=True, shape=matrix.shape)
+
+        matrix = np.asarray(matrix, dtype=float)
+        path = os.path.join(path, "matrix.npy")
+        np.save(path, matrix)
+        return SharedMatrix(path, shape=matrix.shape)
+
+    def solve(self, problems: Iterable[Problem]) -> Iterator[SolverResult]:
+        """
+        Solve problems on the workers without printing anything.
+        Problems are consumed lazily, at most [max_pending] at a time
+        :param problems: the problems to solve
+        :return: [SolverResult] of the solvers, in the order of the problems, as [submit] gives them
+        """
+        pending: deque[Future] = deque()
+        for problem in problems:
+            pending.append(self._executor.submit(_run_problem, problem))
+            if len(pending) >= self.max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+    def submit(self, problem: Problem) -> Future:
+        """
+        Start solving one problem on the workers without printing anything
+        :param problem: the problem to solve
+        :return: future of the [SolverResult] of the solver
+        """
+        return self._executor.submit(_run_problem, problem)
+
+    def close(self) -> None:
+        """
+        Stop the workers and delete the shared matrices
+        """
+        self._executor.shutdown()
+        if self._directory is not None:
+            self._directory.cleanup()
+            self._directory = None
+
+    def __enter__(self) -> "BatchSolver":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
@@ -0,0 +1,210 @@
+# Interior-Point algorithm iterating many same-shaped problems at once
+
+from typing import Union
+
+import numpy as np
+from numpy.linalg import norm
+from scipy.linalg import solve_triangular
+
+from interior_point_solver import InteriorPointSolver
+
+
+class BatchedInteriorPointSolver:
+    Mode = InteriorPointSolver.Mode
+
+    def __init__(
+            self,
+            mode: Mode,
+            start: list[list[float]],
+            c: Union[list[float], list[list[float]]],
+            a: Union[list[list[float]], list[list[list[float]]]],
+            b: Union[list[float], list[list[float]]],
+            alpha: float,
+            eps: int
+    ) -> None:
+        """
+        Construct an Interior-Point Algorithm solver of k problems with the same shape (m constraints, n variables).
+        Every argument that differs between the problems is stacked along the first axis,
+        arguments shared by all problems can be passed once
+
+        :param mode: one of [Mode.MAXIMIZE] or [Mode.MINIMIZE], the same for all problems
+        :param start: k x n initial points
+        :param c: coefficients of the objective functions, n or k x n
+        :param a: matrices of the coefficients of the constraints, m x n or k x m x n
+        :param b: right hand sides of the constraints equations, m or k x m
+        :param alpha: alpha in Interior-Point Algorithm
+        :param eps: solution accuracy. How many digits after the floating point to consider.
+            Every problem stops when the relative duality gap of its dual estimate is below 10^-(eps + 3),
+            as in [InteriorPointSolver]
+        """
+
+        self.mode: BatchedInteriorPointSolver.Mode = mode
+        """Mode of this problem solver"""
+
+        self.start: np.ndarray = np.array(start, dtype=float)
+        """Initial points, k x n"""
+
+        k, n = self.start.shape
+
+        self.c: np.ndarray = np.broadcast_to(np.asarray(c, dtype=float), (k, n))
+        """Coefficients of the objective functions, k x n. Inverted if we are minimizing"""
+        if mode == BatchedInteriorPointSolver.Mode.MINIMIZE:
+            self.c = -self.c
+
+        a = np.asarray(a, dtype=float)
+        self.a: np.ndarray = np.broadcast_to(a, (k,) + a.shape[-2:])
+        """Matrices of the coefficients of the constraints, k x m x n. A view if all problems share one matrix"""
+
+        self.b: np.ndarray = np.broadcast_to(np.asarray(b, dtype=float), (k, self.a.shape[1]))
+        """Right hand sides of the constraints equations, k x m"""
+
+        self.alpha: float = alpha
+        """alpha in Interior-Point Algorithm"""
+
+        self.eps: int = eps
+        """Solution accuracy"""
+
+        self.tolerance: float = 10 ** -(eps + 3)
+        """Relative duality gap at which the iterations of a problem stop"""
+
+        self.solutions: list[Union[float, None]] = [None] * k
+        """Optimal solutions of the problems"""
+
+        self.iterations: np.ndarray = np.zeros(k, dtype=int)
+        """How many iterations every problem took"""
+
+        self.is_not_applicable: np.ndarray = np.zeros(k, dtype=bool)
+        """Whether the method is not applicable to every problem"""
+
+        self.has_no_solution: np.ndarray = np.zeros(k, dtype=bool)
+        """Whether every problem has no solution, e.g. its objective function is unbounded"""
+
+    @staticmethod
+    def _cholesky(f: np.ndarray, active: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Cholesky-factorize a stack of normal equations matrices
+        :param f: k x m x m matrices. Matrices of inactive problems are ignored
+        :param active: which problems are still iterating
+        :return: a tuple (k x m x m lower factors, which active problems have a singular matrix)
+        """
+        identity = np.eye(f.shape[1])
+        f = np.where(active[:, None, None], f, identity)
+        singular = np.zeros(len(f), dtype=bool)
+
+        try:
+            return np.linalg.cholesky(f), singular
+        except np.linalg.LinAlgError:  # Find the singular ones and factorize the identity in their place
+            for i in np.flatnonzero(active):
+                try:
+                    np.linalg.cholesky(f[i])
+                except np.linalg.LinAlgError:
+                    singular[i] = True
+                    f[i] = identity
+            return np.linalg.cholesky(f), singular
+
+    @staticmethod
+    def _project(aa: np.ndarray, lower: np.ndarray, v: np.ndarray) -> np.ndarray:
+        """
+        Project vectors onto the null spaces of the scaled constraints matrices: v - aa^T * f^-1 * aa * v,
+        with f^-1 = L^-T * L^-1 applied by two batched triangular solves
+        :param aa: k x m x n scaled constraints matrices
+        :param lower: k x m x m lower Cholesky factors L of aa * aa^T
+        :param v: k x n vectors
+        :return: k x n projected vectors
+        """
+        w = solve_triangular(lower, aa @ v[:, :, None], lower=True, check_finite=False)
+        w = solve_triangular(lower, w, lower=True, trans="T", check_finite=False)
+        return v - (aa.transpose(0, 2, 1) @ w)[:, :, 0]
+
+    def calculate(self) -> np.ndarray:
+        """
+        Run the Interior point method on all problems until every one of them converges or fails
+        :return: k x n final points. Rows of failed problems are meaningless
+        """
+        x = self.start.copy()
+        active = np.ones(len(x), dtype=bool)
+        gap = np.full(len(x), np.inf)
+        # Close to a degenerate optimum, the iterations of [InteriorPointSolver] fail in the same ways,
+        # and a point whose gap is almost closed is the answer
+        almost = max(100 * self.tolerance, 1e-8)
+
+        with np.errstate(over="ignore", invalid="ignore"):  # Failing problems are detected below
+            while np.any(active):
+                self.iterations[active] += 1
+
+                aa = self.a * x[:, None, :]  # A * D for every problem without building D = diag(x)
+                cc = x * self.c
+                f = aa @ aa.transpose(0, 2, 1)
+
+                failed = active & ~np.all(np.isfinite(f), axis=(1, 2))
+                self.has_no_solution |= failed & (gap >= almost)
+                active &= ~failed
+
+                lower, singular = self._cholesky(f, active)
+                self.is_not_applicable |= singular & (gap >= almost)
+                active &= ~singular
+
+                # The second projection removes the round-off left by the first one, see [InteriorPointSolver]
+                cp = self._project(aa, lower, cc)
+                cp = self._project(aa, lower, cp)
+
+                failed = active & (~np.all(np.isfinite(cp), axis=1) | np.all(cp >= 0, axis=1))
+                self.has_no_solution |= failed & (gap >= almost)
+                active &= ~failed
+
+                nu = np.absolute(np.min(cp, axis=1))
+                failed = active & (nu < 1e-10)
+                self.is_not_applicable |= failed & (gap >= almost)
+                active &= ~failed
+
+                # The sum of |cp| bounds the duality gap of the dual estimate, see [InteriorPointSolver]
+                gap = np.where(active, np.sum(np.abs(cp), axis=1) / (1 + np.abs(np.sum(cc, axis=1))), gap)
+                y = 1 + (self.alpha / np.where(active, nu, 1))[:, None] * cp
+                step = np.where(active[:, None], x * y, x)
+                # The step test also stops iterations that stall before the gap closes
+                converged = active & ((gap < self.tolerance) |
+                                      (norm(step - x, ord=2, axis=1) < min(0.00001, 10 ** (1 - self.eps))))
+
+                x = step
+                active &= ~converged
+
+        return x
+
+    def _solve(self) -> list[Union[tuple[float, list[float]], None]]:
+        """
+        Solve all problems in this solver without printing anything
+        :return: for every problem, a tuple (solution, X*) or [None] in special cases
+        """
+        x = self.calculate()
+
+        results = []
+        for i in range(len(x)):
+            if self.is_not_applicable[i] or self.has_no_solution[i]:
+                results.append(None)
+                continue
+
+            point = [round(float(j), self.eps) for j in x[i]]
+            self.solutions[i] = float(self.c[i] @ point)
+            if self.mode == BatchedInteriorPointSolver.Mode.MINIMIZE:  # Flip the solution in case we were minimizing
+                self.solutions[i] *= -1
+            results.append((self.solutions[i], point))
+        return results
+
+    def solve(self) -> list[Union[tuple[float, list[float]], None]]:
+        """
+        Solve all problems in this solver and print the solution and X* of every one of them,
+        or print "The method is not applicable!" or "The problem does not have solution!" in those special cases.
+        :return: for every problem, a tuple (solution, X*) or [None] in special cases
+        """
+        results = self._solve()
+
+        for i, result in enumerate(results):
+            print(f"Problem {i + 1}:")
+            if result is not None:
+                print("X: ", result[1])
+                print("Solution:", result[0])
+            elif self.is_not_applicable[i]:
+                print("The method is not applicable!")
+            else:
+                print("The problem does not have solution!")
+        return results
@@ -0,0 +1,59 @@
+# Compare a cold SimplexSolver with InteriorPointSolver followed by a crossover to an optimal basis
+
+import argparse
+import time
+
+import numpy as np
+
+from bench_suite import FAMILIES, run_interior_point
+from numerics import Numerics
+from simplex_solver import SimplexSolver
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare a cold SimplexSolver with InteriorPointSolver "
+                                                 "followed by a crossover")
+    parser.add_argument("--scale", type=float, default=4.0, help="multiplies the size of every family of bench_suite")
+    parser.add_argument("--families", nargs="+", choices=list(FAMILIES), default=list(FAMILIES))
+    parser.add_argument("--eps", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'problem':>22} {'simplex, s':>10} {'pivots':>6} {'interior, s':>11} {'crossover, s':>12} {'pivots':>6} "
+          f"{'speedup':>7} {'difference':>10}")
+    for family in args.families:
+        generate, size = FAMILIES[family]
+        instance = generate(max(2, size(args.scale)), np.random.default_rng(args.seed))
+
+        def simplex_solver() -> SimplexSolver:
+            return SimplexSolver(instance.mode, list(instance.c), instance.a, list(instance.b), args.eps,
+                                 backend=SimplexSolver.Backend.NUMPY, constraints=instance.constraints,
+                                 numerics=Numerics())
+
+        start = time.perf_counter()
+        cold = simplex_solver().run()
+        simplex = time.perf_counter() - start
+
+        start = time.perf_counter()
+        point = run_interior_point(instance, args.eps, None)
+        interior = time.perf_counter() - start
+        if not point.is_optimal:
+            print(f"{instance.name:>22} {simplex:>10.3f} {cold.iterations:>6} {interior:>11.3f} "
+                  f"interior point: {point.status.value}")
+            continue
+
+        # The point has a slack or surplus variable for every row, the crossover takes the variables of the instance
+        start = time.perf_counter()
+        solver = simplex_solver()
+        result = solver.crossover(point.x[:len(instance.c)])
+        crossover = time.perf_counter() - start
+
+        # Pivots along edges of the polytope: the crash pivots only build the basis of the point
+        pivots = result.iterations + solver.dual_iterations
+        difference = abs(result.objective - cold.objective) / max(1.0, abs(cold.objective))
+        print(f"{instance.name:>22} {simplex:>10.3f} {cold.iterations:>6} {interior:>11.3f} {crossover:>12.3f} "
+              f"{pivots:>6} {simplex / (interior + crossover):>7.1f} {difference:>10.1e}")
+
+
+if __name__ == "__main__":
+    main()
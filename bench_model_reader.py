@@ -0,0 +1,85 @@
+# Measure parse throughput of the MPS and CPLEX LP readers in MB/s
+
+import argparse
+import os
+import tempfile
+from time import perf_counter
+
+import numpy as np
+
+import model_reader
+
+
+def write_mps(path: str, m: int, n: int, per_column: int, seed: int) -> None:
+    """
+    Write a random model with [m] constraints, [n] variables and [per_column] nonzeros in every column in MPS format
+    """
+    rng = np.random.default_rng(seed)
+    with open(path, "w") as file:
+        file.write("NAME          BENCH\nROWS\n N  COST\n")
+        file.writelines(f" L  R{i}\n" for i in range(m))
+        file.write("COLUMNS\n")
+        for j in range(n):
+            rows = rng.choice(m, per_column, replace=False)
+            values = rng.uniform(1, 10, per_column)
+            file.write(f"    X{j}  COST  {rng.uniform(1, 5):.6f}\n")
+            file.writelines(f"    X{j}  R{i}  {value:.6f}\n" for i, value in zip(rows, values))
+        file.write("RHS\n")
+        file.writelines(f"    RHS  R{i}  {value:.6f}\n" for i, value in enumerate(rng.uniform(n, 2 * n, m)))
+        file.write("BOUNDS\n")
+        file.writelines(f" UP BND  X{j}  {value:.6f}\n" for j, value in enumerate(rng.uniform(1, 10, n)))
+        file.write("ENDATA\n")
+
+
+def write_lp(path: str, m: int, n: int, per_row: int, seed: int) -> None:
+    """
+    Write a random model with [m] constraints, [n] variables and [per_row] nonzeros in every row in CPLEX LP format
+    """
+    rng = np.random.default_rng(seed)
+    with open(path, "w") as file:
+        file.write("Maximize\n obj:")
+        for j, value in enumerate(rng.uniform(1, 5, n)):
+            file.write(f" + {value:.6f} x{j}")
+            if j % 8 == 7:
+                file.write("\n")
+        file.write("\nSubject To\n")
+        for i in range(m):
+            columns = rng.choice(n, per_row, replace=False)
+            terms = " + ".join(f"{value:.6f} x{j}" for j, value in zip(columns, rng.uniform(1, 10, per_row)))
+            file.write(f" r{i}: {terms} <= {rng.uniform(n, 2 * n):.6f}\n")
+        file.write("Bounds\n")
+        file.writelines(f" x{j} <= {value:.6f}\n" for j, value in enumerate(rng.uniform(1, 10, n)))
+        file.write("End\n")
+
+
+def measure(read, path: str) -> tuple[float, float]:
+    """
+    :return: a tuple (size of the file in MB, throughput in MB/s)
+    """
+    size = os.path.getsize(path) / 2 ** 20
+    start = perf_counter()
+    read(path)
+    return size, size / (perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure parse throughput of the MPS and CPLEX LP readers")
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--columns", type=int, default=100_000)
+    parser.add_argument("--per-column", type=int, default=3, help="nonzeros in every column")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        mps = os.path.join(directory, "bench.mps")
+        lp = os.path.join(directory, "bench.lp")
+        write_mps(mps, args.rows, args.columns, args.per_column, seed=1)
+        write_lp(lp, args.rows, args.columns, args.columns * args.per_column // args.rows, seed=1)
+
+        print(f"{'format':>6} {'size, MB':>10} {'MB/s':>8}")
+        for name, read, path in (("MPS", model_reader.read_mps, mps), ("LP", model_reader.read_lp, lp)):
+            size, throughput = measure(read, path)
+            print(f"{name:>6} {size:10.1f} {throughput:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
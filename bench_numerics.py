@@ -0,0 +1,75 @@
+# Compare rounding every cell to eps digits with the numerics mode of the Simplex method on badly scaled problems
+
+import argparse
+from typing import Union
+
+import numpy as np
+from scipy.optimize import linprog
+
+from numerics import Numerics
+from simplex_solver import SimplexSolver
+
+
+def badly_scaled_problem(m: int, n: int, spread: float, rng: np.random.Generator):
+    """
+    :param spread: how many orders of magnitude the row and column scales of the coefficients span
+    :return: a tuple (c, a, b) of a random problem with a strictly feasible slack basis, whose rows and columns
+        are multiplied by random powers of 10
+    """
+    row = 10 ** rng.uniform(-spread / 2, spread / 2, m)
+    column = 10 ** rng.uniform(-spread / 2, spread / 2, n)
+    a = row[:, np.newaxis] * rng.uniform(1, 10, (m, n)) * column
+    a[rng.random((m, n)) < 0.5] = 0
+    return rng.uniform(1, 10, n) * column, a, row * rng.uniform(10, 100, m)
+
+
+SETTINGS = {
+    "rounding": None,
+    "no scaling": Numerics(scaling=Numerics.Scaling.NONE),
+    "geometric": Numerics(scaling=Numerics.Scaling.GEOMETRIC),
+    "equilibration": Numerics(scaling=Numerics.Scaling.EQUILIBRATION),
+}
+"""Arithmetic of the solver by name, [None] rounds every cell"""
+
+
+def solve(c: np.ndarray, a: np.ndarray, b: np.ndarray, eps: int, numerics: Union[Numerics, None]):
+    """
+    :return: a tuple (result, refactorizations) of the solve
+    """
+    solver = SimplexSolver(SimplexSolver.Mode.MAXIMIZE, list(c), a.copy(), list(b), eps,
+                           backend=SimplexSolver.Backend.NUMPY, numerics=numerics)
+    return solver.run(), solver.refactorizations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the arithmetic of the Simplex method on badly scaled problems")
+    parser.add_argument("--rows", type=int, default=40)
+    parser.add_argument("--columns", type=int, default=80)
+    parser.add_argument("--problems", type=int, default=5, help="problems of every spread")
+    parser.add_argument("--eps", type=int, default=9)
+    args = parser.parse_args()
+
+    print(f"{'spread':>6} {'arithmetic':>14} {'iterations':>10} {'refactor':>8} {'time, s':>8} "
+          f"{'max rel. error':>14} {'failed':>6}")
+    for spread in (0, 3, 6):
+        problems = [badly_scaled_problem(args.rows, args.columns, spread, np.random.default_rng(seed))
+                    for seed in range(args.problems)]
+        references = [-linprog(-c, A_ub=a, b_ub=b).fun for c, a, b in problems]
+        for name, numerics in SETTINGS.items():
+            iterations = refactorizations = failed = 0
+            time = error = 0.0
+            for (c, a, b), reference in zip(problems, references):
+                result, refactored = solve(c, a, b, args.eps, numerics)
+                iterations += result.iterations
+                refactorizations += refactored
+                time += result.time
+                if result.is_optimal:
+                    error = max(error, abs(result.objective - reference) / max(1.0, abs(reference)))
+                else:
+                    failed += 1
+            print(f"{spread:>6} {name:>14} {iterations:>10} {refactorizations:>8} {time:>8.3f} "
+                  f"{error:>14.2e} {failed:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Measure what presolve removes and the end-to-end speedup of solving with it
+
+import argparse
+import contextlib
+import io
+from time import perf_counter
+
+import numpy as np
+from scipy import sparse
+
+from lp_model import Model
+from presolve import Presolver
+from primal_dual_solver import PrimalDualSolver
+from revised_simplex_solver import RevisedSimplexSolver
+from simplex_solver import SimplexSolver
+
+
+def redundant_problem(m: int, n: int, seed: int) -> Model:
+    """
+    Generate a random maximization problem a * x <= b, x >= 0 with m useful constraints and n useful variables,
+    padded with the structures presolve removes: empty rows, duplicate rows, singleton rows, rows that the bounds
+    always satisfy, variables fixed at zero and variables that do not pay off
+    """
+    rng = np.random.default_rng(seed)
+    a = sparse.random(m, n, density=0.3, random_state=rng, data_rvs=lambda k: rng.uniform(1, 10, k)).toarray()
+    b = rng.uniform(n, 2 * n, m)
+    c = rng.uniform(1, 5, n)
+
+    extra = n // 4
+    a = np.hstack((a, rng.uniform(1, 10, (m, extra))))  # Dominated: their objective coefficients are negative
+    c = np.concatenate((c, -rng.uniform(1, 5, extra)))
+    width = a.shape[1]
+
+    duplicates = rng.choice(m, m // 4)
+    scales = rng.uniform(0.5, 2, len(duplicates))
+    rows = [
+        a,
+        np.zeros((m // 10, width)),  # Empty
+        a[duplicates] * scales[:, None],  # Scaled copies of other rows
+        np.eye(width),  # Upper bounds of every variable
+        rng.uniform(0.1, 1, (m // 4, width)),  # Always satisfied within the bounds
+    ]
+    b = np.concatenate((
+        b,
+        np.ones(m // 10),
+        b[duplicates] * scales,
+        np.where(rng.random(width) < 0.1, 0.0, rng.uniform(1, 10, width)),  # Some variables are fixed at zero
+        np.full(m // 4, 10 * width),
+    ))
+    a = np.vstack(rows)
+    return Model.from_inequality_form(SimplexSolver.Mode.MAXIMIZE, c, a, b)
+
+
+def solve(model: Model, solver: str, eps: int) -> tuple[float, float]:
+    """
+    :return: a tuple (objective function value, solve time in seconds)
+    """
+    start = perf_counter()
+    if solver == "revised-simplex":
+        form = model.inequality_form()
+        result = RevisedSimplexSolver(model.mode, form.c, form.a, form.b, eps)
+    else:
+        form = model.standard_form()
+        result = PrimalDualSolver(model.mode, form.c, form.a, form.b, eps)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = result._solve()
+    return result[0] + form.offset, perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure what presolve removes and the end-to-end speedup")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200], help="useful constraints of each problem")
+    parser.add_argument("--eps", type=int, default=6)
+    args = parser.parse_args()
+
+    print(f"{'m':>5} {'solver':>15} {'without, s':>11} {'with, s':>9} {'speedup':>8} {'objective':>12}")
+    for m in args.sizes:
+        model = redundant_problem(m, 2 * m, seed=m)
+        presolver = Presolver(model)
+        presolver.presolve()
+        print(presolver.statistics)
+
+        for solver in ("revised-simplex", "primal-dual"):
+            objective, plain = solve(model, solver, args.eps)
+            start = perf_counter()
+            presolver = Presolver(model)
+            reduced = presolver.presolve()
+            reduced_objective, _ = solve(reduced, solver, args.eps)
+            presolved = perf_counter() - start
+            assert abs(objective - reduced_objective) <= 10 ** (3 - args.eps) * max(1.0, abs(objective))
+            print(f"{m:>5} {solver:>15} {plain:11.3f} {presolved:9.3f} {plain / presolved:7.1f}x {objective:12.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Compare iteration counts and time of the pricing rules of the Simplex method on families of problems
+
+import argparse
+import json
+
+import numpy as np
+
+import pricing
+from simplex_solver import SimplexSolver
+
+
+def dense_problem(m: int, n: int, rng: np.random.Generator):
+    """
+    :return: a tuple (c, a, b) of a random dense problem with a strictly feasible slack basis
+    """
+    return rng.uniform(1, 10, n), rng.uniform(1, 10, (m, n)), rng.uniform(10, 100, m)
+
+
+def degenerate_problem(m: int, n: int, rng: np.random.Generator):
+    """
+    :return: a tuple (c, a, b) of a random problem where half of the right hand side is zero,
+        so many pivots do not move the objective function
+    """
+    a = rng.uniform(1, 10, (m, n))
+    b = np.where(rng.random(m) < 0.5, 0.0, rng.uniform(10, 100, m))
+    for i in np.flatnonzero(b == 0):  # x >= 0 turns a zero row into x_j = 0 for its columns, so keep it short
+        a[i] = 0
+        columns = rng.choice(n, 3, replace=False)
+        a[i, columns[:2]] = rng.uniform(1, 10, 2)
+        a[i, columns[2]] = -rng.uniform(1, 10)
+    return rng.uniform(1, 10, n), a, b
+
+
+def sparse_problem(m: int, n: int, rng: np.random.Generator):
+    """
+    :return: a tuple (c, a, b) of a random wide problem with 3 nonzeros in every column
+    """
+    a = np.zeros((m, n))
+    for j in range(n):
+        a[rng.choice(m, 3, replace=False), j] = rng.uniform(1, 10, 3)
+    return rng.uniform(1, 10, n), a, np.asarray(a.sum(axis=1)) + 1
+
+
+FAMILIES = {"dense": dense_problem, "degenerate": degenerate_problem, "sparse": sparse_problem}
+"""Generators of the problem families by name"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the pricing rules of the Simplex method")
+    parser.add_argument("--rows", type=int, default=60)
+    parser.add_argument("--columns", type=int, default=120)
+    parser.add_argument("--problems", type=int, default=5, help="problems of every family")
+    parser.add_argument("--eps", type=int, default=12)
+    parser.add_argument("--json", help="also write every measurement to this file")
+    args = parser.parse_args()
+
+    records = []
+    print(f"{'family':>10} {'rule':>14} {'iterations':>10} {'degenerate':>10} {'bland':>6} "
+          f"{'pricing, s':>10} {'total, s':>9}")
+    for family, generate in FAMILIES.items():
+        rng = np.random.default_rng(1)
+        problems = [generate(args.rows, args.columns, rng) for _ in range(args.problems)]
+
+        best = None
+        for name, rule in pricing.RULES.items():
+            runs = []
+            for problem, (c, a, b) in enumerate(problems):
+                solver = SimplexSolver(SimplexSolver.Mode.MAXIMIZE, list(c), a, b, args.eps,
+                                       backend=SimplexSolver.Backend.NUMPY, pricing=rule())
+                result = solver._solve()
+                runs.append(dict(family=family, problem=problem, rule=name, iterations=solver.iterations,
+                                 degenerate_iterations=solver.degenerate_iterations,
+                                 bland_iterations=solver.bland_iterations, pricing_time=solver.pricing_time,
+                                 time=solver.time, solution=None if result is None else result[0]))
+            records.extend(runs)
+
+            mean = {key: float(np.mean([run[key] for run in runs]))
+                    for key in ("iterations", "degenerate_iterations", "bland_iterations", "pricing_time", "time")}
+            print(f"{family:>10} {name:>14} {mean['iterations']:10.1f} {mean['degenerate_iterations']:10.1f} "
+                  f"{mean['bland_iterations']:6.1f} {mean['pricing_time']:10.4f} {mean['time']:9.4f}")
+            if best is None or mean["time"] < best[1]:
+                best = name, mean["time"]
+        print(f"{family:>10} fastest: {best[0]}")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(records, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Compare solving scenarios of one constraint matrix separately with ScenarioSolver
+
+import argparse
+import time
+
+import numpy as np
+
+from interior_point_solver import InteriorPointSolver
+from numerics import Numerics
+from scenarios import ScenarioSolver
+from simplex_solver import SimplexSolver
+from solver_result import SolverResult
+
+
+def separately(mode: SimplexSolver.Mode, c: np.ndarray, a: np.ndarray, b: np.ndarray, eps: int,
+               solver: str) -> list[SolverResult]:
+    """
+    Solve every scenario from scratch
+    """
+    if solver == "simplex":
+        return [SimplexSolver(mode, list(c_i), a, list(b_i), eps, backend=SimplexSolver.Backend.NUMPY,
+                              numerics=Numerics()).run() for c_i, b_i in zip(c, b)]
+    mode = InteriorPointSolver.Mode(mode.value)
+    return [InteriorPointSolver(mode, None, list(c_i), a, list(b_i), 0.5, eps).run() for c_i, b_i in zip(c, b)]
+
+
+def together(mode: SimplexSolver.Mode, c: np.ndarray, a: np.ndarray, b: np.ndarray, eps: int,
+             solver: str) -> tuple[list[SolverResult], int]:
+    """
+    Solve the scenarios with [ScenarioSolver]
+    :return: a tuple (results, warm starts)
+    """
+    scenarios = ScenarioSolver(mode, c, a, b, eps)
+    if solver == "simplex":
+        # Without numerics, the round-off of the rounded tableau adds up along the chains of warm starts
+        results = scenarios.simplex(backend=SimplexSolver.Backend.NUMPY, numerics=Numerics())
+    else:
+        results = scenarios.interior_point(0.5)
+    return results, scenarios.warm_starts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare separate solves of scenarios with ScenarioSolver")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--columns", type=int, default=200)
+    parser.add_argument("--scenarios", type=int, default=100)
+    parser.add_argument("--spread", type=float, default=0.01, help="relative standard deviation of the scenarios")
+    parser.add_argument("--eps", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    m, n, k = args.rows, args.columns, args.scenarios
+    # Inequalities with slack columns, so that the Interior-Point solver gets the same problem as equalities
+    a = np.hstack((rng.uniform(1, 10, (m, n)), np.eye(m)))
+    c, b = np.concatenate((rng.uniform(1, 10, n), np.zeros(m))), rng.uniform(10 * n, 20 * n, m)
+    blocks = {
+        "right hand sides": (np.broadcast_to(c, (k, n + m)), b * rng.normal(1, args.spread, (k, m))),
+        "objectives": (np.hstack((c[:n] * rng.normal(1, args.spread, (k, n)), np.zeros((k, m)))),
+                       np.broadcast_to(b, (k, m))),
+    }
+
+    print(f"{k} scenarios of {m} x {n + m} constraints")
+    print(f"{'varying':>16} {'solver':>14} {'separately, s':>13} {'scenarios, s':>12} {'speedup':>7} "
+          f"{'warm starts':>11} {'max difference':>14}")
+    for name, (cs, bs) in blocks.items():
+        for solver in ("simplex", "interior-point"):
+            start = time.perf_counter()
+            expected = separately(SimplexSolver.Mode.MAXIMIZE, cs, a, bs, args.eps, solver)
+            alone = time.perf_counter() - start
+            start = time.perf_counter()
+            results, warm_starts = together(SimplexSolver.Mode.MAXIMIZE, cs, a, bs, args.eps, solver)
+            shared = time.perf_counter() - start
+            difference = max((abs(result.objective - other.objective) / max(1.0, abs(other.objective))
+                              for result, other in zip(results, expected) if result.is_optimal and other.is_optimal),
+                             default=float("nan"))
+            print(f"{name:>16} {solver:>14} {alone:>13.3f} {shared:>12.3f} {alone / shared:>7.1f} "
+                  f"{warm_starts:>11} {difference:>14.1e}")
+
+
+if __name__ == "__main__":
+    main()
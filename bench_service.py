@@ -0,0 +1,78 @@
+# Load generator for SolveService: latency percentiles and throughput of a stream of requests with repeats
+
+import argparse
+import asyncio
+from time import perf_counter
+
+import numpy as np
+
+from batch_solver import BatchSolver, Problem
+from simplex_solver import SimplexSolver
+from solve_service import ServiceOverloadedError, SolveService
+
+
+def percentile(latencies: list[float], q: float) -> float:
+    """
+    :return: the [q]-th percentile of [latencies] in milliseconds, nan if there are none
+    """
+    return float(np.percentile(latencies, q)) * 1000 if latencies else float("nan")
+
+
+async def client(service: SolveService, requests: list[Problem], timeout: float, latencies: list[float],
+                 errors: dict[str, int]) -> None:
+    """
+    Send requests one after another until [requests] is empty, recording the latency of every answered one
+    """
+    while requests:
+        problem = requests.pop()
+        start = perf_counter()
+        try:
+            await service.solve(problem, timeout or None)
+            latencies.append(perf_counter() - start)
+        except (TimeoutError, ServiceOverloadedError) as error:
+            errors[type(error).__name__] = errors.get(type(error).__name__, 0) + 1
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(0)
+    a = rng.uniform(1, 10, (args.rows, args.columns))
+    b = list(rng.uniform(10, 100, args.rows))
+    objectives = [list(rng.uniform(1, 10, args.columns)) for _ in range(args.distinct)]
+
+    async with SolveService(BatchSolver.Pool(args.pool), args.workers, args.max_pending,
+                            wait_when_full=not args.reject) as service:
+        shared = service.share(a)
+        requests = [Problem(SimplexSolver, dict(mode=SimplexSolver.Mode.MAXIMIZE, c=objectives[i], a=shared, b=b,
+                                                eps=9, backend=SimplexSolver.Backend.NUMPY))
+                    for i in rng.integers(0, args.distinct, args.requests)]
+        latencies, errors = [], {}
+        start = perf_counter()
+        await asyncio.gather(*[client(service, requests, args.timeout, latencies, errors)
+                               for _ in range(args.concurrency)])
+        elapsed = perf_counter() - start
+
+    print(f"{args.requests} requests of {args.distinct} distinct problems, {args.concurrency} clients, "
+          f"{service._batch.workers} {args.pool} workers, at most {service.max_pending} solves in flight")
+    print(f"Throughput: {len(latencies) / elapsed:.1f} requests/s in {elapsed:.2f} s")
+    print(f"Latency: p50 {percentile(latencies, 50):.1f} ms, p99 {percentile(latencies, 99):.1f} ms, "
+          f"max {percentile(latencies, 100):.1f} ms")
+    print(f"Solves: {service.solves}, coalesced requests: {service.coalesced}, errors: {errors or 'none'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure latency and throughput of SolveService under load")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--distinct", type=int, default=40, help="distinct problems the requests repeat")
+    parser.add_argument("--concurrency", type=int, default=32, help="clients sending requests at the same time")
+    parser.add_argument("--pool", choices=[pool.value for pool in BatchSolver.Pool], default="process")
+    parser.add_argument("--workers", type=int, help="number of workers. The number of processors if absent")
+    parser.add_argument("--max-pending", type=int, default=0, help="solves in flight. 4 per worker if 0")
+    parser.add_argument("--timeout", type=float, default=0, help="seconds per request, no limit if 0")
+    parser.add_argument("--reject", action="store_true", help="fail requests when the queue is full instead of waiting")
+    parser.add_argument("--rows", type=int, default=60)
+    parser.add_argument("--columns", type=int, default=120)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
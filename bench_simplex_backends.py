@@ -0,0 +1,46 @@
+# Compare the list-based and the NumPy tableau backends of the Simplex method solver on growing problems
+
+import random
+from time import perf_counter
+
+from simplex_solver import SimplexSolver
+
+
+def random_problem(m: int, n: int, seed: int) -> tuple[list[float], list[list[float]], list[float]]:
+    """
+    Generate a random bounded maximization problem with <= constraints
+    :param m: number of constraints
+    :param n: number of variables
+    :param seed: seed of the random generator
+    :return: a tuple (c, a, b)
+    """
+    rng = random.Random(seed)
+    c = [rng.randint(1, 20) for _ in range(n)]
+    a = [[rng.randint(1, 30) for _ in range(n)] for _ in range(m)]
+    b = [rng.randint(100, 1000) for _ in range(m)]
+    return c, a, b
+
+
+def time_solve(backend: SimplexSolver.Backend, c: list[float], a: list[list[float]], b: list[float]) -> float:
+    """
+    Solve the problem with the given backend
+    :return: wall time of the solve in seconds
+    """
+    solver = SimplexSolver(SimplexSolver.Mode.MAXIMIZE, c, [row[:] for row in a], b[:], 5, backend=backend)
+    start = perf_counter()
+    solver.run()
+    return perf_counter() - start
+
+
+def main() -> None:
+    time_solve(SimplexSolver.Backend.NUMPY, *random_problem(2, 2, seed=0))  # Warm up: import NumPy outside of timing
+    print(f"{'m x n':>12} {'list, s':>10} {'numpy, s':>10} {'speedup':>8}")
+    for m, n in [(10, 20), (25, 50), (50, 100), (100, 200), (200, 400)]:
+        c, a, b = random_problem(m, n, seed=m * n)
+        list_time = time_solve(SimplexSolver.Backend.LIST, c, a, b)
+        numpy_time = time_solve(SimplexSolver.Backend.NUMPY, c, a, b)
+        print(f"{f'{m} x {n}':>12} {list_time:>10.4f} {numpy_time:>10.4f} {list_time / numpy_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# Compare memory and time of dense and sparse constraint matrices on wide problems
+
+import argparse
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+from scipy import sparse
+
+from interior_point_solver import InteriorPointSolver
+from revised_simplex_solver import RevisedSimplexSolver
+
+
+def random_sparse_problem(m: int, n: int, per_column: int, seed: int):
+    """
+    Generate a random bounded maximization problem a * x <= b with [per_column] nonzeros in every column
+    :return: a tuple (c, a, b) where [a] is a CSC matrix
+    """
+    rng = np.random.default_rng(seed)
+    rows = np.concatenate([rng.choice(m, per_column, replace=False) for _ in range(n)])
+    columns = np.repeat(np.arange(n), per_column)
+    a = sparse.csc_matrix((rng.uniform(1, 10, n * per_column), (rows, columns)), shape=(m, n))
+    b = np.asarray(a.sum(axis=1)).ravel() + 1  # x = 1 is strictly feasible
+    c = rng.uniform(1, 5, n)
+    return c, a, b
+
+
+def matrix_size(matrix) -> float:
+    """
+    :return: memory held by a dense or sparse matrix in MB
+    """
+    if sparse.issparse(matrix):
+        return (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 2 ** 20
+    return matrix.nbytes / 2 ** 20
+
+
+def measure(solve) -> tuple[float, float, object]:
+    """
+    Run a solve under tracemalloc
+    :return: a tuple (wall time in seconds, peak traced memory in MB, result)
+    """
+    tracemalloc.start()
+    start = perf_counter()
+    result = solve()
+    elapsed = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare dense and sparse constraint matrices on wide problems")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--columns", type=int, default=100_000)
+    parser.add_argument("--per-column", type=int, default=3, help="nonzeros in every column")
+    parser.add_argument("--skip-dense", action="store_true", help="only run the sparse matrices")
+    args = parser.parse_args()
+
+    c, a, b = random_sparse_problem(args.rows, args.columns, args.per_column, seed=0)
+    m, n = a.shape
+
+    # Interior point works on the standard form [a | I] * x = b, starting from x = 1
+    a_standard = sparse.hstack((a, sparse.identity(m)), format="csr")
+    c_standard = np.concatenate((c, np.zeros(m)))
+    start = np.ones(n + m)
+
+    runs = {
+        "InteriorPointSolver": lambda matrix: InteriorPointSolver(
+            InteriorPointSolver.Mode.MAXIMIZE, start, c_standard, matrix, b, 0.5, 5
+        ).run(),
+        "RevisedSimplexSolver": lambda matrix: RevisedSimplexSolver(
+            RevisedSimplexSolver.Mode.MAXIMIZE, c, matrix, b, 5
+        ).run(),
+    }
+    matrices = {
+        "InteriorPointSolver": a_standard,
+        "RevisedSimplexSolver": a,
+    }
+
+    print(f"{m} x {n}, {a.nnz} nonzeros")
+    print(f"{'solver':>22} {'matrix':>7} {'matrix, MB':>11} {'time, s':>9} {'peak, MB':>9} {'objective':>14}")
+    for name, run in runs.items():
+        for kind in ("sparse", "dense"):
+            if kind == "dense" and args.skip_dense:
+                continue
+            matrix = matrices[name] if kind == "sparse" else matrices[name].toarray()
+            elapsed, peak, result = measure(lambda: run(matrix))
+            objective = f"{result.objective:.4f}" if result.is_optimal else "-"
+            print(f"{name:>22} {kind:>7} {matrix_size(matrix):>11.1f} {elapsed:>9.3f} {peak:>9.1f} {objective:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Measure the startup of the solver modules and of one-shot command line runs with python -X importtime
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+HEAVY = ("numpy", "scipy")
+"""Top-level packages that dominate the startup when they are imported"""
+
+
+def problem(m: int, n: int, seed: int) -> str:
+    """
+    :return: a random problem a * x = b, x >= 0 with slack columns, in the input format of custom_input.py
+    """
+    rng = np.random.default_rng(seed)
+    a = np.hstack((rng.uniform(1, 10, (m, n)), np.eye(m)))
+    c = np.concatenate((rng.uniform(1, 10, n), np.zeros(m)))
+    b = rng.uniform(10 * n, 20 * n, m)
+    lines = ["max", str(n + m), *map(str, c), str(m), *(" ".join(map(str, row)) for row in a), *map(str, b), "0", "6"]
+    return "\n".join(lines) + "\n"
+
+
+CASES: dict[str, tuple[list[str], bool, bool]] = {
+    "import interior_point_solver": (["-c", "import interior_point_solver"], False, False),
+    "import simplex_solver": (["-c", "import simplex_solver"], False, False),
+    "import solve_input": (["-c", "import solve_input"], False, False),
+    "solve_input.py --solver simplex": (["solve_input.py", "--solver", "simplex"], True, False),
+    "solve_input.py": (["solve_input.py"], True, True),
+    "solve_input.py --solver primal-dual": (["solve_input.py", "--solver", "primal-dual"], True, True),
+    "custom_input.py": (["custom_input.py"], True, True),
+}
+"""Arguments of python, whether the run reads the problem from stdin and whether it may import [HEAVY] by name"""
+
+
+def measure(arguments: list[str], stdin: str) -> tuple[float, float, list[str]]:
+    """
+    Run python -X importtime with [arguments]
+    :return: a tuple (wall time in seconds, time of all imports in seconds, [HEAVY] packages imported)
+    """
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, "-X", "importtime", *arguments], input=stdin, capture_output=True,
+                             text=True, check=True)
+    elapsed = time.perf_counter() - start
+
+    # Lines "import time: self [us] | cumulative | imported package", nested imports are indented
+    imports, heavy = 0, set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        imports += int(own)
+        if name.strip().split(".")[0] in HEAVY:
+            heavy.add(name.strip().split(".")[0])
+    return elapsed, imports / 1e6, sorted(heavy)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the startup of the solver modules and of one-shot "
+                                                 "command line runs with python -X importtime")
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case, the median counts")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stdin = problem(args.rows, args.columns, args.seed)
+    print(f"{'case':>36} {'wall, ms':>8} {'imports, ms':>11}  heavy imports")
+    flagged = 0
+    for name, (arguments, reads, heavy_allowed) in CASES.items():
+        runs = [measure(arguments, stdin if reads else "") for _ in range(args.repeat)]
+        heavy = runs[0][2]
+        # Modules and runs that never need NumPy must not import it, which would add most of the startup
+        regression = bool(heavy) and not heavy_allowed
+        flagged += regression
+        print(f"{name:>36} {statistics.median(run[0] for run in runs) * 1000:>8.1f} "
+              f"{statistics.median(run[1] for run in runs) * 1000:>11.1f}  {', '.join(heavy) or '-'}"
+              + ("  REGRESSION" if regression else ""))
+    sys.exit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+# Reproducible benchmark suite of SimplexSolver and InteriorPointSolver with a regression baseline
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Union
+
+import numpy as np
+from scipy.optimize import linprog
+
+from bench_pricing import degenerate_problem, dense_problem, sparse_problem
+from interior_point_solver import InteriorPointSolver
+from simplex_solver import SimplexSolver
+from solver_result import SolverResult, Verbosity
+
+
+@dataclass
+class Instance:
+    """
+    One generated problem: minimize or maximize c * x subject to a * x (<=, >=) b, x >= 0
+    """
+
+    name: str
+    """Family and size, e.g. "dense-40x80" """
+
+    mode: SimplexSolver.Mode
+    """Whether to maximize or minimize"""
+
+    c: np.ndarray
+    """Coefficients of the objective function"""
+
+    a: np.ndarray
+    """Matrix of the coefficients of the constraints"""
+
+    b: np.ndarray
+    """Right hand side of the constraints"""
+
+    constraints: list[SimplexSolver.Constraint]
+    """Kind of every constraint"""
+
+
+def inequalities(name: str, generate: Callable) -> Callable[[int, np.random.Generator], Instance]:
+    """
+    :return: a generator of [Instance] of size [size] from a generator of (c, a, b) maximization problems
+        with <= constraints of [bench_pricing]
+    """
+    def generator(size: int, rng: np.random.Generator) -> Instance:
+        c, a, b = generate(size, 2 * size, rng)
+        return Instance(f"{name}-{size}x{2 * size}", SimplexSolver.Mode.MAXIMIZE, c, a, np.asarray(b, dtype=float),
+                        [SimplexSolver.Constraint.LESS_EQUAL] * size)
+
+    return generator
+
+
+def transportation_problem(size: int, rng: np.random.Generator) -> Instance:
+    """
+    :return: a random transportation problem from [size] sources to 2 * [size] destinations: minimize the cost
+        of shipping, sending at most the supply of every source and at least the demand of every destination
+    """
+    sources, destinations = size, 2 * size
+    demand = rng.uniform(10, 50, destinations)
+    supply = rng.dirichlet(np.ones(sources)) * demand.sum() * 1.2 + 1  # 20% more supply than demand, every source some
+    a = np.zeros((sources + destinations, sources * destinations))
+    for i in range(sources):
+        a[i, i * destinations:(i + 1) * destinations] = 1
+    for j in range(destinations):
+        a[sources + j, j::destinations] = 1
+    constraints = [SimplexSolver.Constraint.LESS_EQUAL] * sources + [SimplexSolver.Constraint.GREATER_EQUAL] * destinations
+    return Instance(f"transportation-{sources}x{destinations}", SimplexSolver.Mode.MINIMIZE,
+                    rng.uniform(1, 20, sources * destinations), a, np.concatenate((supply, demand)), constraints)
+
+
+def klee_minty_problem(size: int, _: np.random.Generator) -> Instance:
+    """
+    :return: the Klee-Minty cube of dimension [size]: Dantzig's rule visits all of its 2^size vertices
+    """
+    a = np.eye(size)
+    for i in range(size):
+        for j in range(i):
+            a[i, j] = 2 ** (i - j + 1)
+    return Instance(f"klee-minty-{size}", SimplexSolver.Mode.MAXIMIZE, 2.0 ** np.arange(size - 1, -1, -1), a,
+                    5.0 ** np.arange(1, size + 1), [SimplexSolver.Constraint.LESS_EQUAL] * size)
+
+
+FAMILIES: dict[str, tuple[Callable[[int, np.random.Generator], Instance], Callable[[float], int]]] = {
+    "dense": (inequalities("dense", dense_problem), lambda scale: round(40 * scale)),
+    "sparse": (inequalities("sparse", sparse_problem), lambda scale: round(40 * scale)),
+    "degenerate": (inequalities("degenerate", degenerate_problem), lambda scale: round(40 * scale)),
+    "transportation": (transportation_problem, lambda scale: round(8 * scale)),
+    # Dantzig's rule takes 2^size - 1 pivots, so doubling the scale adds one dimension
+    "klee-minty": (klee_minty_problem, lambda scale: 8 + round(np.log2(scale))),
+}
+"""Generator and size at a scale of every family"""
+
+
+def run_simplex(instance: Instance, eps: int) -> SolverResult:
+    """
+    Solve [instance] with [SimplexSolver] and the NumPy backend
+    """
+    return SimplexSolver(instance.mode, list(instance.c), instance.a, list(instance.b), eps,
+                         backend=SimplexSolver.Backend.NUMPY, constraints=instance.constraints,
+                         verbosity=Verbosity.QUIET).run()
+
+
+def run_interior_point(instance: Instance, eps: int, alpha: Union[float, None] = 0.5) -> SolverResult:
+    """
+    Solve [instance] with [InteriorPointSolver] after adding a slack or surplus variable to every row
+    """
+    m, n = instance.a.shape
+    signs = [1 if constraint == SimplexSolver.Constraint.LESS_EQUAL else -1 for constraint in instance.constraints]
+    a = np.hstack((instance.a, np.diag(signs)))
+    c = np.concatenate((instance.c, np.zeros(m)))
+    mode = InteriorPointSolver.Mode(instance.mode.value)
+    return InteriorPointSolver(mode, None, list(c), a, list(instance.b), alpha, eps).run()
+
+
+SOLVERS: dict[str, Callable[[Instance, int], SolverResult]] = {
+    "simplex": run_simplex,
+    "interior-point": run_interior_point,
+    "interior-point-adaptive": lambda instance, eps: run_interior_point(instance, eps, None),
+}
+"""Functions solving an [Instance] by solver name"""
+
+
+def reference(instance: Instance) -> Union[float, None]:
+    """
+    :return: the optimal objective function value by scipy's HiGHS, [None] if it finds none
+    """
+    signs = np.array([1 if constraint == SimplexSolver.Constraint.LESS_EQUAL else -1
+                      for constraint in instance.constraints])
+    sign = -1 if instance.mode == SimplexSolver.Mode.MAXIMIZE else 1
+    result = linprog(sign * instance.c, A_ub=signs[:, np.newaxis] * instance.a, b_ub=signs * instance.b)
+    return sign * result.fun if result.status == 0 else None
+
+
+def measure(solve: Callable[[Instance, int], SolverResult], instance: Instance, eps: int, repeat: int,
+            optimum: Union[float, None]) -> dict:
+    """
+    Solve [instance] [repeat] times for the time and once more under tracemalloc for the peak memory
+    :return: the measurements by name. The error is relative to [optimum], [None] without an optimum
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = solve(instance, eps)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    solve(instance, eps)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    error = None  # Not comparable, the status tells what went wrong
+    if result.is_optimal and optimum is not None:
+        error = abs(result.objective - optimum) / max(1.0, abs(optimum))
+    return dict(status=result.status.value, time=min(times), iterations=result.iterations, peak=peak, error=error)
+
+
+def regressions(record: dict, baseline: dict, time_tolerance: float, error_tolerance: float) -> list[str]:
+    """
+    Compare a measurement with its baseline. The status, the iterations and the error do not depend on the machine,
+    so they have to match the baseline, while the time and the peak memory only must not grow by much
+    :param time_tolerance: relative slowdown up to which the time is not a regression
+    :param error_tolerance: growth of the error up to which it is round-off of another machine, not a regression
+    :return: descriptions of what changed or got worse, empty if nothing did
+    """
+    found = []
+    if record["status"] != baseline["status"]:
+        found.append(f"status {baseline['status']} -> {record['status']}")
+    # Times of a few milliseconds are noise, so a slowdown also has to be 5 ms
+    if record["time"] > baseline["time"] * (1 + time_tolerance) and record["time"] - baseline["time"] > 0.005:
+        found.append(f"time {baseline['time']:.4f} -> {record['time']:.4f} s")
+    # Fewer iterations are also flagged: the baseline has to be saved again to accept them
+    if record["iterations"] != baseline["iterations"]:
+        found.append(f"iterations {baseline['iterations']} -> {record['iterations']}")
+    if record["peak"] > baseline["peak"] * 1.25 + 2 ** 16:
+        found.append(f"peak {baseline['peak'] / 2 ** 20:.2f} -> {record['peak'] / 2 ** 20:.2f} MB")
+    if (record["error"] is None) != (baseline["error"] is None) or record["error"] is not None \
+            and record["error"] > baseline["error"] + error_tolerance:
+        found.append(f"error {baseline['error']} -> {record['error']}")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark SimplexSolver and InteriorPointSolver on generated problems "
+                                                 "and compare with a baseline")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies the size of every family")
+    parser.add_argument("--families", nargs="+", choices=list(FAMILIES), default=list(FAMILIES))
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), default=list(SOLVERS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="solves per problem, the fastest one counts")
+    parser.add_argument("--eps", type=int, default=9)
+    parser.add_argument("--save", help="write the measurements to this JSON file, e.g. to make a new baseline")
+    parser.add_argument("--baseline", help="JSON file of [--save] to compare with, e.g. bench_suite_baseline.json "
+                                           "of the default arguments. Exits with 1 on regressions")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="relative slowdown that is not a regression")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["records"]
+
+    records, flagged = {}, 0
+    print(f"{'problem':>22} {'solver':>23} {'status':>10} {'time, s':>8} {'iterations':>10} {'peak, MB':>8} "
+          f"{'error':>8}")
+    for family in args.families:
+        generate, size = FAMILIES[family]
+        instance = generate(max(2, size(args.scale)), np.random.default_rng(args.seed))
+        optimum = reference(instance)
+        for solver in args.solvers:
+            key = f"{instance.name}/{solver}"
+            record = records[key] = measure(SOLVERS[solver], instance, args.eps, args.repeat, optimum)
+            found = regressions(record, baseline[key], args.time_tolerance, 10 ** -args.eps) \
+                if key in baseline else []
+            flagged += bool(found)
+            print(f"{instance.name:>22} {solver:>23} {record['status']:>10} {record['time']:>8.4f} "
+                  f"{record['iterations']:>10} {record['peak'] / 2 ** 20:>8.2f} "
+                  f"{'-' if record['error'] is None else format(record['error'], '.1e'):>8}"
+                  + (f"  REGRESSION: {', '.join(found)}" if found else ""))
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(dict(arguments=vars(args), records=records), file, indent=2)
+    if args.baseline:
+        missing = [key for key in records if key not in baseline]
+        print(f"{flagged} regressions against {args.baseline}"
+              + (f", {len(missing)} problems not in the baseline" if missing else ""))
+        sys.exit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Measure the memory of the SimplexSolver tableau: list backend, NumPy backend and memory-mapped NumPy backend
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from simplex_solver import SimplexSolver
+
+SETTINGS = {
+    "list": dict(backend=SimplexSolver.Backend.LIST),
+    "numpy": dict(backend=SimplexSolver.Backend.NUMPY),
+    "numpy, mmap": dict(backend=SimplexSolver.Backend.NUMPY, memory_map=tempfile.gettempdir()),
+}
+"""Arguments of the solver by name"""
+
+
+def measure(m: int, n: int, iterations: int, arguments: dict) -> tuple[int, int, float]:
+    """
+    Build the tableau of a random problem and pivot [iterations] times
+    :return: a tuple (memory held by the solver afterwards, peak memory, seconds) of the traced Python
+        and NumPy allocations. Pages of a memory-mapped file are not traced
+    """
+    rng = np.random.default_rng(0)
+    c, a, b = rng.uniform(1, 10, n), rng.uniform(1, 10, (m, n)), rng.uniform(10, 100, m)
+    if arguments["backend"] == SimplexSolver.Backend.LIST:
+        a = a.tolist()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    solver = SimplexSolver(SimplexSolver.Mode.MAXIMIZE, list(c), a, list(b), 9, **arguments)
+    solver._start_statistics()
+    solver._to_standard_form()
+    solver.pricing.reset(solver)
+    for _ in range(iterations):
+        if not solver._step():
+            break
+    elapsed = time.perf_counter() - start
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held - before, peak - before, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the memory of the SimplexSolver tableau")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--columns", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=5, help="pivots after building the tableau")
+    args = parser.parse_args()
+
+    cells = args.rows * (args.columns + args.rows)
+    print(f"Tableau of {args.rows} x {args.columns + args.rows} cells, {args.iterations} pivots")
+    print(f"{'backend':>12} {'held, MB':>9} {'peak, MB':>9} {'bytes/cell':>10} {'time, s':>8}")
+    for name, arguments in SETTINGS.items():
+        held, peak, elapsed = measure(args.rows, args.columns, args.iterations, arguments)
+        print(f"{name:>12} {held / 2 ** 20:>9.1f} {peak / 2 ** 20:>9.1f} {held / cells:>10.1f} {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
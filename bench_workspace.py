@@ -0,0 +1,97 @@
+# Measure time, allocations and peak memory per iteration of InteriorPointSolver with and without workspaces
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from interior_point_solver import InteriorPointSolver
+
+
+class TracedSolver(InteriorPointSolver):
+    """
+    [InteriorPointSolver] recording with tracemalloc how much memory every iteration allocates on top of
+    what it started with. Temporaries freed before the iteration ends still count, since they raise the peak
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self.peaks: list[int] = []
+        """Peak of the traced memory above its level at the start of every iteration"""
+
+    def _iterate(self, a, c, x, workspace):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        step = super()._iterate(a, c, x, workspace)
+        self.peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        return step
+
+
+def problem(m: int, n: int, seed: int):
+    """
+    :return: a tuple (c, a, b, start) of a random dense problem a * x = b with the interior point x = 1
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.uniform(1, 10, (m, n))
+    return rng.uniform(1, 10, n), a, a @ np.ones(n), np.ones(n)
+
+
+def measure(m: int, n: int, workspace: bool, seed: int) -> dict:
+    """
+    Solve one problem and measure it
+    :return: the measurements by name
+    """
+    c, a, b, start = problem(m, n, seed)
+    solver = InteriorPointSolver(InteriorPointSolver.Mode.MAXIMIZE, start, c, a, b, 0.5, 6, workspace=workspace)
+    begin = time.perf_counter()
+    solver.calculate()
+    elapsed = time.perf_counter() - begin
+
+    traced = TracedSolver(InteriorPointSolver.Mode.MAXIMIZE, start, c, a, b, 0.5, 6, workspace=workspace)
+    tracemalloc.start()
+    traced.calculate()
+    tracemalloc.stop()
+
+    return dict(
+        iterations=solver.iterations,
+        time=elapsed / solver.iterations,
+        peak=float(np.mean(traced.peaks[1:] or traced.peaks)),  # The first iteration warms the caches
+        rss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare InteriorPointSolver with and without workspaces")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--columns", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mode", choices=("allocating", "workspace"),
+                        help="measure only this mode in this process, used to separate the peak RSS of the modes")
+    args = parser.parse_args()
+
+    if args.mode:
+        result = measure(args.rows, args.columns, args.mode == "workspace", args.seed)
+        print(" ".join(f"{key}={value}" for key, value in result.items()))
+        return
+
+    print(f"{args.rows} x {args.columns}")
+    print(f"{'mode':>10} {'iterations':>10} {'ms/iteration':>12} {'traced peak/iteration, KiB':>26} "
+          f"{'peak RSS, MiB':>13}")
+    for mode in ("allocating", "workspace"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--rows", str(args.rows), "--columns", str(args.columns),
+             "--seed", str(args.seed), "--mode", mode],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = dict(item.split("=") for item in output.split())
+        print(f"{mode:>10} {int(result['iterations']):10d} {float(result['time']) * 1000:12.3f} "
+              f"{float(result['peak']) / 1024:26.1f} {float(result['rss']):13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,19 +31,17 @@ def main():
     for _ in range(num_constraints):
         b.append(float(input()))
 
-    x_size = int(input('Size of the vector x_0: '))
-    x_0 = []
-    print('Enter components of x_0: ')
+    x_size = int(input('Size of the vector x_0 (0 to find it automatically): '))
+    x_0 = [] if x_size else None
+    if x_size:
+        print('Enter components of x_0: ')
     for _ in range(x_size):
         x_0.append(float(input()))
 
     eps = int(input('Enter solution accuracy: '))
 
-    print('--> Solving with alpha = 0.5')
-    InteriorPointSolver(mode, x_0, c, a, b, 0.5, eps).solve()
-
-    print('--> Solving with alpha = 0.9')
-    InteriorPointSolver(mode, x_0, c, a, b, 0.9, eps).solve()
+    print('--> Solving with an adaptive alpha')
+    InteriorPointSolver(mode, x_0, c, a, b, None, eps).solve()
 
 
 if __name__ == '__main__':
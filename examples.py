@@ -1,5 +1,17 @@
+from math import inf, isclose
+from typing import Union
+
+import numpy as np
+from scipy import sparse
+
+from lp_model import Model
+from presolve import Presolver
+from primal_dual_solver import PrimalDualSolver
 from simplex_solver import SimplexSolver
 from interior_point_solver import InteriorPointSolver
+from revised_simplex_solver import RevisedSimplexSolver
+from pricing import RULES
+from solver_result import SolverResult
 
 
 def main() -> None:
@@ -44,6 +56,20 @@ def main() -> None:
         b=[360, 192, 180],
         eps=5
     ).solve()
+    print("Interior point alpha = 0.5, automatic initial point: ")
+    InteriorPointSolver(
+        mode=InteriorPointSolver.Mode.MAXIMIZE,
+        c=[9, 10, 16, 0, 0, 0],
+        a=[
+            [18, 15, 12, 1, 0, 0],
+            [6, 4, 8, 0, 1, 0],
+            [5, 3, 3, 0, 0, 1]
+        ],
+        b=[360, 192, 180],
+        start=None,
+        alpha=0.5,
+        eps=5
+    ).solve()
 
     print("--> Example 2. An unbounded objective function")
     print("Interior point alpha = 0.5: ")
@@ -172,6 +198,177 @@ def main() -> None:
         eps=5
     ).solve()
 
+    print("--> Example 5 - Constraints >= and =, bounded and free variables")
+    print("Simplex: ")
+    SimplexSolver(
+        mode=SimplexSolver.Mode.MINIMIZE,
+        c=[2, 3, 1],
+        a=[
+            [1, 1, 1],
+            [1, -1, 0],
+            [-1, 0, -2]
+        ],
+        b=[4, 1, -8],
+        constraints=[
+            SimplexSolver.Constraint.GREATER_EQUAL,
+            SimplexSolver.Constraint.EQUAL,
+            SimplexSolver.Constraint.GREATER_EQUAL
+        ],
+        lower=[0, 0, -inf],
+        upper=[inf, 2, inf],
+        eps=5
+    ).solve()
+
+    regressions()
+
+
+def check(name: str, result: SolverResult, status: SolverResult.Status, objective: Union[float, None] = None) -> None:
+    """
+    Print the outcome of a regression case and raise [ArithmeticError] if it is not the expected one
+    :param objective: the expected optimal value, compared with a relative tolerance of 10^-5
+    """
+    print(f"{name}: {result.status.value}" + (f" {result.objective}" if result.objective is not None else ""))
+    if result.status != status:
+        raise ArithmeticError(f"{name}: expected {status.value}, got {result.status.value}")
+    if objective is not None and not isclose(result.objective, objective, rel_tol=1e-5):
+        raise ArithmeticError(f"{name}: expected the solution {objective}, got {result.objective}")
+
+
+def regressions() -> None:
+    """
+    Solve problems that earlier versions of the solvers got wrong and check the outcome
+    """
+    print("--> Regressions")
+    for name, rule in RULES.items():
+        # Round-off z-row values like -1e-9 are not improving columns: entering one finds no pivot row
+        for backend in SimplexSolver.Backend:
+            check(f"{name} pricing, {backend.value}, unbounded", SimplexSolver(
+                SimplexSolver.Mode.MINIMIZE, [-1, -5, -3, -1, 0], [[-3, 5, 0, 0, 0], [0, 0, 0, -1, 2]], [-4, -1], 9,
+                backend=backend, pricing=rule(),
+                constraints=[SimplexSolver.Constraint.EQUAL, SimplexSolver.Constraint.LESS_EQUAL]
+            ).run(), SolverResult.Status.UNBOUNDED)
+            check(f"{name} pricing, {backend.value}, bounded", SimplexSolver(
+                SimplexSolver.Mode.MINIMIZE, [1, -3, -5], [[-3, 0, 0], [-5, 2, -2], [0, 0, 2], [0, 0, 5], [3, 0, 1]],
+                [-8, -7, 3, -8, -7], 6, backend=backend, pricing=rule(), lower=[0, -inf, -inf], upper=[inf, 5, inf]
+            ).run(), SolverResult.Status.OPTIMAL, 113.1667)
+
+    # Phase I read the sum of the artificial variables from the value the pivots updated, which rounding every cell
+    # to eps moved to -1.6e-4 while the basis had none of them left
+    for backend in SimplexSolver.Backend:
+        check(f"phase one, {backend.value}, drifting objective", SimplexSolver(
+            SimplexSolver.Mode.MAXIMIZE, [1, 0, 1, -3],
+            [[-3, 5, -4, -2], [3, -3, 4, -3], [-5, -5, 1, 3], [4, 2, 2, 0], [-4, 5, -4, 4]], [-1, -1, -3, 8, -7], 6,
+            backend=backend, lower=[0, 0, -inf, -inf], upper=[inf, 5, 3, inf],
+            constraints=[SimplexSolver.Constraint.LESS_EQUAL, SimplexSolver.Constraint.EQUAL,
+                         SimplexSolver.Constraint.LESS_EQUAL, SimplexSolver.Constraint.GREATER_EQUAL,
+                         SimplexSolver.Constraint.LESS_EQUAL]
+        ).run(), SolverResult.Status.UNBOUNDED)
+
+    # The ratio test pivoted on a round-off cell of 1.7e-5 in the column of a free variable, which reported
+    # an unbounded objective function as an optimum near 3 * 10^eps
+    for backend in SimplexSolver.Backend:
+        for eps in (5, 6, 8):
+            check(f"round-off pivot, {backend.value}, eps {eps}", SimplexSolver(
+                SimplexSolver.Mode.MAXIMIZE, [-1, 2, -3, -5, 1],
+                [[-3, -4, 5, -3, -2], [-4, 2, -2, -3, 3], [3, -2, -3, 5, -3], [4, 5, -2, 4, 4], [2, 0, -2, 0, -2]],
+                [10, -5, 2, -2, 3], eps, backend=backend, lower=[-inf, 1, -inf, 0, -2], upper=[inf, 3, inf, 5, inf],
+                constraints=[SimplexSolver.Constraint.LESS_EQUAL, SimplexSolver.Constraint.GREATER_EQUAL,
+                             SimplexSolver.Constraint.EQUAL, SimplexSolver.Constraint.LESS_EQUAL,
+                             SimplexSolver.Constraint.LESS_EQUAL]
+            ).run(), SolverResult.Status.UNBOUNDED)
+
+    # Without constraints the pivot tolerance and the ratio test reduced an empty column of the tableau
+    for backend in SimplexSolver.Backend:
+        check(f"no constraints, {backend.value}", SimplexSolver(
+            SimplexSolver.Mode.MAXIMIZE, [1, -1], np.zeros((0, 2)) if backend == SimplexSolver.Backend.NUMPY else [],
+            [], 6, backend=backend, upper=[2, inf]
+        ).run(), SolverResult.Status.OPTIMAL, 2)
+
+    # The dual Simplex method left -2e-8 in a row that no column can pivot on, which is round-off of the new rhs
+    for backend in SimplexSolver.Backend:
+        solver = SimplexSolver(
+            SimplexSolver.Mode.MAXIMIZE, [-1, 2, 0, 1], [[0, 5, 0, 2], [0, 1, 5, -2], [2, 0, 3, 3]], [3, 9, 9], 9,
+            backend=backend,
+            constraints=[SimplexSolver.Constraint.LESS_EQUAL, SimplexSolver.Constraint.GREATER_EQUAL,
+                         SimplexSolver.Constraint.EQUAL]
+        )
+        solver.run()
+        solver.update_objective([1, -2, -2, -1])
+        solver.update_rhs([5, 9, 5])
+        solver.rerun()
+        solver.update_rhs([0, 10, 9])
+        check(f"dual simplex, {backend.value}, round-off rhs", solver.rerun(), SolverResult.Status.OPTIMAL, -2.5)
+
+    # The revised Simplex method starts from the slack basis, which is infeasible for a negative right hand side
+    try:
+        RevisedSimplexSolver(SimplexSolver.Mode.MINIMIZE, [1, 1], [[-1, 0], [0, -1]], [-2, -3], 6)
+    except ValueError as error:
+        print(f"revised simplex, negative rhs: {error}")
+    else:
+        raise ArithmeticError("revised simplex, negative rhs: expected ValueError")
+
+    # max -2x subject to 0 * x = -2, x <= 2: the empty column is unbounded, but the empty row is infeasible first
+    presolver = Presolver(Model(
+        "", Model.Mode.MAXIMIZE, np.array([-2.0]), sparse.csr_matrix([[0.0]]), np.array([-2.0]), np.array([-2.0]),
+        np.array([-inf]), np.array([2.0])
+    ))
+    presolver.presolve()
+    print(f"presolve, infeasible empty row: infeasible {presolver.is_infeasible}, unbounded {presolver.is_unbounded}")
+    if not presolver.is_infeasible or presolver.is_unbounded:
+        raise ArithmeticError("presolve, infeasible empty row: expected infeasible")
+
+    # The empty free column is unbounded, but the duplicate row 2 * r conflicts with r once they are merged
+    presolver = Presolver(Model(
+        "", Model.Mode.MAXIMIZE, np.array([1.0, 0, 0, 0]),
+        sparse.csr_matrix([[0.0, -3, -1, 1], [0.0, -6, -2, 2]]), np.array([2.0, -3]), np.array([7.0, 0]),
+        np.full(4, -inf), np.full(4, inf)
+    ))
+    presolver.presolve()
+    print(f"presolve, conflicting duplicate rows: infeasible {presolver.is_infeasible}, "
+          f"unbounded {presolver.is_unbounded}")
+    if not presolver.is_infeasible or presolver.is_unbounded:
+        raise ArithmeticError("presolve, conflicting duplicate rows: expected infeasible")
+
+    # The dual iterates diverge on infeasible constraints, which made the normal equations singular
+    for mode in PrimalDualSolver.Mode:
+        check(f"primal-dual, {mode.value}, infeasible", PrimalDualSolver(
+            mode, [-1, 2, 3], [[-5, 8, -2], [3, -3, 2]], [-26, 11], 5
+        ).run(), SolverResult.Status.INFEASIBLE)
+    check("primal-dual, unbounded", PrimalDualSolver(
+        PrimalDualSolver.Mode.MAXIMIZE, [1, 0], [[1, -1]], [1], 5
+    ).run(), SolverResult.Status.UNBOUNDED)
+
+    # A failed solve left is_not_applicable set, so the next solve of the same solver failed too
+    solver = InteriorPointSolver(InteriorPointSolver.Mode.MAXIMIZE, None, [-1, -1, 0], [[1, 1, 1], [1, 1, 1]], [1, 1],
+                                 None, 6)
+    check("interior point, dependent rows", solver.run(), SolverResult.Status.NOT_APPLICABLE)
+    solver.a, solver.b = [[1, 1, 1]], [1]
+    check("interior point, rerun", solver.run(), SolverResult.Status.OPTIMAL, 0)
+
+    # Every rerun from a restored snapshot gives the result of a solve from scratch
+    for backend in SimplexSolver.Backend:
+        solver = SimplexSolver(SimplexSolver.Mode.MAXIMIZE, [3, 2, 4], [[1, 1, 2], [2, 0, 3], [2, 1, 3]], [4, 5, 7], 6,
+                               backend=backend)
+        solver.run()
+        optimal = solver.snapshot()
+        for b in ([4, 5, 7], [2, 6, 5], [8, 1, 3], [4, 5, 7]):
+            solver.restore(optimal)
+            solver.update_rhs(b)
+            check(f"snapshot, {backend.value}, b = {b}", solver.rerun(), SolverResult.Status.OPTIMAL, SimplexSolver(
+                SimplexSolver.Mode.MAXIMIZE, [3, 2, 4], [[1, 1, 2], [2, 0, 3], [2, 1, 3]], b, 6, backend=backend
+            ).run().objective)
+
+    # Tighter, looser and moved bounds warm-start from the basis, a free variable that gains a bound solves again
+    for backend in SimplexSolver.Backend:
+        solver = SimplexSolver(SimplexSolver.Mode.MAXIMIZE, [3, 2, 4], [[1, 1, 2], [2, 0, 3], [2, 1, 3]], [4, 5, 7], 6,
+                               backend=backend, lower=[0, -inf, 0], upper=[inf, inf, 1])
+        solver.run()
+        for lower, upper in (([0, -inf, 0], [1, inf, 1]), ([1, -inf, -1], [2, inf, 3]), ([0, -2, 0], [inf, 2, 1])):
+            solver.update_bounds(lower, upper)
+            check(f"bounds, {backend.value}, {lower} <= x <= {upper}", solver.rerun(), SolverResult.Status.OPTIMAL,
+                  SimplexSolver(SimplexSolver.Mode.MAXIMIZE, [3, 2, 4], [[1, 1, 2], [2, 0, 3], [2, 1, 3]], [4, 5, 7], 6,
+                                backend=backend, lower=lower, upper=upper).run().objective)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,175 @@
+# Instrumentation of the solvers: per-iteration callbacks, time of the phases and metrics export
+
+import json
+import threading
+from dataclasses import dataclass
+from typing import Callable, Iterable, Union
+
+
+@dataclass
+class Iteration:
+    """
+    One iteration of a solver, passed to the callbacks of [Instrumentation]
+    """
+
+    solver: str
+    """Name of the solver, e.g. "simplex" or "interior-point" """
+
+    phase: str
+    """Phase of the solve the iteration belongs to, e.g. "phase-one", "primal", "dual" or "initialization" """
+
+    number: int
+    """Number of the iteration in its phase, from 1"""
+
+    objective: float
+    """Value of the objective function the phase optimizes. Phase I of the Simplex method minimizes
+    the sum of the artificial variables, Phase I of the Interior-Point method maximizes minus it"""
+
+    primal_infeasibility: float
+    """Largest violation of the constraints or bounds by the current point, 0 if it is feasible"""
+
+    dual_infeasibility: float
+    """Largest violation of the optimality conditions (the most attractive reduced cost), 0 at the optimum"""
+
+    step: float
+    """How far the iteration moved: the new value of the entering variable for the Simplex method,
+    the length of the step for the Interior-Point method"""
+
+    pivot: Union[tuple[Union[int, None], int], None]
+    """Cell (row, column) of the Simplex pivot, row [None] for a bound flip without a pivot.
+    [None] for the Interior-Point method"""
+
+    time: float
+    """Wall time of the iteration in seconds"""
+
+
+class Instrumentation:
+    BUCKETS = (0.001, 0.01, 0.1, 1.0, 10.0, 100.0)
+    """Upper bounds in seconds of the buckets of the histogram of solve times"""
+
+    def __init__(self, callbacks: Iterable[Callable[[Iteration], None]] = ()) -> None:
+        """
+        Collect what solvers do. Pass the same object to the [instrumentation] argument of any number of solvers,
+        also from several threads. Solvers add their counters and the time of their phases to it after every solve,
+        which costs nothing per iteration. Only with callbacks they also describe every iteration with [Iteration],
+        which costs computing the objective function and the infeasibilities
+
+        :param callbacks: functions called with the [Iteration] after every iteration
+        """
+
+        self.callbacks: list[Callable[[Iteration], None]] = list(callbacks)
+        """Functions called with the [Iteration] after every iteration"""
+
+        self.solves: dict[tuple[str, str], int] = {}
+        """Number of finished solves by (solver, status)"""
+
+        self.counters: dict[tuple[str, str], int] = {}
+        """Counters added by solves, e.g. iterations, by (solver, counter)"""
+
+        self.phase_time: dict[tuple[str, str], float] = {}
+        """Total seconds spent in every phase, e.g. factorization, pricing, ratio test, update, by (solver, phase)"""
+
+        self.solve_time: dict[str, list[float]] = {}
+        """For every solver: counts of solves per bucket of [BUCKETS] (the last one unbounded) and the total seconds"""
+
+        self._lock = threading.Lock()
+        """Guards the aggregates against solvers running in other threads"""
+
+    def iteration(self, event: Iteration) -> None:
+        """
+        Pass [event] to every callback
+        """
+        for callback in self.callbacks:
+            callback(event)
+
+    def record(self, solver: str, status: str, time: float, counters: dict[str, int],
+               phase_time: dict[str, float]) -> None:
+        """
+        Add a finished solve to the aggregates
+        :param solver: name of the solver
+        :param status: how the solve ended, e.g. "optimal", "unbounded" or "infeasible"
+        :param time: wall time of the solve in seconds
+        :param counters: counters of the solve, e.g. iterations
+        :param phase_time: seconds spent in every phase of the solve
+        """
+        with self._lock:
+            self.solves[solver, status] = self.solves.get((solver, status), 0) + 1
+            for name, value in counters.items():
+                self.counters[solver, name] = self.counters.get((solver, name), 0) + value
+            for name, value in phase_time.items():
+                self.phase_time[solver, name] = self.phase_time.get((solver, name), 0.0) + value
+
+            histogram = self.solve_time.setdefault(solver, [0] * (len(Instrumentation.BUCKETS) + 1) + [0.0])
+            bucket = next((i for i, bound in enumerate(Instrumentation.BUCKETS) if time <= bound),
+                          len(Instrumentation.BUCKETS))
+            histogram[bucket] += 1
+            histogram[-1] += time
+
+    def reset(self) -> None:
+        """
+        Forget every recorded solve, keep the callbacks
+        """
+        with self._lock:
+            self.solves.clear()
+            self.counters.clear()
+            self.phase_time.clear()
+            self.solve_time.clear()
+
+    def to_dict(self) -> dict:
+        """
+        :return: the aggregates as nested dictionaries by solver
+        """
+        with self._lock:
+            result = {}
+            for (solver, status), count in self.solves.items():
+                result.setdefault(solver, {}).setdefault("solves", {})[status] = count
+            for (solver, name), value in self.counters.items():
+                result.setdefault(solver, {}).setdefault("counters", {})[name] = value
+            for (solver, name), value in self.phase_time.items():
+                result.setdefault(solver, {}).setdefault("phase_seconds", {})[name] = value
+            for solver, histogram in self.solve_time.items():
+                result.setdefault(solver, {})["solve_seconds"] = {
+                    "buckets": dict(zip([str(bound) for bound in Instrumentation.BUCKETS] + ["+Inf"], histogram[:-1])),
+                    "count": sum(histogram[:-1]),
+                    "sum": histogram[-1],
+                }
+            return result
+
+    def to_json(self, indent: Union[int, None] = None) -> str:
+        """
+        :return: [to_dict] as a JSON document
+        """
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "solver") -> str:
+        """
+        :param prefix: prefix of the metric names
+        :return: the aggregates in the Prometheus text exposition format
+        """
+        with self._lock:
+            lines = [f"# HELP {prefix}_solves_total Finished solves by status",
+                     f"# TYPE {prefix}_solves_total counter"]
+            lines += [f'{prefix}_solves_total{{solver="{solver}",status="{status}"}} {count}'
+                      for (solver, status), count in sorted(self.solves.items())]
+
+            for name in sorted({name for _, name in self.counters}):
+                lines += [f"# HELP {prefix}_{name}_total Sum of {name.replace('_', ' ')} over the solves",
+                          f"# TYPE {prefix}_{name}_total counter"]
+                lines += [f'{prefix}_{name}_total{{solver="{solver}"}} {value}'
+                          for (solver, counter), value in sorted(self.counters.items()) if counter == name]
+
+            lines += [f"# HELP {prefix}_phase_seconds_total Time spent in every phase of the solves",
+                      f"# TYPE {prefix}_phase_seconds_total counter"]
+            lines += [f'{prefix}_phase_seconds_total{{solver="{solver}",phase="{phase}"}} {value:.9f}'
+                      for (solver, phase), value in sorted(self.phase_time.items())]
+
+            lines += [f"# HELP {prefix}_solve_seconds Wall time of the solves",
+                      f"# TYPE {prefix}_solve_seconds histogram"]
+            for solver, histogram in sorted(self.solve_time.items()):
+                cumulative = 0
+                for bound, count in zip([str(bound) for bound in Instrumentation.BUCKETS] + ["+Inf"], histogram[:-1]):
+                    cumulative += count
+                    lines.append(f'{prefix}_solve_seconds_bucket{{solver="{solver}",le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_solve_seconds_sum{{solver="{solver}"}} {histogram[-1]:.9f}')
+                lines.append(f'{prefix}_solve_seconds_count{{solver="{solver}"}} {cumulative}')
+            return "\n".join(lines) + "\n"
@@ -1,11 +1,15 @@
+import time
 from enum import Enum
-from sys import stdin
 from typing import Union
-from math import isclose
-from simplex_solver import SimplexSolver
+from math import inf, isclose, isfinite
+from instrumentation import Instrumentation, Iteration
+from solver_result import SolverResult, Verbosity
 
-import numpy as np
-from numpy.linalg import norm
+
+ADAPTIVE_ALPHA: tuple[float, float] = (2 / 3, 0.99)
+"""Smallest and largest alpha of [InteriorPointSolver] without a fixed alpha. Affine scaling converges
+with alpha up to 2/3 on any problem, longer steps are safe once the dual estimate is accurate. Between them,
+alpha is 1 minus a tenth of the relative duality gap or dual infeasibility of the iteration, whichever is larger"""
 
 
 class InteriorPointSolver:
@@ -16,21 +20,32 @@ class InteriorPointSolver:
     def __init__(
             self,
             mode: Mode,
-            start: list[float],
+            start: Union[list[float], None],
             c: list[float],
             a: list[list[float]],
             b: list[float],
-            alpha: float,
-            eps: int
+            alpha: Union[float, None],
+            eps: int,
+            workspace: bool = False,
+            instrumentation: Union[Instrumentation, None] = None,
+            verbosity: Verbosity = Verbosity.RESULT
     ) -> None:
         """
         Construct Interior-Point Algorithm problem solver
 
         :param mode: one of [Mode.MAXIMIZE] or [Mode.MINIMIZE]
+        :param start: strictly positive point satisfying the constraints, or [None] to find one automatically
         :param c: coefficients of the objective function
-        :param a: matrix of the coefficients of the constraints
+        :param a: matrix of the coefficients of the constraints. Nested lists, a NumPy array or a scipy sparse matrix
         :param b: right hand side of the constraints equations
-        :param eps: solution accuracy. How many digits after the floating point to consider
+        :param alpha: alpha in Interior-Point Algorithm: every step goes this fraction of the way to the boundary
+            of the positive orthant. [None] to adapt it, see [ADAPTIVE_ALPHA]
+        :param eps: solution accuracy. How many digits after the floating point to consider.
+            The iterations stop when the relative duality gap of the dual estimate is below 10^-(eps + 3)
+        :param workspace: whether to allocate the buffers of the iterations once per solve and update them in place.
+            Only dense matrices, sparse products allocate their results anyway
+        :param instrumentation: collects the statistics of every solve and passes every iteration to its callbacks
+        :param verbosity: what [solve] prints. [run] never prints
         """
 
         self.mode: InteriorPointSolver.Mode = mode
@@ -48,100 +63,461 @@ class InteriorPointSolver:
         self.b: list[float] = b
         """Right hand side of the constraints equations"""
 
-        self.start: list[float] = start
-        """Initial point"""
+        self.start: Union[list[float], None] = start
+        """Initial point, [None] if it is found automatically"""
 
-        self.alpha: float = alpha
-        """alpha in Interior-Point Algorithm"""
+        self.alpha: Union[float, None] = alpha
+        """alpha in Interior-Point Algorithm, [None] if it adapts to the duality gap"""
 
         self.eps: int = eps
         """Solution accuracy"""
 
+        self.tolerance: float = 10 ** -(eps + 3)
+        """Relative duality gap at which the iterations stop. Rounding x to eps digits needs a gap far below 10^-eps"""
+
         self.solution = 0
         """Optimal solution for this problem"""
 
         self.is_not_applicable = False
-        """Whether the objective function is unbounded"""
+        """Whether the method is not applicable to the last problem, e.g. its constraints are linearly dependent"""
+
+        self.workspace: bool = workspace
+        """Whether the iterations update preallocated buffers in place"""
+
+        self.iterations = 0
+        """How many iterations the last solve took, not counting the initialization"""
+
+        self.initialization_iterations = 0
+        """How many Phase I iterations finding the initial point took"""
+
+        self.initialization_time = 0.0
+        """Seconds spent finding the initial point"""
+
+        self.factorization_time = 0.0
+        """Seconds spent building and factorizing the normal equations in the last solve, initialization included"""
+
+        self.update_time = 0.0
+        """Seconds spent projecting the gradient and moving the point in the last solve, initialization included"""
+
+        self.time = 0.0
+        """Wall time of the last solve, in seconds"""
+
+        self.instrumentation: Union[Instrumentation, None] = instrumentation
+        """Collects the statistics of every solve and passes every iteration to its callbacks"""
+
+        self.verbosity: Verbosity = verbosity
+        """What [solve] prints"""
+
+        self.initial_point: Union["np.ndarray", None] = None
+        """Point the last solve started from, [None] if none was found. Strictly positive and away from the bounds,
+        so it can start a solve of the same constraints with another objective function without Phase I"""
+
+        self._dual_infeasibility = 0.0
+        """Largest reduced cost of the dual estimate of the last iteration"""
+
+        self._gap = inf
+        """Relative duality gap of the dual estimate of the last iteration"""
+
+    def print_problem(self) -> None:
+        """
+        Print the problem of this solver
+        """
+        from simplex_solver import function_from_coefficients
+
+        print(f"{self.mode} z = {function_from_coefficients(list(self.actual_coefficients))}")
+        print("subject to the constraints:")
+        rows = self.a.toarray() if hasattr(self.a, "toarray") else self.a  # A scipy sparse matrix
+        print("\n".join(f"{function_from_coefficients(list(cs))} = {rhs}" for cs, rhs in zip(rows, self.b)))
 
     def calculate(self):
         """
-        Perform one iteration of the Interior point method
-        :return: whether to continue iterating. [False] if this was the last step
+        Run the Interior point method
+        :return: the final point or [None] if the method failed
         """
+        import numpy as np
+        import normal_equations
+
+        a = normal_equations.as_matrix(self.a)
+        self.c = np.asarray(self.c, dtype=float)
+
+        self.is_not_applicable = False
+        self.initialization_iterations = 0
+        self.factorization_time = self.update_time = 0.0
+        begin = time.perf_counter()
+        x = np.array(self.start, dtype=float) if self.start is not None else self._starting_point(a)
+        self.initialization_time = time.perf_counter() - begin
+        self.initial_point = None if x is None else x.copy()
+        if x is None:
+            return None
 
-        # Get the index of the pivot column
-        x = self.start
-        self.c = np.transpose(self.c)
-        i = 1
+        self.iterations = 0
+        return self._iterations(a, self.c, x)
 
+    def _iterations(self, a, c: "np.ndarray", x: "np.ndarray") -> Union["np.ndarray", None]:
+        """
+        Iterate from [x] until the duality gap closes or the steps become negligible
+        :return: the final point or [None] if the method failed
+        """
+        import numpy as np
+        import normal_equations
+
+        workspace = _Workspace(*a.shape) if self.workspace and not normal_equations.is_sparse(a) else None
+        b = np.asarray(self.b, dtype=float)
+        self._gap = inf  # Phase I measured another objective function
         while True:
-            v = x
-            d = np.diag(x)
-            aa = np.dot(self.a, d)
-            cc = np.dot(d, self.c)
-            I = np.eye(len(self.c))
-            f = np.dot(aa, np.transpose(aa))
-
-            if np.any(np.isnan(f)) or np.any(np.isinf(f)):
-                x = None
-                break
-
-            if np.linalg.det(f) == 0:
-                x = None
-                self.is_not_applicable = True
-                break
-
-            f_inverse = np.linalg.inv(f)
-            H = np.dot(np.transpose(aa), f_inverse)
-            P = np.subtract(I, np.dot(H, aa))
-            cp = np.dot(P, cc)
-
-            if np.any(np.isnan(cp)) or np.any(np.isinf(cp)):
-                x = None
-                break
-
-            if np.all(cp >= 0):
-                x = None
-                break  # Function is unbounded, leave method flow
-
-            nu = np.absolute(np.min(cp))
-            if nu < 1e-10:
-                self.is_not_applicable = True
-                x = None
-                break
-
-            y = np.add(np.ones(len(self.c), float), (self.alpha / nu) * cp)
-            yy = np.dot(d, y)
-            x = yy
-
-            if norm(np.subtract(yy, v), ord=2) < 0.00001:
-                break
-
-            i += 1
-        return x
+            self.iterations += 1
+            start = time.perf_counter()
+            step = self._iterate(a, c, x, workspace)
+            if step is None:
+                # Close to a degenerate optimum, the normal equations become singular or the projected gradient
+                # vanishes, often before double precision lets the gap reach 10^-10. Such a point is the answer
+                if self._gap < max(100 * self.tolerance, 1e-8):
+                    self.is_not_applicable = False
+                    return x
+                return None
+            if self._is_reporting():
+                objective = float(c @ x)
+                self._report("main", self.iterations, objective if self.mode == InteriorPointSolver.Mode.MAXIMIZE
+                             else -objective, float(np.max(np.abs(a @ x - b))), step, start)
+            # The step test also stops iterations that stall before the gap closes
+            if self._gap < self.tolerance or step < min(0.00001, 10 ** (1 - self.eps)):
+                return x
 
-    def solve(self) -> Union[tuple[float, list[float]], None]:
+    def _starting_point(self, a) -> Union["np.ndarray", None]:
         """
-        Solve the problem in this solver and print the solution and X*,
-        or print "The method is not applicable!" or "The problem has no solution!" in those special cases.
+        Find a strictly positive point satisfying the constraints.
+        Start from the least squares solution of a * x = b shifted into the positive orthant as in Mehrotra's heuristic,
+        then remove the residual r = b - a * x0 it leaves with Phase I: maximize -sum(t) subject to
+        a * x + diag(r) * t = b from (x0, 1) with the same iterations, until the correction of x that drops t
+        keeps x positive. One artificial variable per row keeps the normal equations as sparse as [a] is
+        :param a: matrix of the coefficients of the constraints
+        :return: the point or [None] if the constraints have no positive solution or the method is not applicable
+        """
+        import numpy as np
+        import normal_equations
+
+        b = np.asarray(self.b, dtype=float)
+        try:
+            factorization = normal_equations.Factorization(normal_equations.assemble(a, np.ones(a.shape[1])))
+        except np.linalg.LinAlgError:  # Linearly dependent constraints
+            self.is_not_applicable = True
+            return None
+
+        x = a.T @ factorization.solve(b)
+        x += max(-1.5 * float(np.min(x)), 0.0) + max(float(np.mean(np.abs(x))), 1.0)
+        residual = b - a @ x
+
+        m, n = a.shape
+        if normal_equations.is_sparse(a):
+            from scipy import sparse
+
+            auxiliary = sparse.hstack((a, sparse.diags(residual)), format="csr")
+        else:
+            auxiliary = np.hstack((a, np.diag(residual)))
+        cost = np.concatenate((np.zeros(n), -np.ones(m)))
+        point = np.concatenate((x, np.ones(m)))
+        workspace = _Workspace(*auxiliary.shape) if self.workspace and not normal_equations.is_sparse(a) else None
+
+        while True:
+            # a * x = b - r * t, so x + a^T * (a * a^T)^-1 * r * t satisfies the constraints
+            x = point[:n] + a.T @ factorization.solve(residual * point[n:])
+            if np.min(x) > 0:
+                return x
+
+            self.initialization_iterations += 1
+            start = time.perf_counter()
+            step = self._iterate(auxiliary, cost, point, workspace)
+            if step is not None and self._is_reporting():
+                self._report("initialization", self.initialization_iterations, float(cost @ point),
+                             float(np.max(np.abs(residual) * point[n:])), step, start)
+            if step is None or step < 0.00001:
+                # t started at 1. If it still went to zero, the constraints have solutions, but not positive ones,
+                # otherwise they have none
+                self.is_not_applicable = np.max(np.abs(residual) * point[n:]) < 1e-4 * np.max(np.abs(residual))
+                return None
+
+    def _iterate(self, a, c: "np.ndarray", x: "np.ndarray", workspace: Union["_Workspace", None]) -> Union[float, None]:
+        """
+        Perform one iteration of the Interior point method, moving [x] in place
+        :param a: matrix of the coefficients of the constraints
+        :param c: coefficients of the maximized objective function
+        :param x: current point
+        :param workspace: preallocated buffers, or [None] to allocate them on every iteration
+        :return: length of the step or [None] if the method failed
+        """
+        if workspace is not None:
+            return self._iterate_in_place(a, c, x, workspace)
+
+        import numpy as np
+        from numpy.linalg import norm
+        import normal_equations
+
+        clock = time.perf_counter()
+        aa = normal_equations.scale_columns(a, x)  # A * D without building D = diag(x)
+        cc = x * c
+        f = normal_equations.assemble(a, x * x)
+
+        if not normal_equations.is_finite(f):
+            return None
+
+        try:
+            factorization = normal_equations.Factorization(f)
+        except np.linalg.LinAlgError:  # A * D^2 * A^T is singular
+            self.is_not_applicable = True
+            return None
+        now = time.perf_counter()
+        self.factorization_time += now - clock
+        clock = now
+
+        # Project cc onto the null space of aa: cp = (I - aa^T * f^-1 * aa) * cc.
+        # The second projection with the same factorization removes the round-off left by the first one,
+        # which otherwise dominates cp close to the optimum
+        cp = cc - aa.T @ factorization.solve(aa @ cc)
+        cp -= aa.T @ factorization.solve(aa @ cp)
+
+        if np.any(np.isnan(cp)) or np.any(np.isinf(cp)):
+            return None
+
+        if np.all(cp >= 0):
+            return None  # Function is unbounded, leave method flow
+
+        nu = np.absolute(np.min(cp))
+        if nu < 1e-10:
+            self.is_not_applicable = True
+            return None
+
+        # cp = D * (c - a^T * y) for the dual estimate y of this iteration
+        alpha = self._step_fraction(float(np.sum(np.abs(cp))), float(np.max(cp / x)), float(c @ x), c)
+        step = x * ((alpha / nu) * cp)  # x * y - x with y = 1 + alpha / nu * cp
+        x += step
+        self.update_time += time.perf_counter() - clock
+        return float(norm(step, ord=2))
+
+    def _iterate_in_place(self, a: "np.ndarray", c: "np.ndarray", x: "np.ndarray",
+                          workspace: "_Workspace") -> Union[float, None]:
+        """
+        [_iterate] writing every intermediate result into the buffers of [workspace]
+        """
+        import numpy as np
+        from numpy.linalg import norm
+        from scipy.linalg import cho_factor, cho_solve
+
+        w = workspace
+        clock = time.perf_counter()
+        np.multiply(a, x, out=w.aa)
+        np.multiply(x, c, out=w.cc)
+        np.matmul(w.aa, w.aa.T, out=w.f)
+
+        if not isfinite(np.sum(w.f)):  # Summing allocates nothing, unlike np.isfinite(f)
+            return None
+
+        try:
+            # f is symmetric, so its transpose is the Fortran-ordered matrix LAPACK factorizes in place
+            factor = cho_factor(w.f.T, overwrite_a=True, check_finite=False)
+        except np.linalg.LinAlgError:  # A * D^2 * A^T is singular
+            self.is_not_applicable = True
+            return None
+        now = time.perf_counter()
+        self.factorization_time += now - clock
+        clock = now
+
+        # The same projection twice as in [_iterate]
+        np.matmul(w.aa, w.cc, out=w.rhs)
+        np.matmul(w.aa.T, cho_solve(factor, w.rhs, overwrite_b=True, check_finite=False), out=w.cp)
+        np.subtract(w.cc, w.cp, out=w.cp)
+        np.matmul(w.aa, w.cp, out=w.rhs)
+        np.matmul(w.aa.T, cho_solve(factor, w.rhs, overwrite_b=True, check_finite=False), out=w.step)
+        w.cp -= w.step
+
+        minimum = float(np.min(w.cp))
+        if not isfinite(float(np.sum(w.cp))):
+            return None
+
+        if minimum >= 0:
+            return None  # Function is unbounded, leave method flow
+
+        nu = abs(minimum)
+        if nu < 1e-10:
+            self.is_not_applicable = True
+            return None
+
+        np.divide(w.cp, x, out=w.step)  # As in [_iterate]
+        reduced_cost = float(np.max(w.step))
+        np.absolute(w.cp, out=w.step)
+        alpha = self._step_fraction(float(np.sum(w.step)), reduced_cost, float(c @ x), c)
+        np.multiply(w.cp, alpha / nu, out=w.step)
+        w.step *= x
+        x += w.step
+        self.update_time += time.perf_counter() - clock
+        return float(norm(w.step, ord=2))
+
+    def _step_fraction(self, complementarity: float, reduced_cost: float, objective: float, c: "np.ndarray") -> float:
+        """
+        Measure how far the iteration is from the optimum and choose alpha.
+        The projected gradient is cp = D * s with the reduced costs s = c - a^T * y of the dual estimate y,
+        so the sum of |cp| bounds the duality gap b * y - c * x = -x * s, and s <= 0 if y is dual feasible.
+        A small gap with s > 0 is a point close to a vertex that is not optimal, and long steps would stall there
+        :param complementarity: sum of |cp|
+        :param reduced_cost: largest s
+        :param objective: c * x
+        :param c: coefficients of the maximized objective function
+        :return: the fraction of the way to the boundary that the step goes
+        """
+        self._gap = complementarity / (1 + abs(objective))
+        self._dual_infeasibility = max(0.0, reduced_cost)
+        if self.alpha is not None:
+            return self.alpha
+
+        import numpy as np
+
+        # s of tiny x carries their round-off, so s only slows the steps down and never stops the iterations
+        distance = max(self._gap, self._dual_infeasibility / (1 + float(np.max(np.abs(c)))))
+        low, high = ADAPTIVE_ALPHA
+        return min(high, max(low, 1 - distance / 10))
+
+    def _is_reporting(self) -> bool:
+        """
+        :return: whether the iterations are passed to callbacks of [instrumentation]
+        """
+        return self.instrumentation is not None and bool(self.instrumentation.callbacks)
+
+    def _report(self, phase: str, number: int, objective: float, primal_infeasibility: float,
+                step: float, start: float) -> None:
+        """
+        Describe the iteration that started at [start] to the callbacks of [instrumentation]
+        """
+        self.instrumentation.iteration(Iteration(
+            solver="interior-point",
+            phase=phase,
+            number=number,
+            objective=objective,
+            primal_infeasibility=primal_infeasibility,
+            dual_infeasibility=self._dual_infeasibility,
+            step=step,
+            pivot=None,
+            time=time.perf_counter() - start
+        ))
+
+    def _status(self, result: Union[tuple[float, list[float]], None]) -> SolverResult.Status:
+        """
+        :return: how the solve with [result] ended
+        """
+        if result is not None:
+            return SolverResult.Status.OPTIMAL
+        if self.is_not_applicable:
+            return SolverResult.Status.NOT_APPLICABLE
+        return SolverResult.Status.NO_SOLUTION
+
+    def _counters(self) -> dict[str, int]:
+        """
+        :return: the iteration counters of the last solve
+        """
+        return {"iterations": self.iterations, "initialization_iterations": self.initialization_iterations}
+
+    def _phase_time(self) -> dict[str, float]:
+        """
+        :return: seconds spent in every phase of the last solve
+        """
+        phase_time = {"factorization": self.factorization_time, "update": self.update_time}
+        phase_time["other"] = max(self.time - sum(phase_time.values()), 0.0)
+        return phase_time
+
+    def _record(self, result: Union[tuple[float, list[float]], None]) -> None:
+        """
+        Add the statistics of the solve with [result] to [instrumentation]
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.record("interior-point", self._status(result).value, self.time, self._counters(),
+                                        self._phase_time())
+
+    def _solve(self) -> Union[tuple[float, list[float]], None]:
+        """
+        Solve the problem in this solver without printing anything
         :return: a tuple (solution, X*) or [None] in special cases
         """
+        start = time.perf_counter()
+        self.solution = 0
         x = self.calculate()
 
-        if not self.is_not_applicable and x is not None:
+        if self.is_not_applicable or x is None:
+            result = None
+        else:
             x = [round(float(i), self.eps) for i in x]
             for i in range(len(x)):
                 self.solution += self.c[i] * x[i]
 
             if self.mode == InteriorPointSolver.Mode.MINIMIZE:  # Flip the solution in case we were minimizing
                 self.solution *= -1
+            result = self.solution, x
+
+        self.time = time.perf_counter() - start
+        self._record(result)
+        return result
+
+    def run(self) -> SolverResult:
+        """
+        Solve the problem in this solver without printing anything
+        :return: the status, the solution, X* and the statistics of the solve. The affine scaling method
+            does not compute dual values
+        """
+        result = self._solve()
+        return SolverResult(
+            status=self._status(result),
+            objective=None if result is None else float(result[0]),
+            x=None if result is None else result[1],
+            iterations=self.iterations,
+            time=self.time,
+            counters=self._counters(),
+            phase_time=self._phase_time()
+        )
+
+    def solve(self) -> Union[tuple[float, list[float]], None]:
+        """
+        Solve the problem in this solver and print the solution and X*,
+        or print "The method is not applicable!" or "The problem has no solution!" in those special cases,
+        and the problem before that, as far as [verbosity] asks for
+        :return: a tuple (solution, X*) or [None] in special cases
+        """
+        if self.verbosity >= Verbosity.PROBLEM:
+            self.print_problem()
+        result = self._solve()
+        if self.verbosity < Verbosity.RESULT:
+            return result
 
-            print("X: ", x)
-            print("Solution:", self.solution)
-            return self.solution, x
+        if self.start is None:
+            print(f"Initial point found in {self.initialization_iterations} iterations, "
+                  f"{self.initialization_time:.6f} s")
+        if result is not None:
+            print("X: ", result[1])
+            print("Solution:", result[0])
         elif self.is_not_applicable:
             print("The method is not applicable!")
-            return None
         else:
             print("The problem does not have solution!")
-            return None
+        return result
+
+
+class _Workspace:
+    def __init__(self, m: int, n: int) -> None:
+        """
+        Buffers of one iteration of [InteriorPointSolver] for m constraints and n variables, allocated once per solve
+        """
+        import numpy as np
+
+        self.aa: np.ndarray = np.empty((m, n))
+        """A * D"""
+
+        self.cc: np.ndarray = np.empty(n)
+        """D * c"""
+
+        self.f: np.ndarray = np.empty((m, m))
+        """A * D^2 * A^T, then its Cholesky factor"""
+
+        self.rhs: np.ndarray = np.empty(m)
+        """Right hand side of the normal equations, then their solution"""
+
+        self.cp: np.ndarray = np.empty(n)
+        """Projected gradient"""
+
+        self.step: np.ndarray = np.empty(n)
+        """Scratch vector, then the step of the iteration"""
@@ -0,0 +1,234 @@
+# Linear program loaded from a model file and its reformulations for the solvers
+
+from dataclasses import dataclass, field
+from typing import Union
+
+import numpy as np
+from scipy import sparse
+
+from simplex_solver import SimplexSolver
+
+
+@dataclass
+class Reformulation:
+    """
+    A [Model] rewritten in nonnegative variables x' for a solver: maximize or minimize c * x' + offset
+    subject to a * x' <= b ([Model.inequality_form]) or a * x' = b ([Model.standard_form]), x' >= 0.
+    [Model.constraint_form] keeps the variables and their bounds, and the [constraints] of the rows
+    """
+
+    c: np.ndarray
+    """Coefficients of the objective function"""
+
+    a: sparse.csr_matrix
+    """Matrix of the coefficients of the constraints"""
+
+    b: np.ndarray
+    """Right hand side of the constraints"""
+
+    offset: float
+    """Constant term of the objective function"""
+
+    shift: np.ndarray
+    """For every model variable: x = shift + sign * x'[positive] - x'[negative]"""
+
+    sign: np.ndarray
+    """For every model variable: +1 or -1"""
+
+    positive: np.ndarray
+    """For every model variable: index of its column in x'"""
+
+    negative: np.ndarray
+    """For every free model variable: index of its negative part in x', -1 for other variables"""
+
+    constraints: Union[list[SimplexSolver.Constraint], None] = None
+    """[SimplexSolver.Constraint] of every row, [None] if the form fixes it"""
+
+    def recover(self, x: list[float]) -> np.ndarray:
+        """
+        Map a solution of the reformulation back to the variables of the model
+        :param x: values of x'
+        :return: values of the model variables
+        """
+        x = np.asarray(x, dtype=float)
+        values = self.shift + self.sign * x[self.positive]
+        split = self.negative >= 0
+        values[split] -= x[self.negative[split]]
+        return values
+
+
+@dataclass
+class Model:
+    """
+    Maximize or minimize c * x + objective_offset
+    subject to row_lower <= a * x <= row_upper and lower <= x <= upper. Infinite bounds are absent
+    """
+
+    Mode = SimplexSolver.Mode
+
+    name: str
+    """Name of the model"""
+
+    mode: SimplexSolver.Mode
+    """One of [Mode.MAXIMIZE] or [Mode.MINIMIZE]"""
+
+    c: np.ndarray
+    """Coefficients of the objective function"""
+
+    a: sparse.csr_matrix
+    """Matrix of the coefficients of the constraints"""
+
+    row_lower: np.ndarray
+    """Lower bounds of the constraints, -inf if absent"""
+
+    row_upper: np.ndarray
+    """Upper bounds of the constraints, inf if absent"""
+
+    lower: np.ndarray
+    """Lower bounds of the variables, -inf if absent"""
+
+    upper: np.ndarray
+    """Upper bounds of the variables, inf if absent"""
+
+    objective_offset: float = 0.0
+    """Constant term of the objective function"""
+
+    variable_names: list[str] = field(default_factory=list)
+    """Names of the variables"""
+
+    row_names: list[str] = field(default_factory=list)
+    """Names of the constraints"""
+
+    @classmethod
+    def from_inequality_form(cls, mode: SimplexSolver.Mode, c, a, b) -> "Model":
+        """
+        :return: the model of c * x subject to a * x <= b, x >= 0, the problem of [SimplexSolver]
+        """
+        a = sparse.csr_matrix(a, dtype=float)
+        return cls("", mode, np.asarray(c, dtype=float), a, np.full(a.shape[0], -np.inf), np.asarray(b, dtype=float),
+                   np.zeros(a.shape[1]), np.full(a.shape[1], np.inf))
+
+    @classmethod
+    def from_standard_form(cls, mode: SimplexSolver.Mode, c, a, b) -> "Model":
+        """
+        :return: the model of c * x subject to a * x = b, x >= 0, the problem of the Interior-Point solvers
+        """
+        a = sparse.csr_matrix(a, dtype=float)
+        b = np.asarray(b, dtype=float)
+        return cls("", mode, np.asarray(c, dtype=float), a, b.copy(), b.copy(),
+                   np.zeros(a.shape[1]), np.full(a.shape[1], np.inf))
+
+    def _nonnegative_variables(self):
+        """
+        Substitute every variable with nonnegative ones:
+        x = lower + x' if the lower bound is finite, x = upper - x' if only the upper bound is finite,
+        x = x' - x'' if the variable is free
+        :return: a tuple (a', c', offset, row shift, upper bounds of x', shift, sign, positive, negative)
+        """
+        n = len(self.c)
+        has_lower = np.isfinite(self.lower)
+        has_upper = np.isfinite(self.upper)
+
+        shift = np.where(has_lower, self.lower, np.where(has_upper, self.upper, 0.0))
+        sign = np.where(has_lower | ~has_upper, 1.0, -1.0)
+        free = ~has_lower & ~has_upper
+
+        positive = np.arange(n)
+        negative = np.full(n, -1)
+        negative[free] = n + np.arange(np.count_nonzero(free))
+
+        a = self.a @ sparse.diags(sign)
+        a = sparse.hstack((a, -a[:, np.flatnonzero(free)]), format="csr")
+        c = np.concatenate((sign * self.c, -self.c[free]))
+
+        bound = np.full(a.shape[1], np.inf)
+        bound[:n] = np.where(has_lower & has_upper, self.upper - self.lower, np.inf)
+
+        offset = self.objective_offset + float(self.c @ shift)
+        row_shift = self.a @ shift
+        return a, c, offset, row_shift, bound, shift, sign, positive, negative
+
+    def inequality_form(self) -> Reformulation:
+        """
+        Rewrite the model as c * x' subject to a * x' <= b, x' >= 0, the form of [SimplexSolver].
+        Rows with a lower bound are negated, equality rows become two rows, upper bounds of variables become rows
+        """
+        a, c, offset, row_shift, bound, shift, sign, positive, negative = self._nonnegative_variables()
+        upper = self.row_upper - row_shift
+        lower = self.row_lower - row_shift
+        has_upper = np.flatnonzero(np.isfinite(upper))
+        has_lower = np.flatnonzero(np.isfinite(lower))
+        bounded = np.flatnonzero(np.isfinite(bound))
+
+        rows = sparse.vstack((
+            a[has_upper],
+            -a[has_lower],
+            sparse.identity(a.shape[1], format="csr")[bounded],
+        ), format="csr")
+        b = np.concatenate((upper[has_upper], -lower[has_lower], bound[bounded]))
+        return Reformulation(c, rows, b, offset, shift, sign, positive, negative)
+
+    def constraint_form(self) -> Reformulation:
+        """
+        Rewrite the model as c * x subject to a * x <= b, >= b or = b row by row, the form of [SimplexSolver]
+        with its [lower] and [upper] bounds of the variables. Ranged rows become two rows, free rows are dropped
+        """
+        has_upper = np.isfinite(self.row_upper)
+        has_lower = np.isfinite(self.row_lower)
+        equal = has_upper & has_lower & (self.row_upper == self.row_lower)
+        less = np.flatnonzero(has_upper & ~equal)
+        greater = np.flatnonzero(has_lower & ~equal)
+        equal = np.flatnonzero(equal)
+
+        rows = sparse.vstack((self.a[less], self.a[greater], self.a[equal]), format="csr")
+        b = np.concatenate((self.row_upper[less], self.row_lower[greater], self.row_upper[equal]))
+        constraints = [SimplexSolver.Constraint.LESS_EQUAL] * len(less) \
+            + [SimplexSolver.Constraint.GREATER_EQUAL] * len(greater) + [SimplexSolver.Constraint.EQUAL] * len(equal)
+
+        n = len(self.c)
+        return Reformulation(self.c, rows, b, self.objective_offset, np.zeros(n), np.ones(n), np.arange(n),
+                             np.full(n, -1), constraints)
+
+    def standard_form(self) -> Reformulation:
+        """
+        Rewrite the model as c * x' subject to a * x' = b, x' >= 0, the form of the Interior-Point solvers.
+        Inequality rows get slack variables, ranged rows get a slack variable with a bound row,
+        upper bounds of variables become rows with slack variables
+        """
+        a, c, offset, row_shift, bound, shift, sign, positive, negative = self._nonnegative_variables()
+        upper = self.row_upper - row_shift
+        lower = self.row_lower - row_shift
+        has_upper = np.isfinite(upper)
+        has_lower = np.isfinite(lower)
+
+        kept = np.flatnonzero(has_upper | has_lower)  # Free rows constrain nothing
+        a = a[kept]
+        upper, lower = upper[kept], lower[kept]
+        has_upper, has_lower = has_upper[kept], has_lower[kept]
+        m, n = a.shape
+
+        # a * x' + s = upper for rows with only an upper bound, a * x' - s = lower for rows with a lower bound
+        inequality = np.flatnonzero(upper != lower)
+        slack_sign = np.where(has_lower[inequality], -1.0, 1.0)
+        slacks = sparse.csr_matrix((slack_sign, (inequality, np.arange(len(inequality)))), shape=(m, len(inequality)))
+        b = np.where(has_lower, lower, upper)
+
+        # Ranged rows bound their slack variable: s + t = upper - lower. Bounded variables: x' + t = bound
+        ranged = np.flatnonzero(has_lower[inequality] & has_upper[inequality])
+        bounded = np.flatnonzero(np.isfinite(bound))
+        extra = len(ranged) + len(bounded)
+        bound_rows = sparse.hstack((
+            sparse.csr_matrix((np.ones(len(bounded)), (len(ranged) + np.arange(len(bounded)), bounded)),
+                              shape=(extra, n)),
+            sparse.csr_matrix((np.ones(len(ranged)), (np.arange(len(ranged)), ranged)),
+                              shape=(extra, len(inequality))),
+            sparse.identity(extra, format="csr"),
+        ), format="csr")
+
+        rows = sparse.vstack((
+            sparse.hstack((a, slacks, sparse.csr_matrix((m, extra))), format="csr"),
+            bound_rows,
+        ), format="csr")
+        b = np.concatenate((b, upper[inequality[ranged]] - lower[inequality[ranged]], bound[bounded]))
+        c = np.concatenate((c, np.zeros(len(inequality) + extra)))
+        return Reformulation(c, rows, b, offset, shift, sign, positive, negative)
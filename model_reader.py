@@ -0,0 +1,535 @@
+# Streaming readers of MPS and CPLEX LP model files
+
+import gzip
+import re
+from array import array
+from typing import Iterator, TextIO, Union
+
+import numpy as np
+from scipy import sparse
+
+from lp_model import Model
+from simplex_solver import SimplexSolver
+
+
+class ModelFormatError(ValueError):
+    """
+    The model file is malformed
+    """
+
+    def __init__(self, message: str, line: int) -> None:
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+class _ModelBuilder:
+    def __init__(self) -> None:
+        """
+        Collect a model row by row into compact typed arrays, without lists of lists
+        """
+
+        self.rows = array("i")
+        """Row indices of the nonzero coefficients"""
+
+        self.columns = array("i")
+        """Column indices of the nonzero coefficients"""
+
+        self.values = array("d")
+        """Nonzero coefficients of the constraints"""
+
+        self.c = array("d")
+        """Coefficients of the objective function"""
+
+        self.lower = array("d")
+        """Lower bounds of the variables"""
+
+        self.upper = array("d")
+        """Upper bounds of the variables"""
+
+        self.row_lower = array("d")
+        """Lower bounds of the constraints"""
+
+        self.row_upper = array("d")
+        """Upper bounds of the constraints"""
+
+        self.column_index: dict[str, int] = {}
+        """Index of every variable by name"""
+
+        self.row_index: dict[str, int] = {}
+        """Index of every constraint by name"""
+
+    def column(self, name: str) -> int:
+        """
+        :return: index of the variable, added with bounds [0, inf) if new
+        """
+        index = self.column_index.get(name)
+        if index is None:
+            index = self.column_index[name] = len(self.c)
+            self.c.append(0.0)
+            self.lower.append(0.0)
+            self.upper.append(np.inf)
+        return index
+
+    def add_row(self, name: str, lower: float, upper: float) -> int:
+        """
+        :return: index of the new constraint
+        """
+        index = self.row_index[name] = len(self.row_lower)
+        self.row_lower.append(lower)
+        self.row_upper.append(upper)
+        return index
+
+    def add_coefficient(self, row: int, column: int, value: float) -> None:
+        self.rows.append(row)
+        self.columns.append(column)
+        self.values.append(value)
+
+    def build(self, name: str, mode: SimplexSolver.Mode, objective_offset: float) -> Model:
+        """
+        :return: the collected model. Repeated coefficients of the same cell are summed
+        """
+        shape = (len(self.row_lower), len(self.c))
+        a = sparse.csr_matrix(
+            (np.frombuffer(self.values, dtype=float),
+             (np.frombuffer(self.rows, dtype=np.intc), np.frombuffer(self.columns, dtype=np.intc))),
+            shape=shape,
+        )
+        by_index = lambda names: sorted(names, key=names.get)  # noqa: E731
+        return Model(
+            name=name,
+            mode=mode,
+            c=np.array(self.c),
+            a=a,
+            row_lower=np.array(self.row_lower),
+            row_upper=np.array(self.row_upper),
+            lower=np.array(self.lower),
+            upper=np.array(self.upper),
+            objective_offset=objective_offset,
+            variable_names=by_index(self.column_index),
+            row_names=by_index(self.row_index),
+        )
+
+
+def _open(source: Union[str, TextIO]) -> TextIO:
+    """
+    :param source: path of the file (gzip-compressed if it ends with .gz) or an open text stream
+    :return: a text stream
+    """
+    if not isinstance(source, str):
+        return source
+    if source.endswith(".gz"):
+        return gzip.open(source, "rt")
+    return open(source)
+
+
+def _number(token: str, line: int) -> float:
+    try:
+        return float(token)
+    except ValueError:
+        raise ModelFormatError(f"expected a number, got {token!r}", line) from None
+
+
+def read_mps(source: Union[str, TextIO]) -> Model:
+    """
+    Read a model in free MPS format line by line. Names must not contain spaces.
+    Integrality markers are ignored, which gives the linear relaxation of the model
+
+    :param source: path of the file (gzip-compressed if it ends with .gz) or an open text stream
+    :return: the model
+    """
+    builder = _ModelBuilder()
+    name = ""
+    mode = SimplexSolver.Mode.MINIMIZE
+    objective = None
+    free_rows: set[str] = set()
+    senses: dict[int, str] = {}
+    objective_offset = 0.0
+    section = None
+
+    with _open(source) as stream:
+        for number, line in enumerate(stream, start=1):
+            if not line.strip() or line.startswith("*"):
+                continue
+
+            tokens = line.split()
+            if not line[0].isspace():  # Section header
+                section = tokens[0].upper()
+                if section == "NAME":
+                    name = " ".join(tokens[1:])
+                elif section == "OBJSENSE" and len(tokens) > 1:
+                    mode = _mps_sense(tokens[1], number)
+                elif section == "ENDATA":
+                    break
+                elif section not in ("ROWS", "COLUMNS", "RHS", "RANGES", "BOUNDS", "OBJSENSE"):
+                    raise ModelFormatError(f"unknown section {section}", number)
+                continue
+
+            if section == "OBJSENSE":
+                mode = _mps_sense(tokens[0], number)
+
+            elif section == "ROWS":
+                sense, row = tokens[0].upper(), tokens[1]
+                if sense == "N":
+                    if objective is None:
+                        objective = row
+                    else:
+                        free_rows.add(row)
+                elif sense in ("L", "G", "E"):
+                    index = builder.add_row(
+                        row,
+                        -np.inf if sense == "L" else 0.0,
+                        np.inf if sense == "G" else 0.0,
+                    )
+                    senses[index] = sense
+                else:
+                    raise ModelFormatError(f"unknown row type {sense}", number)
+
+            elif section == "COLUMNS":
+                if len(tokens) > 2 and tokens[1] == "'MARKER'":
+                    continue
+                column = builder.column(tokens[0])
+                for row, value in zip(tokens[1::2], tokens[2::2]):
+                    value = _number(value, number)
+                    if row == objective:
+                        builder.c[column] = value
+                    elif row in builder.row_index:
+                        builder.add_coefficient(builder.row_index[row], column, value)
+                    elif row not in free_rows:
+                        raise ModelFormatError(f"unknown row {row}", number)
+
+            elif section in ("RHS", "RANGES"):
+                pairs = tokens[1:] if len(tokens) % 2 == 1 else tokens  # The set name is optional
+                for row, value in zip(pairs[0::2], pairs[1::2]):
+                    value = _number(value, number)
+                    if row == objective:
+                        if section == "RHS":
+                            objective_offset = -value
+                        continue
+                    if row in free_rows:
+                        continue
+                    if row not in builder.row_index:
+                        raise ModelFormatError(f"unknown row {row}", number)
+
+                    index = builder.row_index[row]
+                    if section == "RHS":
+                        _set_rhs(builder, index, senses[index], value)
+                    else:
+                        _set_range(builder, index, senses[index], value)
+
+            elif section == "BOUNDS":
+                # "KIND [set] column value" or "KIND [set] column" for bounds without a value
+                kind = tokens[0].upper()
+                if kind in ("FR", "MI", "PL") or (kind == "BV" and tokens[-1] in builder.column_index):
+                    column_name, value = tokens[-1], None
+                else:
+                    column_name, value = tokens[-2], tokens[-1]
+                if column_name not in builder.column_index:
+                    raise ModelFormatError(f"unknown column {column_name}", number)
+                _set_bound(builder, builder.column_index[column_name], kind,
+                           None if value is None else _number(value, number), number)
+
+            else:
+                raise ModelFormatError("data outside of a section", number)
+
+    return builder.build(name, mode, objective_offset)
+
+
+def _mps_sense(token: str, line: int) -> SimplexSolver.Mode:
+    token = token.upper()
+    if token in ("MAX", "MAXIMIZE"):
+        return SimplexSolver.Mode.MAXIMIZE
+    if token in ("MIN", "MINIMIZE"):
+        return SimplexSolver.Mode.MINIMIZE
+    raise ModelFormatError(f"unknown objective sense {token}", line)
+
+
+def _set_rhs(builder: _ModelBuilder, row: int, sense: str, value: float) -> None:
+    """
+    Apply the right hand side of a constraint. The RHS section always comes before the RANGES section
+    """
+    if sense != "G":
+        builder.row_upper[row] = value
+    if sense != "L":
+        builder.row_lower[row] = value
+
+
+def _set_range(builder: _ModelBuilder, row: int, sense: str, value: float) -> None:
+    """
+    Turn a constraint into a ranged one: L rows get [rhs - |R|, rhs], G rows [rhs, rhs + |R|],
+    E rows [rhs, rhs + R] if R > 0 and [rhs + R, rhs] otherwise
+    """
+    if sense == "L":
+        builder.row_lower[row] = builder.row_upper[row] - abs(value)
+    elif sense == "G":
+        builder.row_upper[row] = builder.row_lower[row] + abs(value)
+    elif value > 0:
+        builder.row_upper[row] = builder.row_lower[row] + value
+    else:
+        builder.row_lower[row] = builder.row_upper[row] + value
+
+
+def _set_bound(builder: _ModelBuilder, column: int, kind: str, value: Union[float, None], line: int) -> None:
+    if kind in ("UP", "UI"):
+        builder.upper[column] = value
+        if value < 0 and builder.lower[column] == 0:  # MPS convention: a negative upper bound alone frees the variable
+            builder.lower[column] = -np.inf
+    elif kind in ("LO", "LI"):
+        builder.lower[column] = value
+    elif kind == "FX":
+        builder.lower[column] = builder.upper[column] = value
+    elif kind == "FR":
+        builder.lower[column], builder.upper[column] = -np.inf, np.inf
+    elif kind == "MI":
+        builder.lower[column] = -np.inf
+    elif kind == "PL":
+        builder.upper[column] = np.inf
+    elif kind == "BV":
+        builder.lower[column], builder.upper[column] = 0.0, 1.0
+    else:
+        raise ModelFormatError(f"unsupported bound type {kind}", line)
+
+
+_LP_SECTIONS = {
+    "maximize": "objective", "maximise": "objective", "maximum": "objective", "max": "objective",
+    "minimize": "objective", "minimise": "objective", "minimum": "objective", "min": "objective",
+    "subject to": "constraints", "such that": "constraints", "st": "constraints", "s.t.": "constraints",
+    "st.": "constraints",
+    "bounds": "bounds", "bound": "bounds",
+    "general": "integers", "generals": "integers", "gen": "integers",
+    "integer": "integers", "integers": "integers",
+    "binary": "binaries", "binaries": "binaries", "bin": "binaries",
+    "end": "end",
+}
+"""Section keywords of the CPLEX LP format"""
+
+_LP_TOKEN = re.compile(r"""
+    (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<operator><=|>=|=<|=>|<|>|=)
+    |(?P<sign>[+-])
+    |(?P<colon>:)
+    |(?P<name>[^\s:+\-<>=*^\[\]\\]+)
+    |(?P<space>\s+)
+    |(?P<error>.)
+""", re.VERBOSE)
+"""Tokens of objective, constraint and bound expressions"""
+
+
+def _lp_tokens(line: str, number: int) -> Iterator[tuple[str, str]]:
+    """
+    Split a line of an LP file into (kind, text) tokens
+    """
+    for match in _LP_TOKEN.finditer(line.split("\\", 1)[0]):  # Comments start with a backslash
+        kind = match.lastgroup
+        if kind == "space":
+            continue
+        text = match.group()
+        if kind == "error":
+            raise ModelFormatError(f"unexpected character {text!r}", number)
+        if kind == "name" and text.lower() in ("inf", "infinity"):
+            kind = "number"
+        yield kind, text
+
+
+class _LinearExpression:
+    def __init__(self) -> None:
+        """
+        Terms of an objective or a constraint collected token by token
+        """
+
+        self.label: Union[str, None] = None
+        """Name of the objective or constraint"""
+
+        self.terms: list[tuple[str, float]] = []
+        """(variable, coefficient) pairs"""
+
+        self.constant = 0.0
+        """Sum of the terms without a variable"""
+
+        self.sign = 1.0
+        """Sign of the next term"""
+
+        self.coefficient: Union[float, None] = None
+        """Pending coefficient of the next term"""
+
+        self.previous_name: Union[str, None] = None
+        """Last name seen, a label if a colon follows it"""
+
+    def add(self, kind: str, text: str, line: int) -> None:
+        if kind == "colon":
+            if self.previous_name is None or len(self.terms) != 1:
+                raise ModelFormatError("unexpected ':'", line)
+            self.label = self.previous_name
+            self.terms.clear()
+            self.previous_name = None
+        elif kind == "sign":
+            self.flush()
+            self.sign = -self.sign if text == "-" else self.sign
+        elif kind == "number":
+            self.flush()
+            self.coefficient = float(text)
+        elif kind == "name":
+            coefficient = 1.0 if self.coefficient is None else self.coefficient
+            self.terms.append((text, self.sign * coefficient))
+            self.sign, self.coefficient = 1.0, None
+            self.previous_name = text
+        else:
+            raise ModelFormatError(f"unexpected {text!r}", line)
+
+    def flush(self) -> None:
+        """
+        Turn a pending coefficient without a variable into a constant
+        """
+        if self.coefficient is not None:
+            self.constant += self.sign * self.coefficient
+            self.sign, self.coefficient = 1.0, None
+        self.previous_name = None
+
+
+def read_lp(source: Union[str, TextIO]) -> Model:
+    """
+    Read a model in CPLEX LP format line by line. Section keywords must be on their own lines.
+    Integrality sections are ignored, which gives the linear relaxation of the model
+
+    :param source: path of the file (gzip-compressed if it ends with .gz) or an open text stream
+    :return: the model
+    """
+    builder = _ModelBuilder()
+    mode = SimplexSolver.Mode.MINIMIZE
+    section = None
+    objective_offset = 0.0
+    objective_name = ""
+    expression = _LinearExpression()
+    operator: Union[str, None] = None
+    rhs_sign = 1.0
+
+    with _open(source) as stream:
+        for number, line in enumerate(stream, start=1):
+            keyword = " ".join(line.split("\\", 1)[0].split()).lower()
+            if not keyword:
+                continue
+            if keyword in _LP_SECTIONS:
+                if section == "objective":
+                    expression.flush()
+                    objective_offset = expression.constant
+                    objective_name = expression.label or ""
+                    for variable, coefficient in expression.terms:
+                        builder.c[builder.column(variable)] += coefficient
+                section = _LP_SECTIONS[keyword]
+                if section == "objective":
+                    mode = SimplexSolver.Mode.MAXIMIZE if keyword.startswith("max") else SimplexSolver.Mode.MINIMIZE
+                expression = _LinearExpression()
+                if section == "end":
+                    break
+                continue
+
+            if section == "objective":
+                for kind, text in _lp_tokens(line, number):
+                    expression.add(kind, text, number)
+
+            elif section == "constraints":
+                for kind, text in _lp_tokens(line, number):
+                    if operator is None:
+                        if kind == "operator":
+                            expression.flush()
+                            operator = text
+                        else:
+                            expression.add(kind, text, number)
+                    elif kind == "sign":
+                        rhs_sign = -rhs_sign if text == "-" else rhs_sign
+                    elif kind == "number":
+                        rhs = rhs_sign * float(text) - expression.constant
+                        name = expression.label or f"R{len(builder.row_lower) + 1}"
+                        row = builder.add_row(
+                            name,
+                            rhs if operator in (">=", "=>", ">", "=") else -np.inf,
+                            rhs if operator in ("<=", "=<", "<", "=") else np.inf,
+                        )
+                        for variable, coefficient in expression.terms:
+                            builder.add_coefficient(row, builder.column(variable), coefficient)
+                        expression, operator, rhs_sign = _LinearExpression(), None, 1.0
+                    else:
+                        raise ModelFormatError(f"expected the right hand side, got {text!r}", number)
+
+            elif section == "bounds":
+                _read_lp_bound(builder, list(_lp_tokens(line, number)), number)
+
+            elif section == "binaries":
+                for variable in line.split():
+                    column = builder.column(variable)
+                    builder.lower[column], builder.upper[column] = 0.0, 1.0
+
+            elif section == "integers":
+                for variable in line.split():
+                    builder.column(variable)
+
+            else:
+                raise ModelFormatError("data outside of a section", number)
+
+    if section == "objective":  # A file with only an objective
+        expression.flush()
+        objective_offset = expression.constant
+        for variable, coefficient in expression.terms:
+            builder.c[builder.column(variable)] += coefficient
+
+    return builder.build(objective_name, mode, objective_offset)
+
+
+def _read_lp_bound(builder: _ModelBuilder, tokens: list[tuple[str, str]], line: int) -> None:
+    """
+    Apply one line of the bounds section: "x free", "x <= u", "x >= l", "x = v", "l <= x", "l <= x <= u"
+    """
+    values = []
+    i = 0
+    while i < len(tokens):  # Merge signs into the numbers that follow them
+        kind, text = tokens[i]
+        if kind == "sign" and i + 1 < len(tokens) and tokens[i + 1][0] == "number":
+            values.append(("number", text + tokens[i + 1][1]))
+            i += 2
+        else:
+            values.append((kind, text))
+            i += 1
+
+    def number(text: str) -> float:
+        text = text.lower()
+        if text.lstrip("+-") in ("inf", "infinity"):
+            return -np.inf if text.startswith("-") else np.inf
+        return float(text)
+
+    kinds = [kind for kind, _ in values]
+    if kinds == ["name", "name"] and values[1][1].lower() == "free":
+        column = builder.column(values[0][1])
+        builder.lower[column], builder.upper[column] = -np.inf, np.inf
+    elif kinds == ["name", "operator", "number"]:
+        _apply_lp_bound(builder, builder.column(values[0][1]), values[1][1], number(values[2][1]))
+    elif kinds == ["number", "operator", "name"]:
+        flipped = {"<=": ">=", "=<": ">=", "<": ">=", ">=": "<=", "=>": "<=", ">": "<=", "=": "="}[values[1][1]]
+        _apply_lp_bound(builder, builder.column(values[2][1]), flipped, number(values[0][1]))
+    elif kinds == ["number", "operator", "name", "operator", "number"]:
+        column = builder.column(values[2][1])
+        flipped = {"<=": ">=", "=<": ">=", "<": ">=", ">=": "<=", "=>": "<=", ">": "<="}.get(values[1][1])
+        if flipped is None:
+            raise ModelFormatError("unsupported bound", line)
+        _apply_lp_bound(builder, column, flipped, number(values[0][1]))
+        _apply_lp_bound(builder, column, values[3][1], number(values[4][1]))
+    else:
+        raise ModelFormatError("unsupported bound", line)
+
+
+def _apply_lp_bound(builder: _ModelBuilder, column: int, operator: str, value: float) -> None:
+    if operator in ("<=", "=<", "<"):
+        builder.upper[column] = value
+    elif operator in (">=", "=>", ">"):
+        builder.lower[column] = value
+    else:
+        builder.lower[column] = builder.upper[column] = value
+
+
+def read_model(source: str) -> Model:
+    """
+    Read a model file choosing the format by the extension: .lp (or .lp.gz) for CPLEX LP, MPS otherwise
+    :param source: path of the file
+    :return: the model
+    """
+    if source.lower().removesuffix(".gz").endswith(".lp"):
+        return read_lp(source)
+    return read_mps(source)
@@ -0,0 +1,98 @@
+# Normal equations A * D * A^T shared by the interior point solvers
+
+import numpy as np
+from scipy import sparse
+from scipy.linalg import cho_factor, cho_solve
+from scipy.sparse.linalg import splu
+
+
+def as_matrix(a):
+    """
+    Convert the matrix of the coefficients of the constraints for the normal equations
+    :param a: nested lists, a NumPy array or a scipy sparse matrix
+    :return: a CSR matrix if [a] is sparse, a float array otherwise
+    """
+    if sparse.issparse(a):
+        return sparse.csr_matrix(a, dtype=float)
+    return np.asarray(a, dtype=float)
+
+
+def is_sparse(a) -> bool:
+    """
+    :return: whether [a] is a scipy sparse matrix
+    """
+    return sparse.issparse(a)
+
+
+def scale_columns(a, scaling: np.ndarray):
+    """
+    Compute A * diag(scaling) without forming the diagonal matrix
+    :param a: dense array or scipy sparse matrix
+    :param scaling: diagonal of the scaling matrix
+    :return: the scaled matrix, sparse if [a] is sparse
+    """
+    if sparse.issparse(a):
+        return (a @ sparse.diags(scaling)).tocsr()
+    return a * scaling
+
+
+def assemble(a, scaling: np.ndarray):
+    """
+    Build the normal equations matrix A * diag(scaling) * A^T without forming the diagonal matrix
+    :param a: matrix of the coefficients of the constraints, dense or scipy sparse
+    :param scaling: diagonal of the scaling matrix
+    :return: the normal equations matrix, sparse (CSC) if [a] is sparse
+    """
+    if sparse.issparse(a):
+        return (scale_columns(a, scaling) @ a.T).tocsc()
+    return (a * scaling) @ a.T
+
+
+def is_finite(f) -> bool:
+    """
+    Check that a normal equations matrix has neither NaN nor infinite values
+    :param f: dense or sparse matrix
+    :return: whether all values are finite
+    """
+    return bool(np.all(np.isfinite(f.data if sparse.issparse(f) else f)))
+
+
+class Factorization:
+    def __init__(self, f) -> None:
+        """
+        Factorize a normal equations matrix once so that it can be solved against many right hand sides.
+        Dense matrices get a Cholesky factorization. Sparse matrices get a SuperLU factorization
+        with a symmetric fill-reducing ordering and no pivoting, which keeps the factor as sparse as a Cholesky one
+
+        :param f: symmetric positive definite normal equations matrix, dense or scipy sparse
+        :raises np.linalg.LinAlgError: if the matrix is singular
+        """
+
+        self._factor = None
+        """Cholesky factor of a dense matrix"""
+
+        self._sparse_factor = None
+        """SuperLU factor of a sparse matrix"""
+
+        if sparse.issparse(f):
+            try:
+                self._sparse_factor = splu(
+                    f,
+                    permc_spec="MMD_AT_PLUS_A",
+                    diag_pivot_thresh=0,
+                    options={"SymmetricMode": True}
+                )
+            except RuntimeError as error:  # SuperLU reports an exactly singular factor
+                raise np.linalg.LinAlgError(str(error)) from error
+        else:
+            self._factor = cho_factor(f, check_finite=False)
+
+    def solve(self, rhs: np.ndarray) -> np.ndarray:
+        """
+        Solve the factorized system with two triangular solves
+        :param rhs: right hand side
+        :return: the solution
+        """
+        if self._sparse_factor is not None:
+            return self._sparse_factor.solve(rhs)
+        return cho_solve(self._factor, rhs, check_finite=False)
@@ -0,0 +1,108 @@
+# Numerical settings of the Simplex method: tolerances, refactorization and scaling of the problem
+
+from dataclasses import dataclass
+from enum import Enum
+
+
+@dataclass
+class Numerics:
+    """
+    Floating point arithmetic for [SimplexSolver] instead of rounding every cell of the tableau to [eps] digits:
+    values are compared with tolerances, the tableau is recomputed from the constraints every
+    [refactorization_period] pivots so that the error of the pivots does not accumulate,
+    and the constraints can be scaled before solving
+    """
+
+    class Scaling(str, Enum):
+        NONE = "none"
+        GEOMETRIC = "geometric"
+        """Rows and columns divided by the geometric mean of their largest and smallest coefficient, a few passes"""
+        EQUILIBRATION = "equilibration"
+        """Rows, then columns divided by their largest coefficient"""
+
+    pivot_tolerance: float = 1e-9
+    """Pivot values up to this are round-off, not pivot candidates"""
+
+    relative_pivot_tolerance: float = 1e-7
+    """Pivot values up to this times the largest value of the pivot column are round-off too"""
+
+    feasibility_tolerance: float = 1e-9
+    """Basic variables up to this outside of their bounds are feasible"""
+
+    optimality_tolerance: float = 1e-9
+    """Z-row values down to minus this are optimal, they are set to 0 after every pivot"""
+
+    refactorization_period: int = 100
+    """How many pivots to do before recomputing the tableau from the constraints. 0 to never"""
+
+    scaling: Scaling = Scaling.GEOMETRIC
+    """How to scale the constraints before solving"""
+
+    def pivot_threshold(self, largest: float) -> float:
+        """
+        :param largest: the largest absolute value of the pivot column
+        :return: the largest absolute value of the pivot column that is still round-off
+        """
+        return max(self.pivot_tolerance, self.relative_pivot_tolerance * largest)
+
+
+def scale_factors(a, scaling: Numerics.Scaling, passes: int = 4) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Find the scaling of the rows and the columns of a matrix, so that the coefficients of diag(row) * a * diag(column)
+    are close to 1. The factors are powers of 2, which scale the values without rounding them
+    :param a: nested lists, a NumPy array or a scipy sparse matrix
+    :param scaling: the method
+    :param passes: how many times to scale the rows and the columns by geometric means
+    :return: a tuple (row factors, column factors)
+    """
+    import numpy as np
+    from scipy import sparse
+
+    a = abs(sparse.csr_matrix(a, dtype=float))
+    a.eliminate_zeros()
+    m, n = a.shape
+    row, column = np.ones(m), np.ones(n)
+    if scaling == Numerics.Scaling.NONE or not a.nnz:
+        return row, column
+
+    def largest(matrix) -> np.ndarray:
+        return matrix.max(axis=1).toarray().ravel()
+
+    def smallest(matrix) -> np.ndarray:
+        # The smallest nonzero value: the largest of the reciprocals
+        inverse = matrix.copy()
+        inverse.data = 1 / inverse.data
+        return 1 / np.maximum(largest(inverse), 1e-300)
+
+    def power_of_two(factors: np.ndarray) -> np.ndarray:
+        factors[~np.isfinite(factors) | (factors <= 0)] = 1  # Empty rows and columns stay as they are
+        return np.exp2(np.round(np.log2(factors)))
+
+    if scaling == Numerics.Scaling.EQUILIBRATION:
+        with np.errstate(divide="ignore"):
+            row = power_of_two(1 / largest(a))
+            column = power_of_two(1 / largest((sparse.diags(row) @ a).T.tocsr()))
+        return row, column
+
+    with np.errstate(divide="ignore"):  # Empty rows and columns divide by 0
+        for _ in range(passes):
+            scaled = sparse.diags(row) @ a @ sparse.diags(column)
+            row *= power_of_two(1 / np.sqrt(largest(scaled) * smallest(scaled)))
+            scaled = (sparse.diags(row) @ a @ sparse.diags(column)).T.tocsr()
+            column *= power_of_two(1 / np.sqrt(largest(scaled) * smallest(scaled)))
+    return row, column
+
+
+def scale_matrix(a, row: list[float], column: list[float]):
+    """
+    Compute diag(row) * a * diag(column)
+    :param a: nested lists, a NumPy array or a scipy sparse matrix
+    :return: the scaled matrix of the same kind as [a]
+    """
+    import numpy as np
+    from scipy import sparse
+
+    if sparse.issparse(a):
+        return (sparse.diags(row) @ a @ sparse.diags(column)).tocsr()
+    scaled = np.asarray(row)[:, np.newaxis] * np.asarray(a, dtype=float) * np.asarray(column)
+    return scaled if isinstance(a, np.ndarray) else scaled.tolist()
@@ -0,0 +1,220 @@
+# Vectorized tableau operations used by the NumPy backend of the Simplex method solver
+
+import tempfile
+from typing import Iterator, Union
+
+import numpy as np
+
+BLOCK = 2 ** 22
+"""How many cells of the tableau a pivot updates at a time, which bounds the temporary arrays it allocates"""
+
+
+def standard_form(
+        a,
+        b: list[float],
+        source: list[int],
+        sign: list[float],
+        logical_sign: list[float],
+        multipliers: list[float],
+        artificial_rows: list[int],
+        directory: Union[str, None] = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Build the tableau as contiguous arrays: the columns of the variables, a logical column for every row
+    and an artificial column for every row of [artificial_rows]
+    :param a: matrix of the coefficients of the constraints. A scipy sparse matrix is densified block by block,
+        as pivoting fills the tableau in anyway
+    :param b: right hand side of the constraints equations
+    :param source: column of [a] of every variable column
+    :param sign: sign of every variable column
+    :param logical_sign: coefficient of the logical variable of every row
+    :param multipliers: 1 or -1 for every row, so that the basic variable of the row gets the coefficient 1
+    :param artificial_rows: rows with an artificial variable
+    :param directory: directory to keep the tableau in as a memory-mapped temporary file, [None] to keep it in memory
+    :return: a tuple (tableau, right hand side) of float arrays
+    """
+    a = a.tocsr() if hasattr(a, "tocsr") else np.asarray(a, dtype=float)
+    rows, columns, n = len(b), len(source), a.shape[1]
+    multipliers = np.asarray(multipliers, dtype=float)
+    sign = np.asarray(sign, dtype=float)
+
+    shape = (rows, columns + rows + len(artificial_rows))
+    if directory is None:
+        tableau = np.zeros(shape)
+    else:  # Zero filled, and the file is deleted when the tableau is garbage collected
+        tableau = np.memmap(tempfile.TemporaryFile(dir=directory), dtype=float, mode="w+", shape=shape)
+
+    # The first n columns are the variables in their order, split free variables follow.
+    # Multiplying into the tableau block by block allocates no temporary copy of [a]
+    for start, stop in blocks(tableau):
+        block, coefficients = tableau[start:stop], a[start:stop]
+        if hasattr(coefficients, "toarray"):
+            coefficients = coefficients.toarray()
+        np.multiply(coefficients, sign[:n], out=block[:, :n])
+        if columns > n:
+            np.multiply(coefficients[:, source[n:]], sign[n:], out=block[:, n:columns])
+        block[np.arange(stop - start), columns + np.arange(start, stop)] = logical_sign[start:stop]
+        block *= multipliers[start:stop, np.newaxis]
+    tableau[artificial_rows, columns + rows + np.arange(len(artificial_rows))] = 1
+
+    return tableau, multipliers * np.asarray(b, dtype=float)
+
+
+def blocks(a: np.ndarray) -> Iterator[tuple[int, int]]:
+    """
+    Split the rows of [a] into blocks of about [BLOCK] cells
+    :return: (start, stop) of every block
+    """
+    rows = max(1, BLOCK // max(a.shape[1], 1))
+    for start in range(0, a.shape[0], rows):
+        yield start, min(start + rows, a.shape[0])
+
+
+def pivot_column(z: np.ndarray, tolerance: float = 0) -> Union[int, None]:
+    """
+    Determine the pivot column: the most negative value of the z-row
+    :param z: z-row of the tableau
+    :param tolerance: negative values down to -tolerance are round-off, not pivot candidates
+    :return: index of the column or [None] if all z-row values are above -tolerance
+    """
+    column = int(np.argmin(z))
+    return column if z[column] < -tolerance else None
+
+
+def pivot_row(
+        a: np.ndarray,
+        b: np.ndarray,
+        column: int,
+        tolerance: float,
+        basic: Union[list[int], None] = None,
+        upper: Union[list[float], None] = None
+) -> Union[int, None]:
+    """
+    Determine the pivot row with the minimum ratio test
+    :param a: the tableau
+    :param b: right hand side of the tableau
+    :param column: index of the pivot column
+    :param tolerance: values up to tolerance are round-off, not pivot candidates
+    :param basic: index of the basic variable of every row. If given, ties are broken towards the smallest one
+    :param upper: upper bound of the basic variable of every row. If given, negative values of the pivot column
+        are pivot candidates too, with the ratio to the upper bound
+    :return: index of the pivot row or [None] if no basic variable reaches a bound
+    """
+    values = a[:, column]
+    ratios = np.full(len(b), np.inf)
+    np.divide(np.maximum(b, 0), values, out=ratios, where=values > tolerance)  # Round-off can leave b slightly negative
+    if upper is not None:
+        np.divide(np.maximum(np.asarray(upper) - b, 0), -values, out=ratios, where=values < -tolerance)
+
+    minimum = np.min(ratios, initial=np.inf)
+    if not np.isfinite(minimum):
+        return None
+
+    ties = ratios == minimum
+    if basic is not None:
+        return int(np.argmin(np.where(ties, basic, np.iinfo(np.int64).max)))
+
+    # Ties (e.g. degenerate rows) are broken towards the largest pivot value,
+    # a small pivot value would blow the rounding error of its row up
+    return int(np.argmax(np.where(ties, np.abs(values), -np.inf)))
+
+
+def dual_pivot_row(b: np.ndarray, tolerance: float, upper: Union[list[float], None] = None) -> Union[int, None]:
+    """
+    Determine the pivot row of the dual Simplex method: the basic variable farthest outside of its bounds
+    :param b: right hand side of the tableau
+    :param tolerance: violations up to tolerance are treated as none
+    :param upper: upper bound of the basic variable of every row, if any has one
+    :return: index of the row or [None] if all values are within their bounds
+    """
+    violation = -b if upper is None else np.maximum(-b, b - np.asarray(upper))
+    row = int(np.argmax(violation))
+    return row if violation[row] > tolerance else None
+
+
+def dual_pivot_column(
+        a: np.ndarray,
+        z: np.ndarray,
+        row: int,
+        movable: Union[list[bool], None] = None,
+        tolerance: float = 0
+) -> Union[int, None]:
+    """
+    Determine the pivot column of the dual Simplex method with the minimum ratio test on the z-row
+    :param a: the tableau
+    :param z: z-row of the tableau
+    :param row: index of the pivot row
+    :param movable: whether every column may enter the basis. All of them if [None]
+    :param tolerance: values down to minus tolerance are round-off, not pivot candidates
+    :return: index of the pivot column or [None] if the pivot row has no negative values
+    """
+    values = a[row]
+    ratios = np.full(len(z), np.inf)
+    negative = values < -tolerance
+    np.divide(np.maximum(z, 0), -values, out=ratios, where=negative if movable is None else negative & np.asarray(movable))
+
+    # Ties are broken towards the largest pivot value, which keeps the rounding error small
+    column = int(np.lexsort((values, ratios))[0])
+    return column if np.isfinite(ratios[column]) else None
+
+
+def pivot(a: np.ndarray, b: np.ndarray, z: np.ndarray, row: int, column: int, eps: Union[int, None]) -> float:
+    """
+    Pivot the tableau in place on the cell [row][column], rounding to [eps] digits
+    like the list-based implementation does
+    :param a: the tableau
+    :param b: right hand side of the tableau
+    :param z: z-row of the tableau
+    :param row: index of the pivot row
+    :param column: index of the pivot column
+    :param eps: how many digits after the floating point to keep, [None] to not round
+    :return: the change of the objective function value
+    """
+    if eps is None:
+        return _pivot_floats(a, b, z, row, column)
+
+    k = a[row, column]
+    np.round(a[row] / k, eps, out=a[row])
+    b[row] = round(b[row] / k, eps)
+
+    # Rank-1 update of every other row: subtract the pivot row scaled by the pivot column value
+    m = np.round(a[:, column], eps)
+    m[row] = 0
+    for start, stop in blocks(a):
+        block = a[start:stop]
+        block -= np.outer(m[start:stop], a[row])
+        np.round(block, eps, out=block)
+    b -= m * b[row]
+    np.round(b, eps, out=b)
+
+    m = z[column]
+    z -= m * a[row]
+    np.round(z, eps, out=z)
+
+    return -m * b[row]
+
+
+def _pivot_floats(a: np.ndarray, b: np.ndarray, z: np.ndarray, row: int, column: int) -> float:
+    """
+    [pivot] without rounding: only the rows with a nonzero value in the pivot column are updated
+    """
+    k = a[row, column]
+    a[row] /= k
+    b[row] /= k
+    a[row, column] = 1
+
+    m = a[:, column].copy()
+    m[row] = 0
+    rows = np.flatnonzero(m)
+    step = max(1, BLOCK // max(a.shape[1], 1))
+    for start in range(0, len(rows), step):
+        block = rows[start:start + step]
+        a[block] -= np.outer(m[block], a[row])
+    a[rows, column] = 0
+    b[rows] -= m[rows] * b[row]
+
+    m = z[column]
+    z -= m * a[row]
+    z[column] = 0
+
+    return -m * b[row]
@@ -0,0 +1,331 @@
+# Presolve: shrink a model before solving it, and map the solution of the smaller model back
+
+from dataclasses import dataclass
+from time import perf_counter
+
+import numpy as np
+from scipy import sparse
+
+from lp_model import Model
+from simplex_solver import SimplexSolver
+
+
+@dataclass
+class PresolveStatistics:
+    """
+    What [Presolver.presolve] removed from a model
+    """
+
+    rows: tuple[int, int] = (0, 0)
+    """Number of constraints before and after presolve"""
+
+    columns: tuple[int, int] = (0, 0)
+    """Number of variables before and after presolve"""
+
+    nonzeros: tuple[int, int] = (0, 0)
+    """Number of nonzero coefficients before and after presolve"""
+
+    empty_rows: int = 0
+    """Constraints without coefficients"""
+
+    singleton_rows: int = 0
+    """Constraints with one coefficient, turned into bounds of their variable"""
+
+    duplicate_rows: int = 0
+    """Constraints that are multiples of another constraint, merged into it"""
+
+    redundant_rows: int = 0
+    """Constraints that the bounds of their variables always satisfy"""
+
+    fixed_columns: int = 0
+    """Variables with equal lower and upper bounds"""
+
+    empty_columns: int = 0
+    """Variables without coefficients in the constraints"""
+
+    dominated_columns: int = 0
+    """Variables fixed at a bound because moving away from it only tightens the constraints and does not pay off"""
+
+    tightened_bounds: int = 0
+    """Bounds of the variables tightened by singleton rows"""
+
+    passes: int = 0
+    """How many times the reductions were applied until nothing changed"""
+
+    time: float = 0.0
+    """Time spent in presolve in seconds"""
+
+    def __str__(self) -> str:
+        return "\n".join((
+            f"Rows: {self.rows[0]} -> {self.rows[1]}, columns: {self.columns[0]} -> {self.columns[1]}, "
+            f"nonzeros: {self.nonzeros[0]} -> {self.nonzeros[1]} in {self.passes} passes, {self.time:.3f} s",
+            f"Removed rows: {self.empty_rows} empty, {self.singleton_rows} singleton, "
+            f"{self.duplicate_rows} duplicate, {self.redundant_rows} redundant",
+            f"Removed columns: {self.fixed_columns} fixed, {self.empty_columns} empty, "
+            f"{self.dominated_columns} dominated. Tightened bounds: {self.tightened_bounds}",
+        ))
+
+
+class Presolver:
+    def __init__(self, model: Model, tolerance: float = 1e-9) -> None:
+        """
+        Construct a presolver of a model. Call [presolve] to get the smaller model and [postsolve]
+        to map its solution back to the variables of the original one
+
+        :param model: the model to shrink. It is not modified
+        :param tolerance: feasibility tolerance of bounds comparisons
+        """
+
+        self.model: Model = model
+        """The original model"""
+
+        self.tolerance: float = tolerance
+        """Feasibility tolerance of bounds comparisons"""
+
+        self.statistics: PresolveStatistics = PresolveStatistics()
+        """What the last [presolve] removed"""
+
+        self.kept_rows: np.ndarray = np.arange(model.a.shape[0])
+        """Indices of the original constraints left in the presolved model"""
+
+        self.kept_columns: np.ndarray = np.arange(model.a.shape[1])
+        """Indices of the original variables left in the presolved model"""
+
+        self.values: np.ndarray = np.zeros(model.a.shape[1])
+        """Values of the removed variables"""
+
+        self.is_infeasible = False
+        """Whether presolve found that the constraints have no feasible point"""
+
+        self.is_unbounded = False
+        """Whether presolve found an empty variable that improves the objective function without limit.
+        The objective function is unbounded if the presolved model, which fixes that variable, is feasible"""
+
+        self._row_lower = self._row_upper = self._lower = self._upper = None
+        self._row_active = self._column_active = None
+        self._offset = 0.0
+
+    def _cost(self) -> np.ndarray:
+        """
+        :return: coefficients of the objective function as if we were minimizing
+        """
+        return self.model.c if self.model.mode == SimplexSolver.Mode.MINIMIZE else -self.model.c
+
+    def _fix(self, a: sparse.csc_matrix, rows: np.ndarray, columns: np.ndarray, local: np.ndarray,
+             values: np.ndarray) -> None:
+        """
+        Remove variables at the given values, moving their terms to the bounds of the constraints
+        :param a: the active submatrix
+        :param rows: original indices of the active rows
+        :param columns: original indices of the active columns
+        :param local: indices of the removed variables in the active submatrix
+        :param values: values of the removed variables
+        """
+        shift = a[:, local] @ values
+        self._row_lower[rows] -= shift
+        self._row_upper[rows] -= shift
+        original = columns[local]
+        self._offset += float(self.model.c[original] @ values)
+        self.values[original] = values
+        self._column_active[original] = False
+
+    def _pass(self) -> bool:
+        """
+        Apply every reduction once to the active part of the model
+        :return: whether anything changed
+        """
+        statistics = self.statistics
+        tolerance = self.tolerance
+        changed = False
+
+        rows = np.flatnonzero(self._row_active)
+        columns = np.flatnonzero(self._column_active)
+
+        # Fixed variables
+        lower, upper = self._lower[columns], self._upper[columns]
+        if np.any(lower > upper + tolerance):
+            self.is_infeasible = True
+            return False
+        fixed = np.flatnonzero(upper - lower <= tolerance)
+        if len(fixed):
+            a = self.model.a[rows][:, columns].tocsc()
+            self._fix(a, rows, columns, fixed, lower[fixed])
+            statistics.fixed_columns += len(fixed)
+            changed = True
+            columns = np.flatnonzero(self._column_active)
+
+        a = self.model.a[rows][:, columns].tocsc()
+        lower, upper = self._lower[columns], self._upper[columns]
+        cost = self._cost()[columns]
+
+        # Empty columns go to the bound their cost prefers
+        empty = np.flatnonzero(np.diff(a.indptr) == 0)
+        if len(empty):
+            finite = np.where(np.isfinite(lower[empty]), lower[empty],
+                              np.where(np.isfinite(upper[empty]), upper[empty], 0.0))
+            values = np.where(cost[empty] > 0, lower[empty], np.where(cost[empty] < 0, upper[empty], finite))
+            # The objective function is unbounded only if the constraints are feasible, which the reductions
+            # of the rows and a solve of the rest decide: keep reducing with the variable at any finite value
+            if not np.all(np.isfinite(values)):
+                self.is_unbounded = True
+                values = np.where(np.isfinite(values), values, finite)
+            self._fix(a, rows, columns, empty, values)
+            statistics.empty_columns += len(empty)
+            changed = True
+            columns = np.flatnonzero(self._column_active)
+            a = self.model.a[rows][:, columns].tocsc()
+            lower, upper = self._lower[columns], self._upper[columns]
+            cost = self._cost()[columns]
+
+        a = a.tocsr()
+        row_lower, row_upper = self._row_lower[rows], self._row_upper[rows]
+        counts = np.diff(a.indptr)
+
+        # Empty rows
+        empty = counts == 0
+        if np.any(empty & ((row_lower > tolerance) | (row_upper < -tolerance))):
+            self.is_infeasible = True
+            return False
+        if np.any(empty):
+            self._row_active[rows[empty]] = False
+            statistics.empty_rows += int(np.count_nonzero(empty))
+            changed = True
+
+        # Singleton rows become bounds of their variable
+        singleton = np.flatnonzero(counts == 1)
+        if len(singleton):
+            entries = a.indptr[singleton]
+            local = a.indices[entries]
+            coefficient = a.data[entries]
+            bound_lower = np.where(coefficient > 0, row_lower[singleton], row_upper[singleton]) / coefficient
+            bound_upper = np.where(coefficient > 0, row_upper[singleton], row_lower[singleton]) / coefficient
+            new_lower, new_upper = lower.copy(), upper.copy()
+            np.maximum.at(new_lower, local, bound_lower)
+            np.minimum.at(new_upper, local, bound_upper)
+            statistics.tightened_bounds += int(np.count_nonzero(new_lower > lower) + np.count_nonzero(new_upper < upper))
+            self._lower[columns], self._upper[columns] = new_lower, new_upper
+            self._row_active[rows[singleton]] = False
+            statistics.singleton_rows += len(singleton)
+            return True  # The bounds changed, the next pass starts over with them
+
+        # Duplicate rows: scale every row by its first coefficient and merge rows with equal coefficients
+        kept: dict[tuple, int] = {}
+        for i in np.flatnonzero(counts > 1):
+            start, end = a.indptr[i], a.indptr[i + 1]
+            scale = a.data[start]
+            key = (a.indices[start:end].tobytes(), np.round(a.data[start:end] / scale, 12).tobytes())
+            bounds = (row_lower[i] / scale, row_upper[i] / scale) if scale > 0 else \
+                (row_upper[i] / scale, row_lower[i] / scale)
+            first = kept.get(key)
+            if first is None:
+                kept[key] = i
+                continue
+
+            first_scale = a.data[a.indptr[first]]
+            first_bounds = (row_lower[first] / first_scale, row_upper[first] / first_scale) if first_scale > 0 else \
+                (row_upper[first] / first_scale, row_lower[first] / first_scale)
+            merged = (max(bounds[0], first_bounds[0]), min(bounds[1], first_bounds[1]))
+            if first_scale > 0:
+                row_lower[first], row_upper[first] = merged[0] * first_scale, merged[1] * first_scale
+            else:
+                row_lower[first], row_upper[first] = merged[1] * first_scale, merged[0] * first_scale
+            self._row_active[rows[i]] = False
+            statistics.duplicate_rows += 1
+            changed = True
+        self._row_lower[rows], self._row_upper[rows] = row_lower, row_upper
+
+        # Redundant rows: the bounds of the variables keep the activity within the bounds of the row
+        active = self._row_active[rows]
+        positive, negative = a.maximum(0), a.minimum(0)
+        with np.errstate(invalid="ignore"):
+            minimum = positive @ lower + negative @ upper
+            maximum = positive @ upper + negative @ lower
+        # Infeasible rows: the activity cannot reach the bounds of the row, or merged duplicates crossed them
+        if np.any(active & ((minimum > row_upper + tolerance) | (maximum < row_lower - tolerance)
+                            | (row_lower > row_upper + tolerance))):
+            self.is_infeasible = True
+            return False
+        redundant = active & (counts > 1) & (minimum >= row_lower - tolerance) & (maximum <= row_upper + tolerance)
+        if np.any(redundant):
+            self._row_active[rows[redundant]] = False
+            statistics.redundant_rows += int(np.count_nonzero(redundant))
+            changed = True
+
+        # Dominated columns: if increasing a variable only tightens its rows and does not pay off,
+        # it can sit at its lower bound, and symmetrically at its upper bound
+        a = a[self._row_active[rows]].tocsc()
+        row_lower, row_upper = self._row_lower[rows[self._row_active[rows]]], self._row_upper[rows[self._row_active[rows]]]
+        has_lower, has_upper = np.isfinite(row_lower)[a.indices], np.isfinite(row_upper)[a.indices]
+        tightens = ((a.data > 0) & ~has_lower) | ((a.data < 0) & ~has_upper)
+        loosens = ((a.data > 0) & ~has_upper) | ((a.data < 0) & ~has_lower)
+        counts = np.diff(a.indptr)
+        column_of = np.repeat(np.arange(a.shape[1]), counts)
+        all_tighten = np.bincount(column_of, tightens, a.shape[1]) == counts
+        all_loosen = np.bincount(column_of, loosens, a.shape[1]) == counts
+
+        at_lower = (counts > 0) & all_tighten & (cost >= 0) & np.isfinite(lower)
+        at_upper = (counts > 0) & all_loosen & (cost <= 0) & np.isfinite(upper) & ~at_lower
+        dominated = np.flatnonzero(at_lower | at_upper)
+        if len(dominated):
+            self._fix(a, rows[self._row_active[rows]], columns, dominated,
+                      np.where(at_lower[dominated], lower[dominated], upper[dominated]))
+            statistics.dominated_columns += len(dominated)
+            changed = True
+
+        return changed
+
+    def presolve(self) -> Model:
+        """
+        Apply the reductions until nothing changes. Check [is_infeasible] and [is_unbounded] afterwards:
+        if the model is infeasible, the returned model is meaningless. If it is unbounded, the returned model
+        only tells whether the constraints are feasible
+        :return: the presolved model with the same objective function value at corresponding points
+        """
+        start = perf_counter()
+        model = self.model
+        m, n = model.a.shape
+        self.statistics = PresolveStatistics(rows=(m, m), columns=(n, n), nonzeros=(model.a.nnz, model.a.nnz))
+        self._row_lower, self._row_upper = model.row_lower.astype(float), model.row_upper.astype(float)
+        self._lower, self._upper = model.lower.astype(float), model.upper.astype(float)
+        self._row_active, self._column_active = np.ones(m, dtype=bool), np.ones(n, dtype=bool)
+        self._offset = model.objective_offset
+        self.values = np.zeros(n)
+        self.is_infeasible = self.is_unbounded = False
+
+        while not self.is_infeasible:
+            self.statistics.passes += 1
+            if not self._pass():
+                break
+        self.is_unbounded &= not self.is_infeasible
+
+        self.kept_rows = np.flatnonzero(self._row_active)
+        self.kept_columns = np.flatnonzero(self._column_active)
+        a = model.a[self.kept_rows][:, self.kept_columns].tocsr()
+        self.statistics.rows = (m, len(self.kept_rows))
+        self.statistics.columns = (n, len(self.kept_columns))
+        self.statistics.nonzeros = (model.a.nnz, a.nnz)
+        self.statistics.time = perf_counter() - start
+
+        return Model(
+            name=model.name,
+            mode=model.mode,
+            c=model.c[self.kept_columns],
+            a=a,
+            row_lower=self._row_lower[self.kept_rows],
+            row_upper=self._row_upper[self.kept_rows],
+            lower=self._lower[self.kept_columns],
+            upper=self._upper[self.kept_columns],
+            objective_offset=self._offset,
+            variable_names=[model.variable_names[j] for j in self.kept_columns] if model.variable_names else [],
+            row_names=[model.row_names[i] for i in self.kept_rows] if model.row_names else [],
+        )
+
+    def postsolve(self, x) -> np.ndarray:
+        """
+        Map a solution of the presolved model back to the variables of the original model
+        :param x: values of the variables of the presolved model
+        :return: values of the variables of the original model
+        """
+        values = self.values.copy()
+        values[self.kept_columns] = x
+        return values
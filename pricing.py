@@ -0,0 +1,222 @@
+# Pricing rules choosing the entering column of the Simplex method
+
+from typing import Union
+
+
+class PricingRule:
+    """
+    Chooses the entering column of every iteration of [SimplexSolver].
+    Subclasses override [select] and, if they keep state between iterations, [reset] and [update].
+    A rule object keeps the state of one solve, so do not share it between solvers
+    """
+
+    name = "pricing"
+    """Name of the rule in benchmarks and statistics"""
+
+    smallest_index_ties = False
+    """Whether the ratio test must break ties towards the smallest index of the leaving variable"""
+
+    def reset(self, solver) -> None:
+        """
+        Start over on the current tableau of [solver], e.g. after it was built or changed by the dual Simplex method
+        """
+
+    def select(self, solver) -> Union[int, None]:
+        """
+        :return: index of the entering column or [None] if the z-row of [solver] has no negative values
+            beyond the round-off tolerance
+        """
+        raise NotImplementedError
+
+    def update(self, solver, row: int, column: int) -> None:
+        """
+        Called before [solver] pivots on the cell [row][column]
+        """
+
+
+def _z_row(solver):
+    import numpy as np
+
+    return np.asarray(solver.z, dtype=float)
+
+
+def _tolerance(solver) -> float:
+    """
+    :return: the largest absolute z-row value of [solver] that is round-off rather than an improving column.
+        Entering such a column finds no pivot row, and the solver would report an unbounded objective function
+    """
+    return solver.numerics.optimality_tolerance if solver.numerics is not None else 10 ** (1 - solver.eps)
+
+
+def _leaving_column(solver, row: int) -> int:
+    """
+    :return: index of the tableau column of the variable basic in [row]
+    """
+    return solver.base[row]
+
+
+class Dantzig(PricingRule):
+    """
+    The most negative value of the z-row
+    """
+
+    name = "dantzig"
+
+    def select(self, solver) -> Union[int, None]:
+        if isinstance(solver.z, list):  # The list backend does not need NumPy
+            column = min(range(len(solver.z)), key=solver.z.__getitem__)
+            return column if solver.z[column] < -_tolerance(solver) else None
+
+        import numpy_tableau
+
+        return numpy_tableau.pivot_column(solver.z, _tolerance(solver))
+
+
+class Bland(PricingRule):
+    """
+    Bland's rule: the negative z-row value with the smallest index, and the leaving variable with the smallest index
+    among the ratio test ties. Slow, but never cycles
+    """
+
+    name = "bland"
+    smallest_index_ties = True
+
+    def select(self, solver) -> Union[int, None]:
+        tolerance = _tolerance(solver)
+        return next((j for j, value in enumerate(solver.z) if value < -tolerance), None)
+
+
+class SteepestEdge(PricingRule):
+    """
+    The most negative z-row value per unit length of the edge it moves along: z_j / ||(a_j, 1)||.
+    The tableau holds every column, so the lengths are exact
+    """
+
+    name = "steepest-edge"
+
+    def select(self, solver) -> Union[int, None]:
+        import numpy as np
+
+        z = _z_row(solver)
+        candidates = np.flatnonzero(z < -_tolerance(solver))
+        if not len(candidates):
+            return None
+
+        a = np.asarray(solver.a, dtype=float)[:, candidates]
+        norms = 1 + np.einsum("ij,ij->j", a, a)
+        return int(candidates[np.argmax(z[candidates] ** 2 / norms)])
+
+
+class Devex(PricingRule):
+    name = "devex"
+
+    def __init__(self) -> None:
+        """
+        Forrest and Goldfarb's Devex rule: steepest edge with approximate reference weights
+        updated from the pivot row only
+        """
+
+        self.weights = None
+        """Reference weight of every column"""
+
+    def reset(self, solver) -> None:
+        import numpy as np
+
+        self.weights = np.ones(len(solver.z))
+
+    def select(self, solver) -> Union[int, None]:
+        import numpy as np
+
+        z = _z_row(solver)
+        candidates = np.flatnonzero(z < -_tolerance(solver))
+        if not len(candidates):
+            return None
+        return int(candidates[np.argmax(z[candidates] ** 2 / self.weights[candidates])])
+
+    def update(self, solver, row: int, column: int) -> None:
+        import numpy as np
+
+        pivot_row = np.asarray(solver.a[row], dtype=float)
+        ratio = pivot_row / pivot_row[column]
+        weight = self.weights[column]
+        np.maximum(self.weights, ratio ** 2 * weight, out=self.weights)
+        self.weights[_leaving_column(solver, row)] = max(weight / pivot_row[column] ** 2, 1.0)
+
+
+class PartialPricing(PricingRule):
+    name = "partial"
+
+    def __init__(self, segments: int = 8) -> None:
+        """
+        Price one segment of the z-row per iteration, starting where the last iteration stopped,
+        and take the most negative value of the first segment that has one
+        :param segments: how many segments the z-row is split into
+        """
+
+        self.segments: int = segments
+        """How many segments the z-row is split into"""
+
+        self.start = 0
+        """Column the next pricing starts at"""
+
+    def reset(self, solver) -> None:
+        self.start = 0
+
+    def select(self, solver) -> Union[int, None]:
+        import numpy as np
+
+        z = _z_row(solver)
+        n = len(z)
+        size = max(1, -(-n // self.segments))
+        tolerance = _tolerance(solver)
+        for _ in range(self.segments + 1):
+            segment = z[self.start:self.start + size]
+            column = int(np.argmin(segment)) if len(segment) else 0
+            start = self.start
+            self.start = start + size if start + size < n else 0
+            if len(segment) and segment[column] < -tolerance:
+                return start + column
+        return None
+
+
+class MultiplePricing(PricingRule):
+    name = "multiple"
+
+    def __init__(self, candidates: int = 8) -> None:
+        """
+        Price the whole z-row once, keep the most negative columns and choose among only them
+        while any of them still improves the objective function
+        :param candidates: how many columns to keep
+        """
+
+        self.candidates: int = candidates
+        """How many columns to keep"""
+
+        self.columns = None
+        """Columns kept by the last full pricing"""
+
+    def reset(self, solver) -> None:
+        self.columns = None
+
+    def select(self, solver) -> Union[int, None]:
+        import numpy as np
+
+        z = _z_row(solver)
+        tolerance = _tolerance(solver)
+        if self.columns is not None:
+            values = z[self.columns]
+            best = int(np.argmin(values))
+            if values[best] < -tolerance:
+                return int(self.columns[best])
+
+        negative = np.flatnonzero(z < -tolerance)
+        if not len(negative):
+            return None
+        order = np.argsort(z[negative], kind="stable")[:self.candidates]
+        self.columns = negative[order]
+        return int(self.columns[0])
+
+
+RULES: dict[str, type] = {rule.name: rule for rule in (Dantzig, Devex, SteepestEdge, PartialPricing,
+                                                        MultiplePricing, Bland)}
+"""Pricing rules by name"""
@@ -0,0 +1,308 @@
+# Mehrotra predictor-corrector primal-dual Interior-Point solver
+
+from time import perf_counter
+from typing import Union
+
+import numpy as np
+from numpy.linalg import norm
+
+import normal_equations
+from interior_point_solver import InteriorPointSolver
+from simplex_solver import function_from_coefficients
+from solver_result import SolverResult, Verbosity
+
+
+STALLED: float = 0.01
+"""Residual that went down by less than this factor from the starting point does not converge"""
+
+
+class PrimalDualSolver:
+    Mode = InteriorPointSolver.Mode
+
+    def __init__(
+            self,
+            mode: Mode,
+            c: list[float],
+            a: list[list[float]],
+            b: list[float],
+            eps: int,
+            max_iterations: int = 100,
+            verbosity: Verbosity = Verbosity.RESULT
+    ) -> None:
+        """
+        Construct a primal-dual Interior-Point problem solver.
+        Takes the same problem as [InteriorPointSolver]: maximize or minimize c * x subject to a * x = b, x >= 0,
+        but does not need a starting point
+
+        :param mode: one of [Mode.MAXIMIZE] or [Mode.MINIMIZE]
+        :param c: coefficients of the objective function
+        :param a: matrix of the coefficients of the constraints. Nested lists, a NumPy array or a scipy sparse matrix
+        :param b: right hand side of the constraints equations
+        :param eps: solution accuracy. How many digits after the floating point to consider
+        :param max_iterations: how many iterations to do before giving up
+        :param verbosity: what [solve] prints. [run] never prints
+        """
+
+        self.mode: PrimalDualSolver.Mode = mode
+        """Mode of this problem solver"""
+
+        self.actual_coefficients: list[float] = c
+        """Coefficients of the objective function regardless of whether we are maximizing or minimizing"""
+
+        self.c: np.ndarray = np.array(c if mode == PrimalDualSolver.Mode.MAXIMIZE else [-j for j in c], float)
+        """Coefficients of the objective function. Inverted if we are minimizing"""
+
+        self.a = normal_equations.as_matrix(a)
+        """Matrix of the coefficients of the constraints"""
+
+        self.b: np.ndarray = np.asarray(b, dtype=float)
+        """Right hand side of the constraints equations"""
+
+        self.eps: int = eps
+        """Solution accuracy"""
+
+        self.tolerance: float = 10 ** -(eps + 2)
+        """Relative duality gap and infeasibility at which the iterations stop"""
+
+        self.max_iterations: int = max_iterations
+        """How many iterations to do before giving up"""
+
+        self.iterations = 0
+        """How many iterations the last solve took"""
+
+        self.solution = 0
+        """Optimal solution for this problem"""
+
+        self.dual_values: list[float] = []
+        """Shadow prices of the constraints: change of the optimal solution per unit increase of b"""
+
+        self.reduced_costs: list[float] = []
+        """Dual slacks of the variables"""
+
+        self.is_unbounded = False
+        """Whether the objective function is unbounded"""
+
+        self.is_infeasible = False
+        """Whether the constraints have no feasible point"""
+
+        self.is_not_applicable = False
+        """Whether the normal equations of the starting point are singular, e.g. the constraints are linearly
+        dependent, or the iterates converged to a feasible point without closing the duality gap"""
+
+        self.verbosity: Verbosity = verbosity
+        """What [solve] prints"""
+
+        self.time = 0.0
+        """Wall time of the last solve, in seconds"""
+
+    def print_problem(self) -> None:
+        """
+        Print the problem of this solver
+        """
+        print(f"{self.mode} z = {function_from_coefficients(list(self.actual_coefficients))}")
+        print("subject to the constraints:")
+        rows = self.a.toarray() if normal_equations.is_sparse(self.a) else self.a
+        print("\n".join(f"{function_from_coefficients(list(cs))} = {rhs}" for cs, rhs in zip(rows, self.b)))
+
+    def _newton_direction(
+            self,
+            factorization: normal_equations.Factorization,
+            x: np.ndarray,
+            s: np.ndarray,
+            rb: np.ndarray,
+            rc: np.ndarray,
+            rxs: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Solve the Newton system a * dx = -rb, a^T * dy + ds = -rc, s * dx + x * ds = -rxs
+        through the factorized normal equations a * (x / s) * a^T
+        :return: a tuple (dx, dy, ds)
+        """
+        d = x / s
+        dy = factorization.solve(-rb + self.a @ (rxs / s - d * rc))
+        ds = -rc - self.a.T @ dy
+        dx = -(rxs + x * ds) / s
+        return dx, dy, ds
+
+    @staticmethod
+    def _max_step(v: np.ndarray, dv: np.ndarray) -> float:
+        """
+        Ratio test to the boundary of the positive orthant
+        :return: the largest step in [0, 1] such that v + step * dv >= 0
+        """
+        negative = dv < 0
+        if not np.any(negative):
+            return 1.0
+        return min(1.0, float(np.min(-v[negative] / dv[negative])))
+
+    def _starting_point(self, cost: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Mehrotra's starting point heuristic: least squares solutions of the primal and dual equality constraints
+        shifted into the positive orthant
+        :param cost: coefficients of the minimized objective function
+        :return: a tuple (x, y, s)
+        """
+        factorization = normal_equations.Factorization(normal_equations.assemble(self.a, np.ones(len(cost))))
+        x = self.a.T @ factorization.solve(self.b)
+        y = factorization.solve(self.a @ cost)
+        s = cost - self.a.T @ y
+
+        x += max(-1.5 * np.min(x), 0)
+        s += max(-1.5 * np.min(s), 0)
+
+        xs = max(float(x @ s), 1.0)  # Both are zero when the least squares solutions are already optimal
+        x += 0.5 * xs / max(float(np.sum(s)), 1.0)
+        s += 0.5 * xs / max(float(np.sum(x)), 1.0)
+        return x, y, s
+
+    def calculate(self) -> Union[np.ndarray, None]:
+        """
+        Run the predictor-corrector iterations
+        :return: the optimal x or [None] if the problem is unbounded, infeasible or the method is not applicable
+        """
+        cost = -self.c  # The iterations minimize
+        n = len(cost)
+        self.iterations = 0
+        self.is_unbounded = self.is_infeasible = self.is_not_applicable = False
+
+        try:
+            x, y, s = self._starting_point(cost)
+        except np.linalg.LinAlgError:
+            self.is_not_applicable = True
+            return None
+
+        start = best = None
+        for self.iterations in range(1, self.max_iterations + 1):
+            rb = self.a @ x - self.b
+            rc = self.a.T @ y + s - cost
+            mu = float(x @ s) / n
+
+            residuals = norm(rb) / (1 + norm(self.b)), norm(rc) / (1 + norm(cost))
+            start = start or residuals
+            best = residuals if best is None else (min(best[0], residuals[0]), min(best[1], residuals[1]))
+            primal_objective = float(cost @ x)
+            gap = abs(primal_objective - float(self.b @ y)) / (1 + abs(primal_objective))
+            if residuals[0] < self.tolerance and residuals[1] < self.tolerance and gap < self.tolerance:
+                self.dual_values = y
+                self.reduced_costs = s
+                return x
+
+            if max(norm(x), norm(y)) > 1 / self.tolerance ** 2:  # The iterates diverge along a ray
+                break
+
+            try:
+                factorization = normal_equations.Factorization(normal_equations.assemble(self.a, x / s))
+            except np.linalg.LinAlgError:  # Some of x / s went to 0 or infinity, as the iterates do when they diverge
+                break
+
+            # Predictor: pure Newton (affine scaling) direction
+            dx, dy, ds = self._newton_direction(factorization, x, s, rb, rc, x * s)
+            step_primal = self._max_step(x, dx)
+            step_dual = self._max_step(s, ds)
+            mu_affine = float((x + step_primal * dx) @ (s + step_dual * ds)) / n
+            sigma = (mu_affine / mu) ** 3
+
+            # Corrector: centering and second order term, same factorization
+            dx, dy, ds = self._newton_direction(factorization, x, s, rb, rc, x * s + dx * ds - sigma * mu)
+            step_primal = min(1.0, 0.99 * self._max_step(x, dx))
+            step_dual = min(1.0, 0.99 * self._max_step(s, ds))
+
+            x = x + step_primal * dx
+            y = y + step_dual * dy
+            s = s + step_dual * ds
+
+        self._diagnose(start, best)
+        return None
+
+    def _diagnose(self, start: tuple[float, float], best: tuple[float, float]) -> None:
+        """
+        Tell why the iterations stopped without converging by the residual that does not go to 0.
+        The primal residual stalls if the constraints are infeasible: the dual iterates diverge along a certificate
+        of infeasibility instead. The dual residual stalls if the objective function is unbounded:
+        the primal iterates diverge along an improving ray. The residuals of diverging iterates are mostly
+        round-off, so the smallest ones of the whole run count
+        :param start: relative primal and dual residuals of the starting point
+        :param best: smallest relative primal and dual residuals of all iterates
+        """
+        if max(best) < self.tolerance:  # Feasible, but the duality gap does not close in time
+            self.is_not_applicable = True
+            return
+
+        primal, dual = (residual / max(initial, self.tolerance) for residual, initial in zip(best, start))
+        # If both stall, neither problem is feasible: the constraints are infeasible whatever the objective function
+        if primal >= min(dual, STALLED):
+            self.is_infeasible = True
+        else:
+            self.is_unbounded = True
+
+    def _solve(self) -> Union[tuple[float, list[float]], None]:
+        """
+        Solve the problem in this solver without printing anything
+        :return: a tuple (solution, X*) or [None] in special cases
+        """
+        start = perf_counter()
+        x = self.calculate()
+        self.time = perf_counter() - start
+
+        if x is None:
+            return None
+
+        x = [round(float(i), self.eps) for i in x]
+        self.solution = round(float(self.c @ x), self.eps)
+        if self.mode == PrimalDualSolver.Mode.MINIMIZE:  # Flip the solution in case we were minimizing
+            self.solution *= -1
+
+        # y prices the minimized -c; flip them to price the original objective
+        sign = -1 if self.mode == PrimalDualSolver.Mode.MAXIMIZE else 1
+        self.dual_values = [round(sign * float(i), self.eps) for i in self.dual_values]
+        self.reduced_costs = [round(float(i), self.eps) for i in self.reduced_costs]
+
+        return self.solution, x
+
+    def run(self) -> SolverResult:
+        """
+        Solve the problem in this solver without printing anything
+        :return: the status, the solution, X*, the dual values and the statistics of the solve
+        """
+        result = self._solve()
+        if result is not None:
+            status = SolverResult.Status.OPTIMAL
+        elif self.is_unbounded:
+            status = SolverResult.Status.UNBOUNDED
+        elif self.is_infeasible:
+            status = SolverResult.Status.INFEASIBLE
+        else:
+            status = SolverResult.Status.NOT_APPLICABLE
+        return SolverResult(
+            status=status,
+            objective=None if result is None else result[0],
+            x=None if result is None else result[1],
+            duals=None if result is None else self.dual_values,
+            iterations=self.iterations,
+            time=self.time
+        )
+
+    def solve(self) -> Union[tuple[float, list[float]], None]:
+        """
+        Solve the problem in this solver and print the solution, X* and the dual values,
+        or print "Unbounded", "The problem does not have solution!" or "The method is not applicable!",
+        as far as [verbosity] asks for
+        :return: a tuple (solution, X*) or [None] in special cases
+        """
+        if self.verbosity >= Verbosity.PROBLEM:
+            self.print_problem()
+        result = self._solve()
+        if self.verbosity < Verbosity.RESULT:
+            return result
+
+        if result is not None:
+            print("X: ", result[1])
+            print("Solution:", result[0])
+            print("Dual values:", self.dual_values)
+        elif self.is_unbounded:
+            print("Unbounded")
+        elif self.is_infeasible:
+            print("The problem does not have solution!")
+        else:
+            print("The method is not applicable!")
+        return result
@@ -0,0 +1,287 @@
+# Revised Simplex method solver keeping an LU factorization of the basis
+
+from time import perf_counter
+from typing import Union
+
+import numpy as np
+from scipy import sparse
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import splu
+
+from simplex_solver import SimplexSolver, function_from_coefficients
+from solver_result import SolverResult, Verbosity
+
+
+class RevisedSimplexSolver:
+    Mode = SimplexSolver.Mode
+
+    def __init__(
+            self,
+            mode: Mode,
+            c: list[float],
+            a: list[list[float]],
+            b: list[float],
+            eps: int,
+            refactorization_period: int = 50,
+            verbosity: Verbosity = Verbosity.RESULT
+    ) -> None:
+        """
+        Construct a Revised Simplex method problem solver.
+        Takes the same problem as [SimplexSolver]: maximize or minimize c * x subject to a * x <= b, x >= 0.
+        The solve starts from the basis of slack variables, so x = 0 must be feasible: b >= 0
+
+        :param mode: one of [Mode.MAXIMIZE] or [Mode.MINIMIZE]
+        :param c: coefficients of the objective function
+        :param a: matrix of the coefficients of the constraints. Nested lists, a NumPy array or a scipy sparse matrix.
+            A sparse matrix is kept sparse: columns are priced and the basis is factorized in CSC format
+        :param b: right hand side of the constraints equations
+        :param eps: solution accuracy. How many digits after the floating point to consider
+        :param refactorization_period: how many eta updates to apply before factorizing the basis from scratch
+        :param verbosity: what [solve] prints. [run] never prints
+        :raises ValueError: if b has a negative value. There is no Phase I, use [SimplexSolver] for such problems
+        """
+        if any(value < 0 for value in b):
+            raise ValueError("the revised Simplex solver needs a nonnegative right hand side, x = 0 must be feasible")
+
+        self.mode: RevisedSimplexSolver.Mode = mode
+        """Mode of this problem solver"""
+
+        self.actual_coefficients: list[float] = c
+        """Coefficients of the objective function regardless of whether we are maximizing or minimizing"""
+
+        self.c: np.ndarray = np.array(c if mode == RevisedSimplexSolver.Mode.MAXIMIZE else [-j for j in c], float)
+        """Coefficients of the objective function. Inverted if we are minimizing"""
+
+        self.a = sparse.csc_matrix(a, dtype=float) if sparse.issparse(a) else np.asarray(a, dtype=float)
+        """Matrix of the coefficients of the constraints. Never modified, columns are priced against it"""
+
+        self.b: np.ndarray = np.asarray(b, dtype=float)
+        """Right hand side of the constraints equations"""
+
+        self.eps: int = eps
+        """Solution accuracy"""
+
+        self.refactorization_period: int = refactorization_period
+        """How many eta updates to apply before factorizing the basis from scratch"""
+
+        self.base: list[int] = []
+        """Indices of basic variables on this step. Indices starting from len(c) are slack variables"""
+
+        self.x_base: np.ndarray = np.zeros(0)
+        """Values of the basic variables on this step"""
+
+        self.solution = 0
+        """Optimal solution for this problem"""
+
+        self.dual_values: list[float] = []
+        """Shadow prices of the constraints: change of the optimal solution per unit increase of b"""
+
+        self.is_unbounded = False
+        """Whether the objective function is unbounded"""
+
+        self.verbosity: Verbosity = verbosity
+        """What [solve] prints"""
+
+        self.iterations = 0
+        """How many iterations the last solve took"""
+
+        self.time = 0.0
+        """Wall time of the last solve, in seconds"""
+
+        self._lu = None
+        """LU factorization of the basis at the last refactorization. SuperLU object if [a] is sparse"""
+
+        self._etas: list[tuple[int, np.ndarray]] = []
+        """Eta file: (pivot row, entering column in terms of the previous basis) for every pivot since refactorization"""
+
+        self._extended = None
+        """Sparse constraints matrix extended with the slack columns, built on the first sparse refactorization"""
+
+    def print_problem(self) -> None:
+        """
+        Print the simplex problem of this solver
+        """
+        print(f"{self.mode} z = {function_from_coefficients(self.actual_coefficients)}")
+        print("subject to the constraints:")
+        rows = self.a.toarray() if sparse.issparse(self.a) else self.a
+        print("\n".join(f"{function_from_coefficients(list(cs))} <= {rhs}" for cs, rhs in zip(rows, self.b)))
+
+    def _column(self, j: int) -> np.ndarray:
+        """
+        Get a column of the constraints matrix extended with the slack variables
+        :param j: index of the variable
+        :return: the column of the variable
+        """
+        column = np.zeros(len(self.b))
+        if j >= len(self.c):
+            column[j - len(self.c)] = 1
+        elif sparse.issparse(self.a):
+            start, end = self.a.indptr[j], self.a.indptr[j + 1]
+            column[self.a.indices[start:end]] = self.a.data[start:end]
+        else:
+            column[:] = self.a[:, j]
+        return column
+
+    def _factorize(self) -> None:
+        """
+        Factorize the current basis from scratch and clear the eta file
+        """
+        if sparse.issparse(self.a):
+            if self._extended is None:
+                self._extended = sparse.hstack((self.a, sparse.identity(len(self.b))), format="csc")
+            self._lu = splu(self._extended[:, self.base])
+        else:
+            self._lu = lu_factor(np.column_stack([self._column(j) for j in self.base]))
+        self._etas.clear()
+        self.x_base = self._solve_basis(self.b)
+
+    def _solve_basis(self, v: np.ndarray, transposed: bool = False) -> np.ndarray:
+        """
+        Solve a system with the basis at the last refactorization
+        :param v: right hand side
+        :param transposed: whether to solve with the transposed basis
+        :return: the solution
+        """
+        if sparse.issparse(self.a):
+            return self._lu.solve(v, trans="T" if transposed else "N")
+        return lu_solve(self._lu, v, trans=1 if transposed else 0)
+
+    def _ftran(self, v: np.ndarray) -> np.ndarray:
+        """
+        Solve B * d = v for the current basis B
+        :param v: right hand side
+        :return: the solution d
+        """
+        d = self._solve_basis(v)
+        for row, w in self._etas:
+            t = d[row] / w[row]
+            d -= t * w
+            d[row] = t
+        return d
+
+    def _btran(self, v: np.ndarray) -> np.ndarray:
+        """
+        Solve y * B = v for the current basis B
+        :param v: right hand side
+        :return: the solution y
+        """
+        u = v.copy()
+        for row, w in reversed(self._etas):
+            u[row] = (u[row] - (u @ w - u[row] * w[row])) / w[row]
+        return self._solve_basis(u, transposed=True)
+
+    def _reduced_costs(self) -> np.ndarray:
+        """
+        Price every column against the original constraints matrix
+        :return: reduced costs of all variables, slack variables included
+        """
+        cost = np.concatenate((self.c, np.zeros(len(self.b))))
+        y = self._btran(cost[self.base])
+
+        reduced = np.concatenate((self.c - self.a.T @ y, -y))
+        reduced[self.base] = 0
+        return reduced
+
+    def _step(self) -> bool:
+        """
+        Perform one iteration of the Revised Simplex method
+        :return: whether to continue iterating. [False] if this was the last step
+        """
+        tolerance = 10 ** -self.eps
+
+        reduced = self._reduced_costs()
+        entering = int(np.argmax(reduced))
+        if reduced[entering] <= tolerance:  # No column improves the objective function, we are done
+            return False
+
+        w = self._ftran(self._column(entering))
+        ratios = np.full(len(w), np.inf)
+        np.divide(self.x_base, w, out=ratios, where=w > tolerance)
+
+        leaving = int(np.argmin(ratios))
+        if not np.isfinite(ratios[leaving]):  # Nothing bounds the entering variable
+            self.is_unbounded = True
+            return False
+
+        self.iterations += 1
+        theta = ratios[leaving]
+        self.x_base -= theta * w
+        self.x_base[leaving] = theta
+        self.base[leaving] = entering
+
+        self._etas.append((leaving, w))
+        if len(self._etas) >= self.refactorization_period:
+            self._factorize()
+
+        return True
+
+    def _solve(self) -> Union[tuple[float, list[float]], None]:
+        """
+        Solve the problem in this solver without printing anything
+        :return: a tuple (solution, X*) or [None] if the objective function is unbounded
+        """
+        start = perf_counter()
+        self.iterations = 0
+        self.is_unbounded = False
+
+        # Start from the basis of slack variables
+        self.base = list(range(len(self.c), len(self.c) + len(self.b)))
+        self._factorize()
+        while self._step():
+            pass
+
+        self.time = perf_counter() - start
+        if self.is_unbounded:
+            return None
+
+        x = [0.0] * len(self.c)
+        for i, j in enumerate(self.base):
+            if j < len(self.c):
+                x[j] = round(float(self.x_base[i]), self.eps)
+
+        self.solution = round(float(self.c @ x), self.eps)
+        sign = 1
+        if self.mode == RevisedSimplexSolver.Mode.MINIMIZE:  # Flip the solution in case we were minimizing
+            self.solution *= -1
+            sign = -1
+
+        # y = c_B * B^-1 prices the constraints
+        y = self._btran(np.concatenate((self.c, np.zeros(len(self.b))))[self.base])
+        self.dual_values = [round(sign * float(i), self.eps) + 0.0 for i in y]  # Adding 0.0 turns -0.0 into 0.0
+
+        return self.solution, x
+
+    def run(self) -> SolverResult:
+        """
+        Solve the problem in this solver without printing anything
+        :return: the status, the solution, X*, the dual values and the statistics of the solve
+        """
+        result = self._solve()
+        return SolverResult(
+            status=SolverResult.Status.UNBOUNDED if result is None else SolverResult.Status.OPTIMAL,
+            objective=None if result is None else result[0],
+            x=None if result is None else result[1],
+            duals=None if result is None else self.dual_values,
+            iterations=self.iterations,
+            time=self.time
+        )
+
+    def solve(self) -> Union[tuple[float, list[float]], None]:
+        """
+        Solve the problem in this solver and print the solution and X*,
+        or "Unbounded" if the objective function is unbounded,
+        and the problem before that, as far as [verbosity] asks for
+        :return: a tuple (solution, X*) or [None] if the objective function is unbounded
+        """
+        if self.verbosity >= Verbosity.PROBLEM:
+            self.print_problem()
+        result = self._solve()
+        if self.verbosity < Verbosity.RESULT:
+            return result
+
+        if result is not None:
+            print("Solution: ", result[0])
+            print("X* = ", result[1])
+        else:
+            print("Unbounded")
+        return result
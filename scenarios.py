@@ -0,0 +1,221 @@
+# Solve one constraint matrix against many right hand sides or objective functions, warm-starting from neighbours
+
+from collections import OrderedDict
+from typing import Union
+
+import numpy as np
+
+import normal_equations
+from interior_point_solver import InteriorPointSolver
+from simplex_solver import SimplexSolver
+from solver_result import SolverResult
+
+
+def scenario_order(vectors: np.ndarray) -> tuple[list[int], list[Union[int, None]]]:
+    """
+    Order scenarios so that every one of them follows a solved scenario close to it. Prim's algorithm builds
+    the minimum spanning tree of the Euclidean distances from the scenario closest to the mean, which attaches
+    every scenario to its nearest scenario already in the tree, and the order visits the tree depth first
+    :param vectors: k x d data of the scenarios
+    :return: a tuple (order of the scenarios, parent of every scenario), the parent of the first one is [None]
+    """
+    k = len(vectors)
+    if not k:
+        return [], []
+    root = int(np.argmin(np.linalg.norm(vectors - vectors.mean(axis=0), axis=1)))
+    parents: list[Union[int, None]] = [None] * k
+    children: list[list[int]] = [[] for _ in range(k)]
+    distance = np.linalg.norm(vectors - vectors[root], axis=1)
+    nearest = np.full(k, root)
+    in_tree = np.zeros(k, dtype=bool)
+    in_tree[root] = True
+    for _ in range(k - 1):
+        i = int(np.argmin(np.where(in_tree, np.inf, distance)))
+        in_tree[i] = True
+        parents[i] = int(nearest[i])
+        children[parents[i]].append(i)
+        closer = np.linalg.norm(vectors - vectors[i], axis=1) < distance
+        distance[closer] = np.linalg.norm(vectors[closer] - vectors[i], axis=1)
+        nearest[closer] = i
+
+    order, stack = [], [root]
+    while stack:
+        i = stack.pop()
+        order.append(i)
+        stack.extend(reversed(children[i]))  # The nearest child first
+    return order, parents
+
+
+class ScenarioSolver:
+    def __init__(
+            self,
+            mode: SimplexSolver.Mode,
+            c: Union[list[float], list[list[float]]],
+            a: list[list[float]],
+            b: Union[list[float], list[list[float]]],
+            eps: int,
+            keep: int = 8
+    ) -> None:
+        """
+        Solve k scenarios of one problem that share the matrix of the constraints: a block of right hand sides,
+        a block of objective functions, or both. The scenarios are solved in [scenario_order], and every one of them
+        starts from the final tableau ([SimplexSolver]) or the initial point ([InteriorPointSolver])
+        of its nearest solved scenario instead of building the standard form and running Phase I again
+
+        :param mode: one of [SimplexSolver.Mode.MAXIMIZE] or [SimplexSolver.Mode.MINIMIZE], the same for all scenarios
+        :param c: coefficients of the objective functions, n or k x n
+        :param a: matrix of the coefficients of the constraints. Nested lists, a NumPy array or a scipy sparse matrix
+        :param b: right hand sides of the constraints, m or k x m
+        :param eps: solution accuracy. How many digits after the floating point to consider
+        :param keep: how many tableaus of solved scenarios to keep for their further neighbours. A scenario whose
+            nearest neighbour's tableau was dropped starts from the tableau of the scenario solved before it
+        """
+
+        c, b = np.asarray(c, dtype=float), np.asarray(b, dtype=float)
+        k = max(len(c) if c.ndim == 2 else 1, len(b) if b.ndim == 2 else 1)
+        if c.ndim == 2 and b.ndim == 2 and len(c) != len(b):
+            raise ValueError(f"{len(c)} objective functions for {len(b)} right hand sides")
+
+        self.mode: SimplexSolver.Mode = mode
+        """Whether to maximize or minimize"""
+
+        self.c: np.ndarray = np.broadcast_to(c, (k, c.shape[-1]))
+        """Coefficients of the objective functions, k x n"""
+
+        self.a = a
+        """Matrix of the coefficients of the constraints"""
+
+        self.b: np.ndarray = np.broadcast_to(b, (k, b.shape[-1]))
+        """Right hand sides of the constraints, k x m"""
+
+        self.eps: int = eps
+        """Solution accuracy"""
+
+        self.keep: int = keep
+        """How many tableaus of solved scenarios to keep for their further neighbours"""
+
+        # Every varying block is divided by its typical norm, so that neither dominates the distances
+        blocks = [block / max(float(np.linalg.norm(block)) / np.sqrt(k), 1e-12)
+                  for block in (c, b) if block.ndim == 2]
+        order, parents = scenario_order(np.hstack(blocks) if blocks else np.zeros((k, 0)))
+
+        self.order: list[int] = order
+        """Order in which the scenarios are solved"""
+
+        self.parents: list[Union[int, None]] = parents
+        """Nearest solved scenario of every scenario, [None] for the first one"""
+
+        self.warm_starts = 0
+        """Scenarios of the last solve that started from the tableau or the point of another scenario"""
+
+        self.restores = 0
+        """Scenarios of the last solve that started from a kept tableau rather than the one solved right before"""
+
+    def simplex(
+            self,
+            constraints: Union[list[SimplexSolver.Constraint], None] = None,
+            lower: Union[list[float], None] = None,
+            upper: Union[list[float], None] = None,
+            **options
+    ) -> list[SolverResult]:
+        """
+        Solve all scenarios with one [SimplexSolver]: the first one from scratch, every further one
+        with [SimplexSolver.update_rhs], [SimplexSolver.update_objective] and [SimplexSolver.rerun]
+        from the tableau of its nearest solved scenario
+        :param constraints: kind of every constraint, see [SimplexSolver]
+        :param lower: lower bounds of the variables, see [SimplexSolver]
+        :param upper: upper bounds of the variables, see [SimplexSolver]
+        :param options: other arguments of [SimplexSolver], e.g. [backend] or [numerics]
+        :return: the result of every scenario, in the order of the scenarios
+        """
+        self.warm_starts = self.restores = 0
+        results: list[Union[SolverResult, None]] = [None] * len(self.order)
+        remaining = self._children()
+        tableaus: OrderedDict[int, dict] = OrderedDict()
+        solver, previous = None, None
+        for i in self.order:
+            c, b = list(self.c[i]), list(self.b[i])
+            parent = self.parents[i]
+            if solver is None:
+                solver = SimplexSolver(self.mode, c, self.a, b, self.eps, constraints=constraints, lower=lower,
+                                       upper=upper, **options)
+                results[i] = solver.run()
+            else:
+                remaining[parent] -= 1
+                # The last neighbour takes the kept tableau itself, the others a copy of it
+                tableau = tableaus.pop(parent, None) if not remaining[parent] else tableaus.get(parent)
+                if parent != previous and tableau is not None:
+                    solver.restore(tableau, copy=bool(remaining[parent]))
+                    self.restores += 1
+                if len(solver.base):
+                    self.warm_starts += 1
+                if list(solver.actual_coefficients) != c:
+                    solver.update_objective(c)
+                if list(solver.rhs) != b:
+                    solver.update_rhs(b)
+                results[i] = solver.rerun()
+
+            # The first neighbour continues from the live tableau, only further ones need a copy
+            if remaining[i] > 1 and len(solver.base) and self.keep:
+                tableaus[i] = solver.snapshot()
+                while len(tableaus) > self.keep:
+                    tableaus.popitem(last=False)
+            previous = i
+        return results
+
+    def interior_point(self, alpha: Union[float, None], **options) -> list[SolverResult]:
+        """
+        Solve all scenarios with [InteriorPointSolver] and the equality constraints a * x = b. Every scenario
+        starts from the initial point x of its nearest solved scenario instead of running Phase I: as it is
+        with the same b, moved by X^2 * a^T * (a * X^2 * a^T)^-1 * (b - b of the neighbour) with another b
+        if that keeps it positive. Scaling by X = diag(x) keeps the move small where x is small. All neighbours
+        of a scenario share the factorization of a * X^2 * a^T, and the scenarios without such a point run Phase I
+        :param alpha: alpha in Interior-Point Algorithm, [None] to adapt it
+        :param options: other arguments of [InteriorPointSolver], e.g. [workspace]
+        :return: the result of every scenario, in the order of the scenarios
+        """
+        self.warm_starts = self.restores = 0
+        mode = InteriorPointSolver.Mode(self.mode.value)
+        matrix = normal_equations.as_matrix(self.a)
+        results: list[Union[SolverResult, None]] = [None] * len(self.order)
+        remaining = self._children()
+        points: dict[int, list] = {}  # Initial point of solved scenarios with neighbours left and its factorization
+        for i in self.order:
+            parent = self.parents[i]
+            start = None
+            if parent in points:
+                point = points[parent]
+                start = point[0]
+                if not np.array_equal(self.b[i], self.b[parent]):
+                    if point[1] is None:
+                        try:
+                            point[1] = normal_equations.Factorization(normal_equations.assemble(matrix, start * start))
+                        except np.linalg.LinAlgError:  # Linearly dependent constraints, Phase I fails on them too
+                            point[1] = False
+                    start = start + start * start * (matrix.T @ point[1].solve(self.b[i] - self.b[parent])) \
+                        if point[1] else None
+                    if start is not None and np.min(start) <= 0:
+                        start = None
+            if parent is not None:
+                remaining[parent] -= 1
+                if not remaining[parent]:
+                    points.pop(parent, None)
+
+            solver = InteriorPointSolver(mode, start, list(self.c[i]), self.a, list(self.b[i]), alpha, self.eps,
+                                         **options)
+            results[i] = solver.run()
+            self.warm_starts += start is not None
+            if remaining[i] and solver.initial_point is not None:
+                points[i] = [solver.initial_point, None]
+        return results
+
+    def _children(self) -> list[int]:
+        """
+        :return: how many scenarios have every scenario as their nearest solved scenario
+        """
+        children = [0] * len(self.parents)
+        for parent in self.parents:
+            if parent is not None:
+                children[parent] += 1
+        return children
+
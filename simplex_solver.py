@@ -1,8 +1,14 @@
 # Simplex method solver from assignment 1
 
 from enum import Enum
+from time import perf_counter
 from typing import Union
-from math import isclose
+from math import inf, isclose
+
+from instrumentation import Instrumentation, Iteration
+from numerics import Numerics
+from pricing import Bland, Dantzig, PricingRule
+from solver_result import SolverResult, Verbosity
 
 
 def function_from_coefficients(coefficients: list[float]) -> str:
@@ -19,20 +25,78 @@ def function_from_coefficients(coefficients: list[float]) -> str:
                                            for i, c in enumerate(other, start=2))
 
 
+_TABLEAU = ("a", "b", "z", "base", "solution", "c", "actual_coefficients", "_rhs", "_source", "_sign", "_shift",
+            "_upper", "_fixed", "_costs", "_offset", "_multipliers", "_artificial_rows", "_logicals", "_pivots")
+"""Attributes of [SimplexSolver] that hold its tableau, its basis and the substitutions of its variables"""
+
+
+def _copy(value):
+    """
+    :return: a copy of an attribute of [_TABLEAU] that pivots of the original do not change
+    """
+    if hasattr(value, "shape"):
+        import numpy as np
+
+        return np.array(value)  # Also a plain array in memory for a memory-mapped tableau
+    if isinstance(value, list):
+        return [list(item) if isinstance(item, list) else item for item in value]
+    return value
+
+
 class SimplexSolver:
     class Mode(str, Enum):
         MAXIMIZE = "Maximize"
         MINIMIZE = "Minimize"
 
-    def __init__(self, mode: Mode, c: list[float], a: list[list[float]], b: list[float], eps: int) -> None:
+    class Backend(str, Enum):
+        LIST = "list"
+        NUMPY = "numpy"
+
+    class Constraint(str, Enum):
+        LESS_EQUAL = "<="
+        GREATER_EQUAL = ">="
+        EQUAL = "="
+
+    def __init__(
+            self,
+            mode: Mode,
+            c: list[float],
+            a: list[list[float]],
+            b: list[float],
+            eps: int,
+            backend: Backend = Backend.LIST,
+            pricing: Union[PricingRule, None] = None,
+            bland_after: int = 50,
+            constraints: Union[list[Constraint], None] = None,
+            lower: Union[list[float], None] = None,
+            upper: Union[list[float], None] = None,
+            instrumentation: Union[Instrumentation, None] = None,
+            verbosity: Verbosity = Verbosity.RESULT,
+            numerics: Union[Numerics, None] = None,
+            memory_map: Union[str, None] = None
+    ) -> None:
         """
         Construct a Simplex method problem solver
 
         :param mode: one of [Mode.MAXIMIZE] or [Mode.MINIMIZE]
         :param c: coefficients of the objective function
-        :param a: matrix of the coefficients of the constraints
-        :param b: right hand side of the constraints equations
+        :param a: matrix of the coefficients of the constraints. A scipy sparse matrix is accepted,
+            but the tableau is dense. Use [RevisedSimplexSolver] to keep it sparse
+        :param b: right hand side of the constraints equations. May be negative
         :param eps: solution accuracy. How many digits after the floating point to consider
+        :param backend: one of [Backend.LIST] (nested Python lists) or [Backend.NUMPY] (vectorized NumPy tableau)
+        :param pricing: rule choosing the entering column, see [pricing]. [Dantzig] if [None]
+        :param bland_after: after how many consecutive iterations without improvement of the objective function
+            to switch to Bland's rule until it improves again, so that degenerate problems do not cycle. 0 to never
+        :param constraints: [Constraint] of every row. All [Constraint.LESS_EQUAL] if [None]
+        :param lower: lower bounds of the variables, -inf for none. All 0 if [None]
+        :param upper: upper bounds of the variables, inf for none. All inf if [None]
+        :param instrumentation: collects the statistics of every solve and passes every iteration to its callbacks
+        :param verbosity: what [solve] and [reoptimize] print. [run] never prints
+        :param numerics: tolerances, refactorization and scaling of floating point arithmetic. If [None],
+            every cell of the tableau is rounded to [eps] digits after every operation instead
+        :param memory_map: directory to keep the tableau of [Backend.NUMPY] in as a memory-mapped temporary file,
+            for tableaus larger than the memory. [None] to keep it in memory
         """
 
         self.mode: SimplexSolver.Mode = mode
@@ -45,92 +109,398 @@ class SimplexSolver:
         """Coefficients of the objective function. Inverted if we are minimizing"""
 
         self.a: list[list[float]] = a
-        """Matrix of the coefficients of the constraints"""
+        """Matrix of the coefficients of the constraints. Becomes the tableau when solving"""
 
         self.b: list[float] = b
-        """Right hand side of the constraints equations"""
+        """Right hand side of the constraints equations. Becomes the right hand side of the tableau when solving"""
 
         self.eps: int = eps
         """Solution accuracy"""
 
-        self.base: list[int] = []
-        """Indices of basic variables on this step"""
+        self.backend: SimplexSolver.Backend = backend
+        """Storage and arithmetic used for the tableau"""
+
+        self.constraints: list[SimplexSolver.Constraint] = \
+            list(constraints) if constraints is not None else [SimplexSolver.Constraint.LESS_EQUAL] * len(b)
+        """Constraint of every row"""
+
+        self.lower: list[float] = list(lower) if lower is not None else [0] * len(c)
+        """Lower bounds of the variables"""
+
+        self.upper: list[float] = list(upper) if upper is not None else [inf] * len(c)
+        """Upper bounds of the variables"""
+
+        self.base: Union[list[int], "np.ndarray"] = []
+        """Indices of the tableau columns of basic variables on this step. An int array with [Backend.NUMPY]"""
 
         self.solution = 0
         """Optimal solution for this problem"""
 
+        self.dual_values: list[float] = []
+        """Shadow prices of the constraints: change of the optimal solution per unit increase of b"""
+
         self.z = [-i for i in self.c]
         """Z-row of the tableau"""
 
         self.is_unbounded = False
         """Whether the objective function is unbounded"""
 
+        self.is_infeasible = False
+        """Whether the constraints have no feasible point"""
+
+        self.pricing: PricingRule = pricing or Dantzig()
+        """Rule choosing the entering column"""
+
+        self.bland_after: int = bland_after
+        """After how many consecutive degenerate iterations to switch to Bland's rule"""
+
+        self._bland: Bland = Bland()
+        """Anti-cycling fallback rule"""
+
+        self._stalled = 0
+        """How many consecutive iterations did not improve the objective function"""
+
+        self._unbounded_column: Union[int, None] = None
+        """Column that nothing bounded on the last step that found the objective function unbounded"""
+
+        self.iterations = 0
+        """How many primal Simplex iterations the last solve took, Phase I included"""
+
+        self.phase_one_iterations = 0
+        """How many of the [iterations] searched for a feasible basis"""
+
+        self.degenerate_iterations = 0
+        """How many of the [iterations] did not improve the objective function"""
+
+        self.bland_iterations = 0
+        """How many of the [iterations] used Bland's rule against cycling"""
+
+        self.dual_iterations = 0
+        """How many dual Simplex iterations the last [reoptimize] or [crossover] took"""
+
+        self.crash_pivots = 0
+        """How many pivots the last [crossover] took to put the columns of its point into the basis"""
+
+        self.pricing_time = 0.0
+        """Time spent choosing entering columns (leaving rows in the dual Simplex method) in the last solve, in seconds"""
+
+        self.ratio_test_time = 0.0
+        """Time spent in the ratio tests of the last solve, in seconds"""
+
+        self.update_time = 0.0
+        """Time spent pivoting and flipping bounds in the last solve, in seconds"""
+
+        self.phase_one_time = 0.0
+        """Time spent searching for a feasible basis in the last solve, in seconds"""
+
+        self.time = 0.0
+        """Wall time of the last solve, in seconds"""
+
+        self.instrumentation: Union[Instrumentation, None] = instrumentation
+        """Collects the statistics of every solve and passes every iteration to its callbacks"""
+
+        self.verbosity: Verbosity = verbosity
+        """What [solve] and [reoptimize] print"""
+
+        self.numerics: Union[Numerics, None] = numerics
+        """Tolerances, refactorization and scaling of floating point arithmetic, [None] to round every cell"""
+
+        self.memory_map: Union[str, None] = memory_map
+        """Directory of the memory-mapped tableau file, [None] if the tableau is in memory"""
+
+        self.refactorizations = 0
+        """How many times the last solve recomputed the tableau from the constraints"""
+
+        self._pivots = 0
+        """Pivots since the tableau was computed from the constraints"""
+
+        self._phase = "primal"
+        """Phase of the solve that the iterations belong to, as [Iteration.phase]"""
+
+        self._matrix = a
+        """Matrix of the coefficients of the constraints as given"""
+
+        self._rhs: list[float] = b
+        """Right hand side of the constraints equations as given"""
+
+        self._scaled = a
+        """Matrix of the coefficients of the constraints scaled by [_row_scale] and [_column_scale]"""
+
+        self._row_scale: Union[list[float], None] = None
+        """Factors of the rows of the constraints, [None] if they are not scaled"""
+
+        self._column_scale: Union[list[float], None] = None
+        """Factors of the variables: a variable is its column scale times the variable of the scaled problem.
+        [None] if they are not scaled"""
+
+        self._logicals = 0
+        """Index of the first logical column of the tableau. The columns before it are the variables"""
+
+        self._source: list[int] = []
+        """For every tableau column: index of its variable, -1 for logical and artificial columns"""
+
+        self._sign: list[float] = []
+        """For every tableau column x': the variable is x = shift + sign * x'"""
+
+        self._shift: list[float] = []
+        """For every tableau column x': the variable is x = shift + sign * x'"""
+
+        self._upper: list[float] = []
+        """For every tableau column: upper bound of x', the lower bound is 0"""
+
+        self._fixed: list[int] = []
+        """Tableau columns with the upper bound 0, which must never enter the basis"""
+
+        self._artificial_rows: list[int] = []
+        """Rows that start with an artificial variable in the basis, in the order of the artificial columns"""
+
+        self._multipliers: list[float] = []
+        """1 or -1 for every row: the rows of the tableau are the constraints multiplied by them"""
+
+        self._costs: list[float] = []
+        """Coefficients of the maximized objective function for every tableau column"""
+
+        self._offset = 0
+        """Constant term of the objective function in the tableau columns"""
+
     def print_problem(self) -> None:
         """
         Print the simplex problem of this solver
         """
         print(f"{self.mode} z = {function_from_coefficients(self.actual_coefficients)}")
         print("subject to the constraints:")
-        print("\n".join(f"{function_from_coefficients(cs)} <= {rhs}" for cs, rhs in zip(self.a, self.b)))
+        print("\n".join(f"{function_from_coefficients(cs)} {constraint.value} {rhs}"
+                        for cs, constraint, rhs in zip(self.a, self.constraints, self.b)))
+        for j, (lower, upper) in enumerate(zip(self.lower, self.upper), start=1):
+            if lower != 0 or upper != inf:
+                print(f"{lower} <= x{j} <= {upper}")
+
+    def _shifted_rhs(self, b: list[float]) -> list[float]:
+        """
+        :return: right hand side of the constraints in the tableau columns: b - a * (shifts of the variables)
+        """
+        shift = [0] * len(self.c)
+        for j, value in zip(self._source[:self._logicals], self._shift):
+            shift[j] += value
+        if self._row_scale is not None:
+            b = [scale * value for scale, value in zip(self._row_scale, b)]
+        if not any(shift):
+            return list(b)
+
+        if hasattr(self._scaled, "shape"):  # A NumPy array or a scipy sparse matrix
+            import numpy as np
+
+            return list(np.asarray(b, dtype=float) - self._scaled @ np.asarray(shift, dtype=float))
+        return [b[i] - sum(value * shift[j] for j, value in enumerate(row)) for i, row in enumerate(self._scaled)]
 
     def _to_standard_form(self) -> None:
         """
-        Builds the tableau adding 1's and 0's for every slack variable
+        Build the tableau of the problem in tableau columns x' with 0 <= x' <= upper bound.
+        Every variable is shifted by its finite lower bound (x = lower + x'), or reflected at its upper bound
+        (x = upper - x') if it only has that one, and a free variable is split into two columns (x = x' - x'').
+        Every row gets a logical column: +1 for <=, -1 for >=, +1 bounded by 0 for =.
+        The logical variables form the starting basis, except where the right hand side puts one outside
+        of its bounds: such a row gets an artificial column that [_phase_one] removes.
+        With [numerics], the constraints are scaled first
         """
-        for row in range(len(self.a)):
-            for row2 in range(len(self.a)):
-                self.a[row2].append(1 if row == row2 else 0)
+        n = len(self.c)
+        self._scale()
+        column_scale = self._column_scale or [1] * n
+        self._source, self._sign, self._shift, self._upper = [], [], [], []
+        free = []
+        for j in range(n):
+            lower, upper = self.lower[j] / column_scale[j], self.upper[j] / column_scale[j]
+            if lower > -inf:
+                self._add_column(j, 1, lower, upper - lower)
+            elif upper < inf:
+                self._add_column(j, -1, upper, inf)
+            else:
+                self._add_column(j, 1, 0, inf)
+                free.append(j)
+        for j in free:
+            self._add_column(j, -1, 0, inf)
+
+        self._logicals = logicals = len(self._source)
+        rhs = [self._round(value) for value in self._shifted_rhs(self._rhs)]
+        multipliers, artificial_rows = [], []
+        self.base = []
+        for i, constraint in enumerate(self.constraints):
+            sign = -1 if constraint == SimplexSolver.Constraint.GREATER_EQUAL else 1
+            self._add_column(-1, sign, 0, 0 if constraint == SimplexSolver.Constraint.EQUAL else inf)
+            if 0 <= sign * rhs[i] <= self._upper[-1]:  # The logical variable is feasible
+                multipliers.append(sign)
+                self.base.append(logicals + i)
+            else:
+                multipliers.append(1 if rhs[i] >= 0 else -1)
+                self.base.append(None)
+                artificial_rows.append(i)
+        for i in artificial_rows:
+            self._add_column(-1, 1, 0, inf)
+            self.base[i] = len(self._source) - 1
+        self._artificial_rows = artificial_rows
+        self._multipliers = multipliers
+        self._pivots = 0
+
+        self._costs = [0] * len(self._source)
+        self._set_costs()
+        self._fixed = [j for j, upper in enumerate(self._upper) if upper == 0]
+        self.solution = 0  # The logical and artificial variables of the starting basis cost nothing
 
-            self.base.append(-1)  # Put -1 for slack variables in the basic variables column
-            self.z.append(0)  # Slack variables have a "zero" coefficient in the objective function
+        if self.backend == SimplexSolver.Backend.NUMPY:
+            import numpy as np
+            import numpy_tableau
+
+            self.a, self.b = numpy_tableau.standard_form(self._scaled, rhs, self._source[:logicals],
+                                                         self._sign[:logicals], self._sign[logicals:logicals + len(rhs)],
+                                                         multipliers, artificial_rows, self.memory_map)
+            self.z = np.array([-cost for cost in self._costs], dtype=float)
+            self.base = np.asarray(self.base, dtype=np.intp)
+            return
+
+        if hasattr(self._scaled, "toarray"):  # A scipy sparse matrix, the list tableau needs nested lists
+            matrix = self._scaled.toarray().tolist()
+        else:
+            matrix = self._scaled
+        m = len(rhs)
+        artificial = dict((i, k) for k, i in enumerate(artificial_rows))
+        self.a = []
+        for i, row in enumerate(matrix):
+            k = multipliers[i]
+            tableau_row = [k * sign * row[j] for j, sign in zip(self._source[:logicals], self._sign)]
+            tableau_row += [k * self._sign[logicals + i] if i == row2 else 0 for row2 in range(m)]
+            tableau_row += [1 if artificial.get(i) == k2 else 0 for k2 in range(len(artificial_rows))]
+            self.a.append(tableau_row)
+        self.b = [k * value for k, value in zip(multipliers, rhs)]
+        self.z = [-cost for cost in self._costs]
+
+    def _scale(self) -> None:
+        """
+        Scale the constraints as [numerics] asks for
+        """
+        self._scaled, self._row_scale, self._column_scale = self._matrix, None, None
+        if self.numerics is None or self.numerics.scaling == Numerics.Scaling.NONE:
+            return
+
+        from numerics import scale_factors, scale_matrix
+
+        row, column = scale_factors(self._matrix, self.numerics.scaling)
+        if (row == 1).all() and (column == 1).all():
+            return
+        self._row_scale, self._column_scale = row.tolist(), column.tolist()
+        self._scaled = scale_matrix(self._matrix, self._row_scale, self._column_scale)
+
+    def _round(self, value: float) -> float:
+        """
+        :return: [value] rounded to [eps] digits, or as it is with [numerics]
+        """
+        return value if self.numerics is not None else round(value, self.eps)
+
+    def _set_costs(self) -> None:
+        """
+        Compute the coefficients of the objective function for the variable columns of the tableau
+        and its constant term from [c], logical and artificial columns keep theirs
+        """
+        n = self._logicals
+        scale = self._column_scale or [1] * len(self.c)
+        self._costs[:n] = [sign * self.c[j] * scale[j] for j, sign in zip(self._source[:n], self._sign)]
+        self._offset = sum(self.c[j] * scale[j] * shift for j, shift in zip(self._source[:n], self._shift))
+
+    def _add_column(self, source: int, sign: float, shift: float, upper: float) -> None:
+        """
+        Describe the next tableau column: x = shift + sign * x', 0 <= x' <= upper
+        """
+        self._source.append(source)
+        self._sign.append(sign)
+        self._shift.append(shift)
+        self._upper.append(upper)
+
+    def _rule(self) -> PricingRule:
+        """
+        :return: the pricing rule of this iteration: Bland's rule while the objective function is stalling
+        """
+        if self.bland_after and self._stalled >= self.bland_after:
+            return self._bland
+        return self.pricing
 
     def _pivot_column(self) -> Union[int, None]:
         """
-        Determine the pivot column for this iteration
+        Determine the pivot column for this iteration with the pricing rule
         :return: index of the column or [None] if all z-row values are positive
         """
+        start = perf_counter()
+        column = self._rule().select(self)
+        self.pricing_time += perf_counter() - start
+        return column
 
-        # Create an array of tuples (variable index, z-row value),
-        # get the tuple in which the z-row value is the smallest among all.
-        cell = min(((i, self.z[i])
-                    for i in range(len(self.z))
-                    if self.z[i] < 0),
-                   default=None,
-                   key=lambda x: x[1])
-
-        # If all values are greater or equal to zero, None is returned,
-        # otherwise the index of the smallest value is returned
-        if cell:
-            return cell[0]
-        else:
-            return cell
+    def _basic_upper(self) -> Union[list[float], None]:
+        """
+        :return: upper bound of the basic variable of every row or [None] if no variable has one
+        """
+        if all(upper == inf for upper in self._upper):
+            return None
+        return [self._upper[j] for j in self.base]
 
     def _pivot_row(self, pivot_column: int) -> Union[int, None]:
         """
         Determine the pivot row for this iteration
         :param pivot_column: index of the pivot column for this iteration
-        :return: index of the pivot row or [None] if all ratios are negative or zero
+        :return: index of the pivot row or [None] if no basic variable reaches a bound
         """
+        tolerance = self._pivot_tolerance(pivot_column)
+        basic = list(self.base) if self._rule().smallest_index_ties else None  # Bland's rule breaks ties by index
+        upper = self._basic_upper()
 
-        # Divide the right hand side value of each row by the value on the pivot column
-        # and find the minimum of such ratios
-        cell = min(((i, self.b[i] / self.a[i][pivot_column])
-                    for i in range(len(self.a))
-                    if self.a[i][pivot_column] != 0 and self.b[i] / self.a[i][pivot_column] > 0),
-                   default=None,
-                   key=lambda x: x[1])
-        if cell:
-            return cell[0]
+        if self.backend == SimplexSolver.Backend.NUMPY:
+            import numpy_tableau
+
+            return numpy_tableau.pivot_row(self.a, self.b, pivot_column, tolerance, basic, upper)
+
+        # Divide the right hand side value of each row by the positive value on the pivot column
+        # and find the minimum of such ratios. Zero ratios (degenerate rows) are valid pivots,
+        # and round-off can leave b slightly negative, which counts as zero.
+        # A basic variable with an upper bound also stops the pivot column when it reaches the bound
+        ratios = [(i, max(self.b[i], 0) / self.a[i][pivot_column])
+                  for i in range(len(self.a))
+                  if self.a[i][pivot_column] > tolerance]
+        if upper is not None:
+            ratios += [(i, max(upper[i] - self.b[i], 0) / -self.a[i][pivot_column])
+                       for i in range(len(self.a))
+                       if self.a[i][pivot_column] < -tolerance and upper[i] < inf]
+        if not ratios:
+            return None
+
+        # Ties (e.g. degenerate rows) are broken towards the largest pivot value,
+        # a small pivot value would blow the rounding error of its row up
+        minimum = min(ratio for _, ratio in ratios)
+        ties = (i for i, ratio in ratios if ratio == minimum)
+        if basic is not None:
+            return min(ties, key=basic.__getitem__)
+        return max(ties, key=lambda i: abs(self.a[i][pivot_column]))
+
+    def _pivot_tolerance(self, pivot_column: int) -> float:
+        """
+        :return: the largest absolute value of [pivot_column] that is round-off, pivoting on it blows the tableau up.
+            Rounding every cell to eps leaves errors that grow with the values the pivots combine, so the tolerance
+            grows with the largest value of the column
+        """
+        if self.backend == SimplexSolver.Backend.NUMPY:
+            import numpy as np
+
+            largest = float(np.max(np.abs(self.a[:, pivot_column]), initial=0))
         else:
-            return cell  # Returns None
+            largest = max((abs(row[pivot_column]) for row in self.a), default=0)
+        if self.numerics is None:
+            return max(10 ** (1 - self.eps), 1e-9) * max(1.0, largest)
+        return self.numerics.pivot_threshold(largest)
 
-    def _check_unbounded(self, col: int) -> bool:
+    def _ratio(self, pivot_row: int, pivot_column: int) -> float:
         """
-        Check if a column is unbounded
-        :param col: index of the column to check
-        :return: whether the column is unbounded
+        :return: how far the pivot column can increase until the basic variable of [pivot_row] reaches a bound
         """
-        return all(self.a[i][col] <= 0 for i in range(len(self.a)))
+        value = self.a[pivot_row][pivot_column]
+        if value > 0:
+            return max(self.b[pivot_row], 0) / value
+        return max(self._upper[self.base[pivot_row]] - self.b[pivot_row], 0) / -value
 
     def _step(self) -> bool:
         """
@@ -138,23 +508,168 @@ class SimplexSolver:
         :return: whether to continue iterating. [False] if this was the last step
         """
 
+        start = perf_counter()
+
         # Get the index of the pivot column
         pivot_column = self._pivot_column()
 
         if pivot_column is None:  # If all columns are positive or zero, we are done
             return False
 
-        if self._check_unbounded(pivot_column):  # if the column is unbounded we do not need to calculate further
+        clock = perf_counter()
+        pivot_row = self._pivot_row(pivot_column)
+        bound = self._upper[pivot_column]
+        # The entering variable may reach its own upper bound first: then there is no pivot,
+        # it stays nonbasic at the bound
+        flip = bound < inf and (pivot_row is None or bound <= self._ratio(pivot_row, pivot_column))
+        self.ratio_test_time += perf_counter() - clock
+
+        if pivot_row is None and not flip:  # Nothing bounds the column, so the function is unbounded
             self.is_unbounded = True
+            self._unbounded_column = pivot_column
             return False
 
-        pivot_row = self._pivot_row(pivot_column)
-        if pivot_row is None:  # If all ratios on this step are negative or zero, we stop
-            return False
+        self.iterations += 1
+        if self._rule() is self._bland:
+            self.bland_iterations += 1
 
-        k = self.a[pivot_row][pivot_column]
+        if flip:
+            clock = perf_counter()
+            self._stalled = 0
+            self._flip(pivot_column)
+            self.update_time += perf_counter() - clock
+            self._report(None, pivot_column, bound, start)
+            return True
+
+        clock = perf_counter()
+        if self.a[pivot_row][pivot_column] < 0:  # The basic variable leaves at its upper bound
+            self._reflect(pivot_row)
+        self.update_time += perf_counter() - clock
+
+        if self.b[pivot_row] <= 0:  # A degenerate pivot: the objective function does not change
+            self.degenerate_iterations += 1
+            self._stalled += 1
+        else:
+            self._stalled = 0
+
+        clock = perf_counter()
+        self._rule().update(self, pivot_row, pivot_column)
+        self.pricing_time += perf_counter() - clock
+
+        clock = perf_counter()
+        self._pivot(pivot_row, pivot_column)
+        self._settle_fixed()
+        self.update_time += perf_counter() - clock
+        self._report(pivot_row, pivot_column, float(self.b[pivot_row]), start)
+        return True
+
+    def _start_statistics(self) -> None:
+        """
+        Reset the statistics before a solve
+        """
+        self.iterations = self.phase_one_iterations = self.degenerate_iterations = self.bland_iterations = 0
+        self.dual_iterations = self.crash_pivots = self.refactorizations = 0
+        self._stalled = 0
+        self.pricing_time = self.ratio_test_time = self.update_time = self.phase_one_time = 0.0
+
+    def _report(self, pivot_row: Union[int, None], pivot_column: int, step: float, start: float) -> None:
+        """
+        Describe the iteration that started at [start] to the callbacks of [instrumentation], if there are any
+        :param pivot_row: index of the pivot row or [None] for a bound flip
+        :param pivot_column: index of the pivot column
+        :param step: new value of the entering variable
+        """
+        if self.instrumentation is None or not self.instrumentation.callbacks:
+            return
+
+        if self._phase == "phase-one":  # The solution is minus the sum of the artificial variables
+            number, objective = self.iterations, -float(self.solution)
+            primal_infeasibility = max(0.0, objective)
+        else:
+            number = self.dual_iterations if self._phase == "dual" else self.iterations - self.phase_one_iterations
+            objective = float(self.solution + self._offset)
+            if self.mode == SimplexSolver.Mode.MINIMIZE:
+                objective = -objective
+            upper = self._basic_upper()
+            primal_infeasibility = max([0.0] + [max(-float(self.b[i]), float(self.b[i]) - upper[i] if upper else -inf)
+                                                for i in range(len(self.b))])
+
+        self.instrumentation.iteration(Iteration(
+            solver="simplex",
+            phase=self._phase,
+            number=number,
+            objective=objective,
+            primal_infeasibility=primal_infeasibility,
+            dual_infeasibility=max(0.0, -float(min(self.z))),
+            step=float(step),
+            pivot=(pivot_row, pivot_column),
+            time=perf_counter() - start
+        ))
+
+    def _status(self) -> SolverResult.Status:
+        """
+        :return: how the last solve ended
+        """
+        if self.is_infeasible:
+            return SolverResult.Status.INFEASIBLE
+        if self.is_unbounded:
+            return SolverResult.Status.UNBOUNDED
+        return SolverResult.Status.OPTIMAL
+
+    def _counters(self) -> dict[str, int]:
+        """
+        :return: the iteration counters of the last solve
+        """
+        return {
+            "iterations": self.iterations,
+            "phase_one_iterations": self.phase_one_iterations,
+            "dual_iterations": self.dual_iterations,
+            "crash_pivots": self.crash_pivots,
+            "degenerate_iterations": self.degenerate_iterations,
+            "bland_iterations": self.bland_iterations,
+            "refactorizations": self.refactorizations,
+        }
+
+    def _phase_time(self) -> dict[str, float]:
+        """
+        :return: seconds spent in every phase of the last solve
+        """
+        phase_time = {"pricing": self.pricing_time, "ratio_test": self.ratio_test_time, "update": self.update_time}
+        phase_time["other"] = max(self.time - sum(phase_time.values()), 0.0)
+        return phase_time
+
+    def _record(self) -> None:
+        """
+        Add the statistics of the last solve to [instrumentation]
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.record("simplex", self._status().value, self.time, self._counters(),
+                                        self._phase_time())
+
+    def _pivot(self, pivot_row: int, pivot_column: int) -> None:
+        """
+        Make [pivot_column] basic in [pivot_row]: divide the pivot row by the pivot value
+        and eliminate the pivot column from all other rows and the z-row
+        :param pivot_row: index of the pivot row
+        :param pivot_column: index of the pivot column
+        """
         self.base[pivot_row] = pivot_column
 
+        if self.backend == SimplexSolver.Backend.NUMPY:
+            import numpy_tableau
+
+            self.solution += numpy_tableau.pivot(self.a, self.b, self.z, pivot_row, pivot_column,
+                                                 None if self.numerics else self.eps)
+            self._after_pivot()
+            return
+
+        if self.numerics is not None:
+            self._pivot_floats(pivot_row, pivot_column)
+            self._after_pivot()
+            return
+
+        k = self.a[pivot_row][pivot_column]
+
         # Make the value in cell [target_row][target_column] to be 1 by dividing the row
         for col in range(len(self.a[pivot_row])):
             self.a[pivot_row][col] /= k
@@ -186,34 +701,729 @@ class SimplexSolver:
             self.z[col] = round(self.z[col], self.eps)
 
         self.solution -= m * self.b[pivot_row]
+
+    def _pivot_floats(self, pivot_row: int, pivot_column: int) -> None:
+        """
+        [_pivot] of the list backend without rounding: rows with 0 in the pivot column do not change
+        """
+        k = self.a[pivot_row][pivot_column]
+        target = self.a[pivot_row] = [value / k for value in self.a[pivot_row]]
+        self.b[pivot_row] /= k
+        target[pivot_column] = 1.0
+
+        for row in range(len(self.a)):
+            m = self.a[row][pivot_column]
+            if row == pivot_row or not m:
+                continue
+            self.a[row] = [value - m * pivot for value, pivot in zip(self.a[row], target)]
+            self.a[row][pivot_column] = 0.0
+            self.b[row] -= m * self.b[pivot_row]
+
+        m = self.z[pivot_column]
+        if m:
+            self.z = [value - m * pivot for value, pivot in zip(self.z, target)]
+            self.z[pivot_column] = 0.0
+            self.solution -= m * self.b[pivot_row]
+
+    def _after_pivot(self) -> None:
+        """
+        With [numerics]: set the z-row values within the optimality tolerance to 0 and recompute the tableau
+        from the constraints every [Numerics.refactorization_period] pivots
+        """
+        if self.numerics is None:
+            return
+
+        self._pivots += 1
+        if self.numerics.refactorization_period and self._pivots >= self.numerics.refactorization_period:
+            self._refactorize()
+        else:
+            self._clean_z()
+
+    def _clean_z(self) -> None:
+        """
+        Set the z-row values within the optimality tolerance of [numerics] to 0, they are round-off
+        """
+        tolerance = self.numerics.optimality_tolerance
+        if self.backend == SimplexSolver.Backend.NUMPY:
+            import numpy as np
+
+            self.z[np.abs(self.z) <= tolerance] = 0
+        else:
+            self.z = [0 if abs(value) <= tolerance else value for value in self.z]
+
+    def _refactorize(self) -> None:
+        """
+        Recompute the tableau, the z-row and the objective function value of the current basis from the constraints,
+        which drops the error the pivots have accumulated. Keeps the tableau if the basis is numerically singular
+        """
+        import numpy as np
+        import numpy_tableau
+
+        self._pivots = 0
+        logicals, m = self._logicals, len(self.base)
+        artificial_rows = self._artificial_rows if len(self._source) > logicals + m else []
+        a, b = numpy_tableau.standard_form(self._scaled, self._shifted_rhs(self._rhs), self._source[:logicals],
+                                           self._sign[:logicals], self._sign[logicals:logicals + m],
+                                           self._multipliers, artificial_rows)
+        try:
+            tableau = np.linalg.solve(a[:, self.base], np.column_stack((a, b)))
+        except np.linalg.LinAlgError:
+            self._clean_z()
+            return
+
+        self.refactorizations += 1
+        tableau[np.abs(tableau) <= self.numerics.pivot_tolerance] = 0  # Round-off of the solve, e.g. in basic columns
+        if self.backend == SimplexSolver.Backend.NUMPY:  # In place, the tableau may be memory-mapped
+            self.a[:] = tableau[:, :-1]
+            self.b[:] = tableau[:, -1]
+        else:
+            self.a, self.b = tableau[:, :-1].tolist(), tableau[:, -1].tolist()
+        self._price()
+        self.solution = self._basic_objective()
+
+    def _substitute(self, column: int) -> None:
+        """
+        Record the substitution x' = upper - x'' of a tableau column in its variable and the objective function
+        """
+        upper = self._upper[column]
+        if upper:  # A fixed column moves by 0, and inf * 0 is nan
+            self._shift[column] += self._sign[column] * upper
+            self._offset += self._costs[column] * upper
+        self._sign[column] = -self._sign[column]
+        self._costs[column] = -self._costs[column]
+
+    def _flip(self, column: int) -> None:
+        """
+        Move a nonbasic column to its upper bound and substitute x' = upper - x'', so it is nonbasic at 0 again
+        """
+        upper = self._upper[column]
+        self.solution -= (self.z[column] + self._costs[column]) * upper
+        if self.backend == SimplexSolver.Backend.NUMPY:
+            import numpy as np
+
+            self.b -= upper * self.a[:, column]
+            if self.numerics is None:
+                np.round(self.b, self.eps, out=self.b)
+            self.a[:, column] *= -1
+        else:
+            for i, row in enumerate(self.a):
+                self.b[i] = self._round(self.b[i] - upper * row[column])
+                row[column] = -row[column]
+        self.z[column] = -self.z[column]
+        self._substitute(column)
+
+    def _reflect(self, row: int) -> None:
+        """
+        Substitute x' = upper - x'' for the basic variable of [row], so that reaching its upper bound
+        becomes reaching 0 of x''
+        """
+        column = self.base[row]
+        self.solution -= self._costs[column] * self._upper[column]
+        if self.backend == SimplexSolver.Backend.NUMPY:
+            self.a[row] *= -1
+        else:
+            self.a[row] = [-value for value in self.a[row]]
+        self.a[row][column] = 1
+        self.b[row] = self._round(self._upper[column] - self.b[row])
+        self._substitute(column)
+
+    def _settle_fixed(self) -> None:
+        """
+        Keep the z-row values of nonbasic columns fixed at 0 non-negative by reflecting them,
+        which does not move them, so no pricing rule chooses them
+        """
+        if not self._fixed:
+            return
+
+        basic = set(self.base)
+        for column in self._fixed:
+            if self.z[column] < 0 and column not in basic:
+                if self.backend == SimplexSolver.Backend.NUMPY:
+                    self.a[:, column] *= -1
+                else:
+                    for row in self.a:
+                        row[column] = -row[column]
+                self.z[column] = -self.z[column]
+                self._substitute(column)
+
+    def _phase_one(self) -> None:
+        """
+        Phase I: starting from the basis with the artificial variables, maximize minus their sum.
+        If it reaches 0, the artificial variables left in the basis are replaced by the logical variables of their rows
+        and the artificial columns are dropped, which leaves a feasible basis of the problem
+        """
+        artificials = self._logicals + len(self.b)
+        self._costs = [0] * artificials + [-1] * (len(self._costs) - artificials)
+        self._price()
+        self.solution = self._basic_objective()
+        self.pricing.reset(self)
+
+        # Stop as soon as the artificial variables reach 0, the z-row values left are round-off.
+        # The pivots update [solution] with every cell rounded to eps, so it drifts from the values of the artificial
+        # variables in the basis: read them from the basis instead
+        tolerance = self._feasibility_tolerance(max((abs(float(value)) for value in self.b), default=0))
+        while self.solution < -tolerance:
+            if self._step():
+                self.solution = self._basic_objective()
+                continue
+            if not self.is_unbounded:  # No z-row value beyond the tolerance is left
+                break
+            # Minus a sum of non-negative variables is bounded, so the column has a round-off z-row value
+            # that no row can pivot on: drop it and keep pricing the other columns
+            self.is_unbounded = False
+            self.z[self._unbounded_column] = 0
+        self.phase_one_iterations = self.iterations
+
+        if self.solution < -tolerance:  # The artificial variables cannot reach 0
+            self.is_infeasible = True
+            self.a, self.b, self.base = self._matrix, self._rhs, []
+            return
+
+        self._drop_artificials()
+
+    def _drop_artificials(self) -> None:
+        """
+        Replace the artificial variables left in the basis, which are 0, by the logical variables of their rows,
+        drop the artificial columns and price the objective function in the feasible basis that is left
+        """
+        artificials = self._logicals + len(self.b)
+        for row, column in enumerate(self.base):
+            if column >= artificials:  # Degenerate, the logical variable of its row has 1 or -1 in this row
+                self.b[row] = 0
+                entering = self._logicals + self._artificial_rows[column - artificials]
+                if abs(self.a[row][entering]) <= self._pivot_tolerance(entering):  # Cleared by the pivots of [_crash]
+                    entering = max(range(artificials), key=lambda j: abs(self.a[row][j]))
+                self._pivot(row, entering)
+
+        if self.backend == SimplexSolver.Backend.NUMPY:
+            import numpy as np
+
+            self.a = self.a[:, :artificials]  # A view: copying would double the memory or leave the memory map
+        else:
+            for row in self.a:
+                del row[artificials:]
+        for attribute in (self._source, self._sign, self._shift, self._upper, self._costs):
+            del attribute[artificials:]
+        self._fixed = [column for column in self._fixed if column < artificials]
+
+        self._costs[:] = [0] * artificials  # Phase I or [_crash] substituted some columns, so price them again
+        self._set_costs()
+        self._price()
+        self.solution = self._basic_objective()
+        self._stalled = 0
+        self.pricing.reset(self)
+
+    def _feasibility_tolerance(self, scale: float) -> float:
+        """
+        :param scale: magnitude of the values that the right hand side was computed from
+        :return: how far a basic variable may be outside of its bounds because of round-off,
+            which grows with the right hand side
+        """
+        tolerance = self.numerics.feasibility_tolerance if self.numerics else max(10 ** (1 - self.eps), 1e-9)
+        return tolerance * max(1.0, scale)
+
+    def _rhs_noise(self, row: int) -> float:
+        """
+        :return: how far round-off can move the right hand side of [row]. The tableau computes it as the row
+            of the basis inverse, which the logical columns hold, times the right hand side of the constraints.
+            Every cell of that row has an error of at least the tolerance, more if the cell is large
+        """
+        n = self._logicals
+        rhs = self._shifted_rhs(self._rhs)
+        return self._feasibility_tolerance(sum(max(1.0, abs(float(self.a[row][n + k]))) * abs(float(value))
+                                               for k, value in enumerate(rhs)))
+
+    def _dual_pivot_row(self) -> Union[int, None]:
+        """
+        Determine the pivot row for this iteration of the dual Simplex method
+        :return: index of the row whose basic variable is the farthest below 0 or above its upper bound,
+            or [None] if all of them are within their bounds.
+            Every cell is rounded to [eps] digits, so the rounding error of a few pivots is treated as zero
+        """
+        tolerance = self._feasibility_tolerance(max((abs(float(value)) for value in self._rhs), default=0))
+        upper = self._basic_upper()
+        if self.backend == SimplexSolver.Backend.NUMPY:
+            import numpy_tableau
+
+            return numpy_tableau.dual_pivot_row(self.b, tolerance, upper)
+
+        cell = max(((i, max(-self.b[i], self.b[i] - upper[i] if upper is not None else -inf))
+                    for i in range(len(self.b))),
+                   default=None,
+                   key=lambda x: x[1])
+        return cell[0] if cell and cell[1] > tolerance else None
+
+    def _dual_pivot_column(self, pivot_row: int) -> Union[int, None]:
+        """
+        Determine the pivot column for this iteration of the dual Simplex method
+        :param pivot_row: index of the pivot row for this iteration
+        :return: index of the column with the minimum ratio |z / a| among the negative values of the pivot row
+            or [None] if the pivot row has no negative values. Columns fixed at 0 cannot enter
+        """
+        movable = [upper > 0 for upper in self._upper] if self._fixed else None
+        tolerance = self.numerics.pivot_tolerance if self.numerics else 0
+        if self.backend == SimplexSolver.Backend.NUMPY:
+            import numpy_tableau
+
+            return numpy_tableau.dual_pivot_column(self.a, self.z, pivot_row, movable, tolerance)
+
+        # Ties are broken towards the largest pivot value, which keeps the rounding error small
+        cell = min(((j, max(self.z[j], 0) / -self.a[pivot_row][j])
+                    for j in range(len(self.z))
+                    if self.a[pivot_row][j] < -tolerance and (movable is None or movable[j])),
+                   default=None,
+                   key=lambda x: (x[1], self.a[pivot_row][x[0]]))
+        return cell[0] if cell else None
+
+    def _dual_step(self) -> bool:
+        """
+        Perform one iteration of the dual Simplex method: keep the z-row optimal
+        and move towards a non-negative right hand side
+        :return: whether to continue iterating. [False] if this was the last step
+        """
+        start = perf_counter()
+        pivot_row = self._dual_pivot_row()
+        self.pricing_time += perf_counter() - start
+        if pivot_row is None:  # The right hand side is feasible
+            return False
+
+        clock = perf_counter()
+        if self.b[pivot_row] > 0:  # Above its upper bound, which is below 0 after the substitution
+            self._reflect(pivot_row)
+
+        pivot_column = self._dual_pivot_column(pivot_row)
+        self.ratio_test_time += perf_counter() - clock
+        if pivot_column is None:
+            if -self.b[pivot_row] > self._rhs_noise(pivot_row):  # The row cannot be made feasible
+                self.is_infeasible = True
+                return False
+            # The violation is round-off of the pivots that computed the row: the basic variable is at its bound
+            self.b[pivot_row] = 0
+            return True
+
+        self.dual_iterations += 1
+        clock = perf_counter()
+        self._pivot(pivot_row, pivot_column)
+        self._settle_fixed()
+        self.update_time += perf_counter() - clock
+        self._report(pivot_row, pivot_column, float(self.b[pivot_row]), start)
         return True
 
-    def solve(self) -> Union[tuple[float, list[float]], None]:
+    def _basic_costs(self) -> list[float]:
         """
-        Solve the problem in this solver and print the solution and X*,
-        or "Unbounded" if the objective function is unbounded
-        :return: a tuple (solution, X*) or [None] if the objective function is unbounded
+        :return: coefficients of the objective function for the basic variable of every row
         """
-        self._to_standard_form()
-        while self._step():
-            pass
+        return [self._costs[j] for j in self.base]
 
-        # Find X* from base
-        x = [0] * len(self.c)
+    def _basic_objective(self) -> float:
+        """
+        :return: value of the objective function of the current costs at the current basis, c_B * b,
+            without the round-off that the pivots accumulate in [solution]
+        """
+        return sum(cost * value for cost, value in zip(self._basic_costs(), self.b))
+
+    def update_rhs(self, b: list[float]) -> None:
+        """
+        Replace the right hand side of the constraints equations, keeping the current basis.
+        Call [reoptimize] afterwards
+        :param b: new right hand side of the constraints equations
+        """
+        self._rhs = list(b)
+        if not len(self.base):  # Not solved yet
+            self.b = list(b)
+            return
+
+        # The logical columns of the tableau hold the inverse of the basis, times their signs
+        b = self._shifted_rhs(b)
+        n = self._logicals
+        signs = self._sign[n:]
+        if self.backend == SimplexSolver.Backend.NUMPY:
+            import numpy as np
+
+            self.b = self.a[:, n:] @ (np.asarray(signs, dtype=float) * np.asarray(b, dtype=float))
+            if self.numerics is None:
+                np.round(self.b, self.eps, out=self.b)
+        else:
+            self.b = [self._round(sum(row[n + k] * signs[k] * b[k] for k in range(len(b)))) for row in self.a]
+
+    def update_objective(self, c: list[float]) -> None:
+        """
+        Replace the coefficients of the objective function, keeping the current basis.
+        Call [reoptimize] afterwards
+        :param c: new coefficients of the objective function
+        """
+        self.actual_coefficients = c
+        self.c = c if self.mode == SimplexSolver.Mode.MAXIMIZE else [-j for j in c]
+        if not len(self.base):  # Not solved yet
+            self.z = [-i for i in self.c]
+            return
+
+        self._set_costs()
+        self._price()
+
+    def update_bounds(self, lower: Union[list[float], None] = None, upper: Union[list[float], None] = None) -> None:
+        """
+        Replace the bounds of the variables, keeping the current basis. Call [reoptimize] afterwards.
+        Nonbasic variables stay at the bound they were at, basic variables outside of their new bounds
+        are what the dual Simplex method repairs. A variable that loses the bound it is counted from,
+        or a free variable that gains one, needs other tableau columns: then the problem is solved from scratch
+        :param lower: new lower bounds of the variables, -inf for none. All 0 if [None]
+        :param upper: new upper bounds of the variables, inf for none. All inf if [None]
+        """
+        free = [low == -inf and high == inf for low, high in zip(self.lower, self.upper)]
+        self.lower = list(lower) if lower is not None else [0] * len(self.c)
+        self.upper = list(upper) if upper is not None else [inf] * len(self.c)
+        if not len(self.base):  # Not solved yet
+            return
+
+        n = self._logicals
+        scale = self._column_scale or [1] * len(self.c)
+        columns = []
+        for j, sign in zip(self._source[:n], self._sign):
+            low, high = self.lower[j] / scale[j], self.upper[j] / scale[j]
+            if free[j]:  # Split into x' - x'', both columns count from 0
+                shift = 0 if low == -inf and high == inf else inf
+            else:  # Counts from its lower bound, or from its upper bound if reflected
+                shift = low if sign > 0 else high
+            if abs(shift) == inf or low > high:
+                self.a, self.b, self.base = self._matrix, self._rhs, []
+                return
+            columns.append((shift, high - low))
+
+        for k, (shift, bound) in enumerate(columns):
+            self._shift[k], self._upper[k] = shift, bound
+        self._fixed = [column for column, bound in enumerate(self._upper) if bound == 0]
+        self._set_costs()
+        self.update_rhs(self._rhs)
+        self._price()
+
+    @property
+    def rhs(self) -> list[float]:
+        """
+        :return: right hand side of the constraints equations, as given to the constructor or [update_rhs]
+        """
+        return self._rhs
+
+    def snapshot(self) -> dict:
+        """
+        Copy the tableau, the basis and the substitutions of the variables of this solver, e.g. to start
+        [rerun] from the basis of this solve again after further [update_rhs], [update_objective] and [rerun]
+        :return: the copy to pass to [restore]
+        """
+        return {name: _copy(getattr(self, name)) for name in _TABLEAU}
+
+    def restore(self, snapshot: dict, copy: bool = True) -> None:
+        """
+        Put the tableau of [snapshot] back into this solver, [rerun] then starts from its basis
+        :param snapshot: the result of [snapshot] of this solver
+        :param copy: whether to copy [snapshot], so that it can be restored again
+        """
+        for name, value in snapshot.items():
+            current = getattr(self, name)
+            if name == "a" and hasattr(current, "shape") and current.shape == value.shape and len(self.base):
+                current[...] = value  # In place, the tableau may be memory-mapped
+            else:
+                setattr(self, name, _copy(value) if copy else value)
+
+    def _price(self) -> None:
+        """
+        Compute the z-row of the current basis from scratch:
+        z_j = c_B * (column j of the tableau) - c_j, logical variables cost nothing
+        """
+        costs = self._basic_costs()
+        if self.backend == SimplexSolver.Backend.NUMPY:
+            import numpy as np
+
+            self.z = np.asarray(costs, dtype=float) @ self.a
+            if self.numerics is None:
+                np.round(self.z, self.eps, out=self.z)
+            self.z -= self._costs
+        else:
+            self.z = [self._round(sum(costs[i] * self.a[i][j] for i in range(len(self.a))) - self._costs[j])
+                      for j in range(len(self._costs))]
+        if self.numerics is not None:
+            self._clean_z()
+        self._settle_fixed()
+
+    def _solve(self) -> Union[tuple[float, list[float]], None]:
+        """
+        Solve the problem in this solver without printing anything
+        :return: a tuple (solution, X*) or [None] if the objective function is unbounded or the constraints infeasible
+        """
+        start = perf_counter()
+        self._start_statistics()
+        self.is_unbounded = False
+        self.is_infeasible = any(lower > upper for lower, upper in zip(self.lower, self.upper))
+
+        if not self.is_infeasible:
+            self._to_standard_form()
+            if self._artificial_rows:
+                self._phase = "phase-one"
+                clock = perf_counter()
+                self._phase_one()
+                self.phase_one_time = perf_counter() - clock
+            else:
+                self.pricing.reset(self)
+        if not self.is_infeasible:
+            self._phase = "primal"
+            while self._step():
+                pass
+
+        self.time = perf_counter() - start
+        self._record()
+        return self._result()
+
+    def _reoptimize(self) -> Union[tuple[float, list[float]], None]:
+        """
+        Solve the problem again after [update_rhs] or [update_objective] without printing anything,
+        starting from the basis of the previous solve: the dual Simplex method restores a feasible
+        right hand side, then the primal Simplex method restores an optimal z-row
+        :return: a tuple (solution, X*) or [None] if the objective function is unbounded or the constraints infeasible
+        """
+        if not len(self.base):  # Nothing to start from
+            return self._solve()
+
+        start = perf_counter()
+        self._start_statistics()
+        self.is_unbounded = False
+        self.is_infeasible = False
+
+        self._phase = "dual"
+        if self._dual_pivot_row() is not None and min(self.z) < 0:
+            # Neither method can start from this basis. Restore feasibility with the dual method
+            # against a zero objective function, which every basis is optimal for, then price the real one
+            self.z = [0] * len(self.z) if self.backend == SimplexSolver.Backend.LIST else self.z * 0
+            while self._dual_step():
+                pass
+            self._price()
+        else:
+            while self._dual_step():
+                pass
+
+        if not self.is_infeasible:
+            self.solution = self._basic_objective()
+
+            self._stalled = 0
+            self.pricing.reset(self)  # The dual Simplex method changed the tableau under the pricing rule
+            self._phase = "primal"
+            while self._step():
+                pass
+
+        self.time = perf_counter() - start
+        self._record()
+        return self._result()
+
+    def _column_values(self, x: list[float]) -> list[float]:
+        """
+        :return: values of the tableau columns at the point [x] of the variables, clipped to their bounds.
+            The logical column of every row takes what the variables leave of its right hand side,
+            artificial columns are 0
+        """
+        n, m = self._logicals, len(self.b)
+        scale = self._column_scale or [1] * len(self.c)
+        values = [min(max(sign * (x[j] / scale[j] - shift), 0), upper)
+                  for j, sign, shift, upper in zip(self._source[:n], self._sign, self._shift, self._upper)]
+        if self.backend == SimplexSolver.Backend.NUMPY:
+            import numpy as np
+
+            rest = (self.b - self.a[:, :n] @ np.asarray(values, dtype=float)).tolist()
+        else:
+            rest = [value - sum(cell * column for cell, column in zip(row, values)) for row, value in zip(self.a, self.b)]
+        values += [min(max(rest[i] / float(self.a[i][n + i]), 0), self._upper[n + i]) for i in range(m)]
+        return values + [0] * (len(self._source) - n - m)
+
+    def _crash(self, x: list[float]) -> None:
+        """
+        Build a basis from the point [x] in the tableau of [_to_standard_form]: the columns farthest from their bounds
+        enter first, which gives the optimal basis if [x] is close enough to an optimal vertex. Columns closer
+        to their upper bound than to 0 move to it with [_flip] first. Every column enters in a row that no entered
+        column took yet, among those with a large enough value preferring the row whose basic column is closest
+        to a bound. Columns at their bounds and columns dependent on the entered ones stay nonbasic
+        """
+        values = self._column_values(x)
+        for column in range(self._logicals):
+            if values[column] > self._upper[column] - values[column]:
+                self._flip(column)
+        distance = [min(value, upper - value) for value, upper in zip(values, self._upper)]
+
+        rows = {column: row for row, column in enumerate(self.base)}
+        taken = [False] * len(self.b)
+        for column in sorted(range(self._logicals + len(self.b)), key=lambda j: -distance[j]):
+            if distance[column] < 10 ** -self.eps or all(taken):
+                break
+            if column in rows:  # A logical column with its row to itself
+                taken[rows[column]] = True
+                continue
+
+            if self.backend == SimplexSolver.Backend.NUMPY:
+                cells = self.a[:, column].tolist()
+            else:
+                cells = [row[column] for row in self.a]
+            tolerance = self._pivot_tolerance(column)
+            free = [i for i, cell in enumerate(cells) if not taken[i] and abs(cell) > tolerance]
+            if not free:
+                continue
+            largest = max(abs(cells[i]) for i in free)
+            # Threshold pivoting: a small pivot value would blow the error of the tableau up
+            row = min((i for i in free if abs(cells[i]) >= 0.01 * largest),
+                      key=lambda i: (distance[self.base[i]], -abs(cells[i])))
+            del rows[self.base[row]]
+            rows[column] = row
+            taken[row] = True
+            self._pivot(row, column)
+            self.crash_pivots += 1
+
+    def _crossover(self, x: list[float]) -> Union[tuple[float, list[float]], None]:
+        """
+        Solve the problem in this solver without printing anything, starting from the basis that [_crash] builds
+        from [x] instead of the logical and artificial variables. That basis may be infeasible, so the dual Simplex
+        method restores a feasible right hand side against a zero objective function, with the artificial variables
+        fixed at 0 so that they leave the basis, then the primal Simplex method restores an optimal z-row
+        :return: a tuple (solution, X*) or [None] if the objective function is unbounded or the constraints infeasible
+        """
+        start = perf_counter()
+        self._start_statistics()
+        self.is_unbounded = False
+        self.is_infeasible = any(lower > upper for lower, upper in zip(self.lower, self.upper))
+
+        if not self.is_infeasible:
+            self._to_standard_form()
+            clock = perf_counter()
+            self._crash(x)
+            self.update_time += perf_counter() - clock
+
+            artificials = self._logicals + len(self.b)
+            for column in range(artificials, len(self._source)):
+                self._upper[column] = 0
+                self._fixed.append(column)
+            self._costs = [0] * len(self._costs)  # Every basis is optimal for it, also after a refactorization
+            self._price()
+            self._phase = "dual"
+            while self._dual_step():
+                pass
+
+            if self.is_infeasible:
+                self.a, self.b, self.base = self._matrix, self._rhs, []
+            else:
+                self._drop_artificials()
+                self._phase = "primal"
+                while self._step():
+                    pass
+
+        self.time = perf_counter() - start
+        self._record()
+        return self._result()
+
+    def _result(self) -> Union[tuple[float, list[float]], None]:
+        """
+        Read the solution and X* from the final tableau
+        :return: a tuple (solution, X*) or [None] if the objective function is unbounded or the constraints infeasible
+        """
+        if self.is_unbounded or self.is_infeasible:
+            return None
+
+        # Find X* from base. Nonbasic tableau columns are 0, so their variables are at their shift
+        values = [0] * self._logicals
         for i in range(len(self.base)):
-            if self.base[i] != -1:
-                x[self.base[i]] = self.b[i]
+            if self.base[i] < self._logicals:  # Logical variables are not part of X*
+                values[self.base[i]] = float(self.b[i])
+
+        x = [0] * len(self.c)
+        scale = self._column_scale or [1] * len(self.c)
+        for j, sign, shift, value in zip(self._source, self._sign, self._shift, values):
+            if shift or value:
+                x[j] = round(x[j] + scale[j] * (shift + sign * value), self.eps)
+
+        self.solution = float(self.solution + self._offset)
+        if self.mode == SimplexSolver.Mode.MINIMIZE:  # Flip the solution in case we were minimizing
+            self.solution *= -1
+
+        # The z-row value of a logical column is the dual value of its row times the sign of the column.
+        # Adding 0.0 turns -0.0 into 0.0
+        n = self._logicals
+        sign = 1 if self.mode == SimplexSolver.Mode.MAXIMIZE else -1
+        scale = self._row_scale or [1] * len(self.b)
+        self.dual_values = [round(sign * scale[i] * self._sign[n + i] * float(self.z[n + i]), self.eps) + 0.0
+                            for i in range(len(self.b))]
+
+        return self.solution, x
+
+    def run(self) -> SolverResult:
+        """
+        Solve the problem in this solver without printing anything
+        :return: the status, the solution, X*, the dual values and the statistics of the solve
+        """
+        return self._solver_result(self._solve())
+
+    def rerun(self) -> SolverResult:
+        """
+        Solve the problem again after [update_rhs] or [update_objective] without printing anything,
+        starting from the basis of the previous solve
+        :return: the status, the solution, X*, the dual values and the statistics of the solve
+        """
+        return self._solver_result(self._reoptimize())
+
+    def crossover(self, x: list[float]) -> SolverResult:
+        """
+        Solve the problem without printing anything, starting from the basis that an approximate optimal point
+        suggests, e.g. the point of [InteriorPointSolver]. The result is an optimal vertex with its basis,
+        which [update_rhs], [update_objective] and [rerun] start from
+        :param x: values of the variables, e.g. [SolverResult.x] of an Interior-Point solver of the same problem
+        :return: the status, the solution, X*, the dual values and the statistics of the solve
+        """
+        return self._solver_result(self._crossover(x))
+
+    def _solver_result(self, result: Union[tuple[float, list[float]], None]) -> SolverResult:
+        """
+        :return: [result] of the last solve with its status, dual values and statistics
+        """
+        return SolverResult(
+            status=self._status(),
+            objective=None if result is None else result[0],
+            x=None if result is None else result[1],
+            duals=None if result is None else self.dual_values,
+            iterations=self.iterations,
+            time=self.time,
+            counters=self._counters(),
+            phase_time=self._phase_time()
+        )
 
-        if not self.is_unbounded:
-            if self.mode == SimplexSolver.Mode.MINIMIZE:  # Flip the solution in case we were minimizing
-                self.solution *= -1
+    def _print_result(self, result: Union[tuple[float, list[float]], None]) -> None:
+        """
+        Print the solution and X*, or "Unbounded" or "Infeasible", if the verbosity asks for it
+        """
+        if self.verbosity < Verbosity.RESULT:
+            return
 
-            print("Solution: ", self.solution)
-            print("X* = ", x)
-            return self.solution, x
+        if result is not None:
+            print("Solution: ", result[0])
+            print("X* = ", result[1])
+        elif self.is_infeasible:
+            print("Infeasible")
         else:
             print("Unbounded")
-            return None
+
+    def reoptimize(self) -> Union[tuple[float, list[float]], None]:
+        """
+        Solve the problem again after [update_rhs] or [update_objective], starting from the basis of the previous solve,
+        and print the solution and X*, or "Unbounded" or "Infeasible"
+        :return: a tuple (solution, X*) or [None] if the objective function is unbounded or the constraints infeasible
+        """
+        result = self._reoptimize()
+        self._print_result(result)
+        return result
+
+    def solve(self) -> Union[tuple[float, list[float]], None]:
+        """
+        Solve the problem in this solver and print the solution and X*, or "Unbounded" or "Infeasible",
+        and the problem before that, as far as [verbosity] asks for
+        :return: a tuple (solution, X*) or [None] if the objective function is unbounded or the constraints infeasible
+        """
+        if self.verbosity >= Verbosity.PROBLEM:
+            self.print_problem()
+        result = self._solve()
+        self._print_result(result)
+        return result
 
 
 def simplex_solve_and_check(
@@ -223,6 +1433,7 @@ def simplex_solve_and_check(
         constraints_right_hand_side: list[float],
         epsilon: int,
         expected_solution: Union[float, None],
+        verbosity: Verbosity = Verbosity.PROBLEM
 ) -> None:
     """
     Run the simplex solver with given data and assert-check the solution.
@@ -233,9 +1444,10 @@ def simplex_solve_and_check(
     :param constraints_right_hand_side: results of the constraints equations
     :param epsilon: optimization accuracy. Number of digits after the floating point to consider
     :param expected_solution: the expected solution of the optimization problem
+    :param verbosity: what to print while solving
     """
-    solver = SimplexSolver(mode, objective_function, constraints_matrix, constraints_right_hand_side, epsilon)
-    solver.print_problem()
+    solver = SimplexSolver(mode, objective_function, constraints_matrix, constraints_right_hand_side, epsilon,
+                           verbosity=verbosity)
     solutions = solver.solve()
 
     if solutions is None:  # Unbounded function
@@ -0,0 +1,329 @@
+# Cache of solver results keyed by a fingerprint of the problem, with warm starts for problems sharing the matrix
+
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Union
+
+import numpy as np
+
+from interior_point_solver import InteriorPointSolver
+from simplex_solver import SimplexSolver
+from solver_result import SolverResult
+
+
+def fingerprint(*parts) -> str:
+    """
+    Hash problem data fast: arrays and matrices by their raw bytes, everything else by its representation
+    :param parts: nested lists, NumPy arrays, scipy sparse matrices, numbers, strings or [None]
+    :return: hexadecimal digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if hasattr(part, "tocsr"):  # A scipy sparse matrix: its canonical CSR arrays
+            matrix = part.tocsr()
+            matrix.sum_duplicates()
+            arrays = (np.asarray(matrix.shape), matrix.data.astype(float), matrix.indices, matrix.indptr)
+        elif isinstance(part, np.ndarray) or isinstance(part, (list, tuple)) and _is_numeric(part):
+            array = np.asarray(part, dtype=float)
+            arrays = (np.asarray(array.shape), array)
+        elif isinstance(part, (list, tuple)):  # E.g. the kinds of the constraints
+            digest.update(repr([value.value if hasattr(value, "value") else value for value in part]).encode())
+            digest.update(b"\0")
+            continue
+        else:
+            digest.update(repr(part.value if hasattr(part, "value") else part).encode())
+            digest.update(b"\0")
+            continue
+        for array in arrays:
+            digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(b"\1")
+    return digest.hexdigest()
+
+
+def _is_numeric(values: Union[list, tuple]) -> bool:
+    """
+    :return: whether [values] are numbers or nested lists of numbers
+    """
+    first = values[0] if len(values) else 0.0
+    while isinstance(first, (list, tuple)) and len(first):
+        first = first[0]
+    return isinstance(first, (int, float, np.number, list, tuple))
+
+
+class SolveCache:
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 2 ** 20, path: Union[str, None] = None) -> None:
+        """
+        Memoize solves: a problem solved before returns its [SolverResult] without solving it again. A problem
+        with the same matrix (and the same constraints and bounds) as a problem solved before starts from
+        its optimal basis ([SimplexSolver]) or its initial point without Phase I ([InteriorPointSolver], same b too).
+        The least recently used results and warm starts are dropped beyond [max_entries] or [max_bytes].
+        Safe to share between threads
+
+        :param max_entries: how many results and how many warm starts to keep in memory
+        :param max_bytes: how many bytes the results and warm starts in memory may take, approximately
+        :param path: directory to also store the results in as JSON files, which outlive the process
+            and are not bounded. [None] to keep them in memory only
+        """
+
+        self.max_entries: int = max_entries
+        """How many results and how many warm starts to keep in memory"""
+
+        self.max_bytes: int = max_bytes
+        """How many bytes the results and warm starts in memory may take, approximately"""
+
+        self.path: Union[str, None] = path
+        """Directory of the results stored as JSON files, [None] if they are in memory only"""
+
+        self.hits = 0
+        """Solves answered from the cache"""
+
+        self.warm_starts = 0
+        """Solves that started from the basis or the point of a cached problem"""
+
+        self.misses = 0
+        """Solves from scratch"""
+
+        self._results: OrderedDict[str, tuple[SolverResult, int]] = OrderedDict()
+        """Results and their size in bytes by fingerprint of the problem, least recently used first"""
+
+        self._warm: OrderedDict[str, tuple[object, int]] = OrderedDict()
+        """Solved solvers ([SimplexSolver]) or initial points ([InteriorPointSolver]) and their size in bytes
+        by fingerprint of the constraints, least recently used first"""
+
+        self._bytes = 0
+        """Size of [_results] and [_warm] in bytes"""
+
+        self._lock = threading.Lock()
+        """Guards the entries and the counters against other threads"""
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def simplex(
+            self,
+            mode: SimplexSolver.Mode,
+            c: list[float],
+            a: list[list[float]],
+            b: list[float],
+            eps: int,
+            constraints: Union[list[SimplexSolver.Constraint], None] = None,
+            lower: Union[list[float], None] = None,
+            upper: Union[list[float], None] = None,
+            **options
+    ) -> SolverResult:
+        """
+        Solve a problem with [SimplexSolver], or return its cached result
+        :param options: other arguments of [SimplexSolver], e.g. [backend] or [pricing]. They do not change
+            the optimum, so they are not part of the key: a cached result may come from other options
+        :return: the result of the solve. A cached result keeps the statistics of the solve that computed it
+        """
+        constraints_key = fingerprint("simplex", mode, a, eps, constraints, lower, upper)
+        key = fingerprint(constraints_key, c, b)
+        result = self._cached(key)
+        if result is not None:
+            return result
+
+        solver = self._take_warm(constraints_key)
+        if solver is not None:
+            if list(solver.actual_coefficients) != list(c):
+                solver.update_objective(list(c))
+            if list(solver.rhs) != list(b):
+                solver.update_rhs(list(b))
+            result = solver.rerun()
+        else:
+            solver = SimplexSolver(mode, list(c), a, list(b), eps, constraints=constraints, lower=lower, upper=upper,
+                                   **options)
+            result = solver.run()
+
+        if result.is_optimal:  # Otherwise the basis is no start for anything
+            self._put_warm(constraints_key, solver, _tableau_bytes(solver))
+        self._put(key, result)
+        return result
+
+    def interior_point(
+            self,
+            mode: InteriorPointSolver.Mode,
+            c: list[float],
+            a: list[list[float]],
+            b: list[float],
+            alpha: Union[float, None],
+            eps: int,
+            **options
+    ) -> SolverResult:
+        """
+        Solve a problem with [InteriorPointSolver], or return its cached result
+        :param options: other arguments of [InteriorPointSolver], e.g. [workspace], not part of the key
+        :return: the result of the solve. A cached result keeps the statistics of the solve that computed it
+        """
+        constraints_key = fingerprint("interior-point", a, b)
+        key = fingerprint(constraints_key, mode, c, eps, alpha)
+        result = self._cached(key)
+        if result is not None:
+            return result
+
+        solver = InteriorPointSolver(mode, self._take_warm(constraints_key), list(c), a, list(b), alpha, eps, **options)
+        result = solver.run()
+        if solver.initial_point is not None:
+            self._put_warm(constraints_key, solver.initial_point, solver.initial_point.nbytes)
+        self._put(key, result)
+        return result
+
+    def _cached(self, key: str) -> Union[SolverResult, None]:
+        """
+        :return: a copy of the result of the problem with fingerprint [key], or [None] if it is not cached
+        """
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return _copy(entry[0])
+
+        if self.path is None:
+            return None
+        try:
+            with open(self._file(key)) as file:
+                result = _from_dict(json.load(file))
+        except (OSError, ValueError):  # Not stored or written half by a process that died
+            return None
+        with self._lock:
+            self.hits += 1
+        self._store(key, result)
+        return _copy(result)
+
+    def _take_warm(self, key: str):
+        """
+        Take the warm start of the constraints with fingerprint [key] out of the cache, so that no other thread
+        solves with it at the same time
+        :return: the warm start, or [None] if there is none
+        """
+        with self._lock:
+            entry = self._warm.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.warm_starts += 1
+            self._bytes -= entry[1]
+            return entry[0]
+
+    def _put_warm(self, key: str, start, size: int) -> None:
+        """
+        Cache the warm start of the constraints with fingerprint [key]
+        """
+        with self._lock:
+            if key in self._warm:  # Another thread solved the same constraints meanwhile
+                self._bytes -= self._warm.pop(key)[1]
+            self._warm[key] = start, size
+            self._bytes += size
+            self._evict()
+
+    def _put(self, key: str, result: SolverResult) -> None:
+        """
+        Cache the result of the problem with fingerprint [key], in memory and on disk
+        """
+        result = _copy(result)
+        if self.path is not None:
+            temporary = f"{self._file(key)}.{os.getpid()}.{threading.get_ident()}"
+            with open(temporary, "w") as file:
+                json.dump(_to_dict(result), file)
+            os.replace(temporary, self._file(key))  # Atomic, so readers never see half of a file
+        self._store(key, result)
+
+    def _store(self, key: str, result: SolverResult) -> None:
+        """
+        Keep [result] in memory
+        """
+        size = _result_bytes(result)
+        with self._lock:
+            if key in self._results:
+                self._bytes -= self._results.pop(key)[1]
+            self._results[key] = result, size
+            self._bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Drop the least recently used entries beyond the bounds, warm starts first as they are the largest.
+        Call with the lock held
+        """
+        while len(self._warm) > self.max_entries or (self._warm and self._bytes > self.max_bytes):
+            self._bytes -= self._warm.popitem(last=False)[1][1]
+        while len(self._results) > self.max_entries or (self._results and self._bytes > self.max_bytes):
+            self._bytes -= self._results.popitem(last=False)[1][1]
+
+    def _file(self, key: str) -> str:
+        """
+        :return: path of the JSON file of the result of the problem with fingerprint [key]
+        """
+        return os.path.join(self.path, f"{key}.json")
+
+    def clear(self) -> None:
+        """
+        Forget every result and warm start, also the ones on disk, and reset the counters
+        """
+        with self._lock:
+            self._results.clear()
+            self._warm.clear()
+            self._bytes = 0
+            self.hits = self.warm_starts = self.misses = 0
+            if self.path is not None:
+                for name in os.listdir(self.path):
+                    if name.endswith(".json"):
+                        os.remove(os.path.join(self.path, name))
+
+    @property
+    def bytes(self) -> int:
+        """
+        :return: how many bytes the results and warm starts in memory take, approximately
+        """
+        return self._bytes
+
+
+def _copy(result: SolverResult) -> SolverResult:
+    """
+    :return: a copy of [result] that callers may change without changing the cache
+    """
+    return dataclasses.replace(
+        result,
+        x=None if result.x is None else list(result.x),
+        duals=None if result.duals is None else list(result.duals),
+        counters=dict(result.counters),
+        phase_time=dict(result.phase_time)
+    )
+
+
+def _to_dict(result: SolverResult) -> dict:
+    """
+    :return: [result] as a JSON object
+    """
+    data = dataclasses.asdict(result)
+    data["status"] = result.status.value
+    return data
+
+
+def _from_dict(data: dict) -> SolverResult:
+    """
+    :return: the result stored by [_to_dict]
+    """
+    return SolverResult(**dict(data, status=SolverResult.Status(data["status"])))
+
+
+def _result_bytes(result: SolverResult) -> int:
+    """
+    :return: approximate size of [result] in memory
+    """
+    values = len(result.x or ()) + len(result.duals or ()) + len(result.counters) + len(result.phase_time)
+    return 256 + 32 * values
+
+
+def _tableau_bytes(solver: SimplexSolver) -> int:
+    """
+    :return: approximate size of the tableau of [solver] in memory
+    """
+    if hasattr(solver.a, "nbytes"):
+        return int(solver.a.nbytes) + 8 * len(solver.b) + 8 * len(solver.z)
+    return 32 * (len(solver.a) * len(solver.z) + len(solver.b) + len(solver.z))
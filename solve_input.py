@@ -0,0 +1,85 @@
+# Solve a problem in the input format of custom_input.py, read at once from a file or stdin without prompts
+
+import argparse
+import sys
+from typing import Union
+
+SOLVERS = ("interior-point", "simplex", "primal-dual")
+"""Solvers the command line can run, all of them maximize or minimize c * x subject to a * x = b, x >= 0"""
+
+MODES = {"max": True, "maximization": True, "maximize": True, "min": False, "minimization": False, "minimize": False}
+"""Whether to maximize by the answer to the first prompt of custom_input.py"""
+
+
+def parse(text: str) -> tuple[bool, list[float], list[list[float]], list[float], Union[list[float], None], int]:
+    """
+    Read the answers to the prompts of custom_input.py, separated by any whitespace: the mode, the size of c and c,
+    the number of constraints and the rows of a, b, the size of x_0 (0 to find it automatically) and x_0, eps
+    :return: a tuple (whether to maximize, c, a, b, x_0 or [None], eps)
+    :raises ValueError: if [text] is not such a problem
+    """
+    tokens = iter(text.split())
+
+    def take(what: str) -> str:
+        token = next(tokens, None)
+        if token is None:
+            raise ValueError(f"the input ends before {what}")
+        return token
+
+    def numbers(count: int, what: str) -> list[float]:
+        return [float(take(what)) for _ in range(count)]
+
+    mode = take("the mode")
+    if mode not in MODES:
+        raise ValueError(f"invalid mode {mode!r}, expected one of {', '.join(MODES)}")
+    n = int(take("the size of c"))
+    c = numbers(n, "the end of c")
+    m = int(take("the number of constraints"))
+    a = [numbers(n, f"the end of constraint {i + 1}") for i in range(m)]
+    b = numbers(m, "the end of b")
+    start = numbers(int(take("the size of x_0")), "the end of x_0") or None
+    eps = int(take("the solution accuracy"))
+    if next(tokens, None) is not None:
+        raise ValueError("unexpected values after the solution accuracy")
+    return MODES[mode], c, a, b, start, eps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Solve a problem in the input format of custom_input.py, "
+                                                 "read at once from a file or stdin")
+    parser.add_argument("file", nargs="?", default="-", help="file with the problem, - (default) for stdin")
+    parser.add_argument("--solver", choices=SOLVERS, default="interior-point", help="only interior-point uses x_0")
+    parser.add_argument("--alpha", type=float, help="alpha of the interior-point solver, adaptive if absent")
+    args = parser.parse_args()
+
+    if args.file == "-":
+        text = sys.stdin.read()
+    else:
+        with open(args.file) as file:
+            text = file.read()
+    try:
+        maximize, c, a, b, start, eps = parse(text)
+    except ValueError as error:
+        parser.error(str(error))
+
+    # Only the chosen solver is imported: the list backend of the simplex solver does not need NumPy at all
+    if args.solver == "simplex":
+        from simplex_solver import SimplexSolver
+
+        mode = SimplexSolver.Mode.MAXIMIZE if maximize else SimplexSolver.Mode.MINIMIZE
+        solver = SimplexSolver(mode, c, a, b, eps, constraints=[SimplexSolver.Constraint.EQUAL] * len(b))
+    elif args.solver == "primal-dual":
+        from primal_dual_solver import PrimalDualSolver
+
+        mode = PrimalDualSolver.Mode.MAXIMIZE if maximize else PrimalDualSolver.Mode.MINIMIZE
+        solver = PrimalDualSolver(mode, c, a, b, eps)
+    else:
+        from interior_point_solver import InteriorPointSolver
+
+        mode = InteriorPointSolver.Mode.MAXIMIZE if maximize else InteriorPointSolver.Mode.MINIMIZE
+        solver = InteriorPointSolver(mode, start, c, a, b, args.alpha, eps)
+    sys.exit(0 if solver.solve() is not None else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# Load an MPS or CPLEX LP model file and solve it
+
+import argparse
+import sys
+from time import perf_counter
+
+import numpy as np
+
+import model_reader
+from interior_point_solver import InteriorPointSolver
+from numerics import Numerics
+from presolve import Presolver
+from primal_dual_solver import PrimalDualSolver
+from revised_simplex_solver import RevisedSimplexSolver
+from simplex_solver import SimplexSolver
+from solver_result import SolverResult
+
+SOLVERS = ("simplex", "revised-simplex", "primal-dual", "interior-point")
+"""Solvers the command line can run"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load an MPS or CPLEX LP model file and solve it")
+    parser.add_argument("file", help="model file, optionally gzip-compressed (.gz)")
+    parser.add_argument("--format", choices=("mps", "lp"), help="file format. Guessed from the extension if absent")
+    parser.add_argument("--solver", choices=SOLVERS, default="primal-dual")
+    parser.add_argument("--eps", type=int, default=6, help="how many digits after the floating point to consider")
+    parser.add_argument("--no-presolve", action="store_true", help="solve the model as it is in the file")
+    parser.add_argument("--scaling", choices=[scaling.value for scaling in Numerics.Scaling],
+                        default=Numerics.Scaling.GEOMETRIC.value, help="scaling of the constraints for the simplex solver")
+    parser.add_argument("--crossover", action="store_true",
+                        help="finish the interior-point solvers with the simplex solver: an optimal vertex and basis")
+    args = parser.parse_args()
+
+    start = perf_counter()
+    if args.format == "mps":
+        model = model_reader.read_mps(args.file)
+    elif args.format == "lp":
+        model = model_reader.read_lp(args.file)
+    else:
+        model = model_reader.read_model(args.file)
+    print(f"Loaded {model.name or args.file}: {model.a.shape[0]} constraints, {model.a.shape[1]} variables, "
+          f"{model.a.nnz} nonzeros in {perf_counter() - start:.2f} s")
+
+    original, presolver = model, None
+    if not args.no_presolve:
+        presolver = Presolver(model)
+        model = presolver.presolve()
+        print(presolver.statistics)
+        if presolver.is_infeasible:
+            print("The problem does not have solution!")
+            sys.exit(1)
+    # A variable of presolve improves the objective function without limit if the rest of the model is feasible
+    unbounded = presolver is not None and presolver.is_unbounded
+
+    if not len(model.c):  # Presolve found every value, nothing is left to solve
+        if unbounded:
+            print("Unbounded")
+            sys.exit(1)
+        print("Solved by presolve")
+        _print_solution(original, model.standard_form(), presolver, 0.0, [], args.eps)
+        return
+
+    if args.solver == "primal-dual":
+        form = model.standard_form()
+        solver = PrimalDualSolver(model.mode, form.c, form.a, form.b, args.eps)
+    elif args.solver == "interior-point":
+        form = model.standard_form()
+        solver = InteriorPointSolver(model.mode, None, form.c, form.a, form.b, None, args.eps)
+    elif args.solver == "simplex":
+        form = model.constraint_form()
+        solver = _simplex_solver(model, form, args)
+    else:
+        form = model.inequality_form()
+        if np.any(form.b < 0):  # The revised Simplex solver starts from the slack basis
+            print("The revised Simplex solver needs a nonnegative right hand side (x = 0 must be feasible), "
+                  "use --solver simplex or primal-dual", file=sys.stderr)
+            sys.exit(1)
+        solver = RevisedSimplexSolver(model.mode, form.c, form.a, form.b, args.eps)
+
+    result = solver.run()
+
+    if isinstance(solver, InteriorPointSolver):
+        print(f"Initial point found in {solver.initialization_iterations} iterations, "
+              f"{solver.initialization_time:.2f} s")
+    if result.status in (SolverResult.Status.INFEASIBLE, SolverResult.Status.NO_SOLUTION):
+        print("The problem does not have solution!")
+    elif result.status == SolverResult.Status.NOT_APPLICABLE:
+        print("The method is not applicable!")
+    elif result.status == SolverResult.Status.UNBOUNDED or unbounded:
+        print("Unbounded")
+    if not result.is_optimal or unbounded:
+        sys.exit(1)
+
+    print(f"Solved with {args.solver} in {result.time:.2f} s, {result.iterations} iterations")
+    if args.crossover and args.solver in ("primal-dual", "interior-point"):
+        # The simplex solver takes the variables of the model, so the point of the standard form maps back to them
+        constraint_form = model.constraint_form()
+        solver = _simplex_solver(model, constraint_form, args)
+        crossover = solver.crossover(list(form.recover(result.x)))
+        if crossover.is_optimal:
+            form, result = constraint_form, crossover
+            print(f"Crossover in {result.time:.2f} s, {result.counters['crash_pivots']} crash pivots, "
+                  f"{result.iterations + solver.dual_iterations} simplex iterations")
+        else:  # The point is optimal within the tolerances of its solver, but not of the simplex solver
+            print(f"Crossover failed: {crossover.status.value}, keeping the interior point", file=sys.stderr)
+    _print_solution(original, form, presolver, result.objective, result.x, args.eps)
+
+
+def _simplex_solver(model, form, args) -> SimplexSolver:
+    """
+    :return: the [SimplexSolver] of the constraint form [form] of [model] with the options of the command line
+    """
+    return SimplexSolver(model.mode, form.c, form.a, form.b, args.eps, backend=SimplexSolver.Backend.NUMPY,
+                         constraints=form.constraints, lower=model.lower, upper=model.upper,
+                         numerics=Numerics(scaling=Numerics.Scaling(args.scaling)))
+
+
+def _print_solution(model, form, presolver, solution: float, x: list[float], eps: int) -> None:
+    """
+    Print the solution of [form] and the nonzero values of the variables of [model] it maps back to
+    """
+    print("Solution:", round(solution + form.offset, eps))
+    x = form.recover(x)
+    if presolver is not None:
+        x = presolver.postsolve(x)
+    for name, value in zip(model.variable_names, x):
+        value = round(float(value), eps)
+        if value != 0:
+            print(f"{name} = {value}")
+
+
+if __name__ == "__main__":
+    main()
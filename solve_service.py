@@ -0,0 +1,202 @@
+# Asyncio front end of the solvers: bounded workers, backpressure, timeouts and merging of identical requests
+
+import asyncio
+from dataclasses import dataclass
+from typing import Union
+
+from batch_solver import BatchSolver, Problem, SharedMatrix
+from solve_cache import fingerprint
+from solver_result import SolverResult
+
+
+class ServiceOverloadedError(RuntimeError):
+    """
+    [SolveService] has [SolveService.max_pending] solves in flight and was asked not to wait for a free slot
+    """
+
+
+@dataclass
+class _InFlight:
+    """
+    One solve of [SolveService] and the requests waiting for it
+    """
+
+    task: asyncio.Task
+    """Waits for a free slot, then for the workers"""
+
+    waiters: int = 1
+    """How many requests wait for the result"""
+
+    submitted: bool = False
+    """Whether the solve reached the workers, which then free its slot"""
+
+
+class SolveService:
+    def __init__(
+            self,
+            pool: BatchSolver.Pool = BatchSolver.Pool.PROCESS,
+            workers: Union[int, None] = None,
+            max_pending: int = 0,
+            wait_when_full: bool = True
+    ) -> None:
+        """
+        Solve problems on a pool of workers for asyncio code. Requests for a problem that is already being solved
+        wait for the same solve instead of starting another one. At most [max_pending] solves are queued
+        or running at a time: further requests wait for a free slot, or fail with [ServiceOverloadedError].
+        Use it as an async context manager or call [close]
+
+        :param pool: one of [BatchSolver.Pool.PROCESS] or [BatchSolver.Pool.THREAD]
+        :param workers: number of workers. The number of processors if [None]
+        :param max_pending: how many solves may be queued or running at a time. 4 times the number of workers if 0
+        :param wait_when_full: whether requests wait for a free slot instead of failing when the queue is full
+        """
+
+        self._batch = BatchSolver(pool, workers)
+        """Workers and the shared matrices"""
+
+        self.max_pending: int = max_pending or 4 * self._batch.workers
+        """How many solves may be queued or running at a time"""
+
+        self.wait_when_full: bool = wait_when_full
+        """Whether requests wait for a free slot instead of failing when the queue is full"""
+
+        self.requests = 0
+        """Requests received"""
+
+        self.solves = 0
+        """Solves started on the workers"""
+
+        self.coalesced = 0
+        """Requests that waited for the solve of an identical request in flight"""
+
+        self.rejected = 0
+        """Requests that failed with [ServiceOverloadedError]"""
+
+        self.timeouts = 0
+        """Requests that ran out of time"""
+
+        self.cancelled = 0
+        """Requests cancelled by their caller"""
+
+        self._slots: Union[asyncio.Semaphore, None] = None
+        """Free places of the queue, created in the event loop of the first request"""
+
+        self._in_flight: dict[str, _InFlight] = {}
+        """Solves queued or running by fingerprint of their problem"""
+
+        self._admitted = 0
+        """Solves that count against [max_pending]: waiting for a slot, queued or running on the workers.
+        Counted as soon as a request starts them, the solve itself only takes its slot later"""
+
+    def share(self, matrix) -> Union[SharedMatrix, object]:
+        """
+        Store a matrix once so that requests can refer to it without copying it for every solve,
+        see [BatchSolver.share]
+        """
+        return self._batch.share(matrix)
+
+    @property
+    def pending(self) -> int:
+        """
+        :return: how many solves are queued or running for requests that wait for them
+        """
+        return len(self._in_flight)
+
+    async def solve(self, problem: Problem, timeout: Union[float, None] = None) -> SolverResult:
+        """
+        Solve a problem on the workers without printing anything.
+        If the request is cancelled or times out and no other request waits for the same solve,
+        the solve is dropped from the queue. A solve that already runs finishes, but its result is discarded
+        :param problem: the problem to solve
+        :param timeout: seconds to wait for the result, waiting for a free slot included. No limit if [None]
+        :return: the result of the solver
+        :raise ServiceOverloadedError: if the queue is full and [wait_when_full] is [False]
+        :raise TimeoutError: if the result does not arrive in [timeout] seconds
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        self.requests += 1
+
+        key = fingerprint(problem.solver.__name__, *[part for item in sorted(problem.arguments.items())
+                                                     for part in item])
+        entry = self._in_flight.get(key)
+        if entry is not None:
+            entry.waiters += 1
+            self.coalesced += 1
+        else:
+            if self._admitted >= self.max_pending and not self.wait_when_full:
+                self.rejected += 1
+                raise ServiceOverloadedError(f"{self.max_pending} solves are already in flight")
+            self._admitted += 1
+            entry = self._in_flight[key] = _InFlight(asyncio.ensure_future(self._run(key, problem)))
+            entry.task.add_done_callback(lambda _, entry=entry: self._forget(entry))
+
+        try:
+            # Shielded, so that one request giving up does not cancel the solve for the others
+            return await asyncio.wait_for(asyncio.shield(entry.task), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TimeoutError(f"no result in {timeout} s") from None
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            entry.waiters -= 1
+            if not entry.waiters and not entry.task.done():
+                entry.task.cancel()
+                del self._in_flight[key]  # Now, so that new requests do not wait for the cancelled solve
+
+    async def _run(self, key: str, problem: Problem) -> SolverResult:
+        """
+        Wait for a free slot and solve [problem] on the workers. The slot is freed when the workers are done with it,
+        so cancelled solves that already run still count against [max_pending]
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            await self._slots.acquire()
+            try:
+                future = self._batch.submit(problem)
+            except BaseException:
+                self._slots.release()
+                raise
+            self._in_flight[key].submitted = True
+            self.solves += 1
+            future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                future.cancel()  # Only drops it from the queue, a running solve cannot be interrupted
+                raise
+        finally:
+            if key in self._in_flight and self._in_flight[key].task is asyncio.current_task():
+                del self._in_flight[key]
+
+    def _release(self) -> None:
+        """
+        Free the slot of a solve that the workers are done with
+        """
+        self._admitted -= 1
+        self._slots.release()
+
+    def _forget(self, entry: _InFlight) -> None:
+        """
+        Stop counting a solve that ended before it reached the workers: it failed, or it was cancelled
+        while it waited for a slot or before it even started
+        """
+        if not entry.submitted:
+            self._admitted -= 1
+
+    async def close(self) -> None:
+        """
+        Cancel the solves in flight, wait for the running ones, stop the workers and delete the shared matrices
+        """
+        for entry in list(self._in_flight.values()):
+            entry.task.cancel()
+        await asyncio.gather(*[entry.task for entry in self._in_flight.values()], return_exceptions=True)
+        await asyncio.get_running_loop().run_in_executor(None, self._batch.close)
+
+    async def __aenter__(self) -> "SolveService":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.close()
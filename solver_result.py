@@ -0,0 +1,68 @@
+# Result of a solve returned by the solvers without printing anything
+
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+from typing import Union
+
+
+class Verbosity(IntEnum):
+    """
+    What [solve] of the solvers prints. Every level prints what the lower ones do
+    """
+
+    QUIET = 0
+    """Nothing"""
+
+    RESULT = 1
+    """The solution and X*, or why there is none"""
+
+    PROBLEM = 2
+    """Also the problem before solving it"""
+
+
+@dataclass
+class SolverResult:
+    """
+    Outcome of a solve: what [run] of the solvers returns instead of printing
+    """
+
+    class Status(str, Enum):
+        OPTIMAL = "optimal"
+        UNBOUNDED = "unbounded"
+        INFEASIBLE = "infeasible"
+        NO_SOLUTION = "no-solution"
+        """Unbounded or infeasible, the method cannot tell which"""
+        NOT_APPLICABLE = "not-applicable"
+        """The method failed, e.g. the constraints are linearly dependent"""
+
+    status: Status
+    """How the solve ended"""
+
+    objective: Union[float, None] = None
+    """Optimal value of the objective function, [None] unless the status is [Status.OPTIMAL]"""
+
+    x: Union[list[float], None] = None
+    """Optimal values of the variables, [None] unless the status is [Status.OPTIMAL]"""
+
+    duals: Union[list[float], None] = None
+    """Shadow prices of the constraints: change of the optimal objective value per unit increase of b.
+    [None] if the status is not [Status.OPTIMAL] or the method does not compute them"""
+
+    iterations: int = 0
+    """How many iterations the solve took"""
+
+    time: float = 0.0
+    """Wall time of the solve in seconds"""
+
+    counters: dict[str, int] = field(default_factory=dict)
+    """Counters of the solve specific to the method, e.g. Phase I iterations"""
+
+    phase_time: dict[str, float] = field(default_factory=dict)
+    """Seconds spent in every phase of the solve, e.g. pricing or factorization"""
+
+    @property
+    def is_optimal(self) -> bool:
+        """
+        :return: whether the solve found an optimal solution
+        """
+        return self.status == SolverResult.Status.OPTIMAL